@@ -38,7 +38,11 @@ class InvenTreeConfig(AppConfig):
         - Collecting notification methods
         - Collecting state transition methods
         - Adding users set in the current environment
+        - Connecting the barcode index signals
         """
+        # The barcode index must be maintained in every process
+        self.connect_barcode_index_signals()
+
         # skip loading if plugin registry is not loaded or we run in a background thread
 
         if not InvenTree.ready.isPluginRegistryLoaded():
@@ -64,6 +68,10 @@ class InvenTreeConfig(AppConfig):
                 self.update_exchange_rates()
                 # Let the background worker check for migrations
                 InvenTree.tasks.offload_task(InvenTree.tasks.check_for_migrations)
+                # Index any barcodes which are missing from the barcode index
+                InvenTree.tasks.offload_task(
+                    'plugin.tasks.backfill_barcode_index', group='barcode'
+                )
 
         self.update_site_url()
         self.collect_notification_methods()
@@ -82,6 +90,12 @@ class InvenTreeConfig(AppConfig):
 
         social_account_updated.connect(sso.ensure_sso_groups)
 
+    def connect_barcode_index_signals(self):
+        """Connect the signals which keep the barcode index up to date."""
+        from plugin.models import connect_barcode_index_signals
+
+        connect_barcode_index_signals()
+
     def remove_obsolete_tasks(self):
         """Delete any obsolete scheduled tasks in the database."""
         obsolete = [
@@ -185,6 +185,18 @@ class PurchaseOrderLineItemResource(PriceResourceMixin, InvenTreeResource):
             return line.purchase_price.amount
         return ''
 
+    @staticmethod
+    def prepare_export_queryset(queryset):
+        """Prefetch all related data which is required to export the provided queryset."""
+        return queryset.select_related(
+            'order',
+            'part',
+            'part__part',
+            'part__manufacturer_part',
+            'part__manufacturer_part__manufacturer',
+            'destination',
+        )
+
 
 class PurchaseOrderExtraLineResource(PriceResourceMixin, InvenTreeResource):
     """Class for managing import / export of PurchaseOrderExtraLine data."""
@@ -223,6 +235,23 @@ class SalesOrderLineItemResource(PriceResourceMixin, InvenTreeResource):
             return item.sale_price.amount
         return ''
 
+    def dehydrate_fulfilled(self, item):
+        """Return the fulfilled quantity, using the annotated value if available."""
+        if hasattr(item, 'fulfilled'):
+            return item.fulfilled
+
+        return item.fulfilled_quantity()
+
+    @staticmethod
+    def prepare_export_queryset(queryset):
+        """Prefetch all related data which is required to export the provided queryset.
+
+        - The fulfilled quantity is annotated, rather than calculated for each line
+        """
+        return queryset.select_related('order', 'part').annotate(
+            fulfilled=models.SalesOrderLineItem.fulfilled_annotation()
+        )
+
 
 class SalesOrderExtraLineResource(PriceResourceMixin, InvenTreeResource):
     """Class for managing import / export of SalesOrderExtraLine data."""
@@ -1,18 +1,32 @@
 """JSON API for the Order app."""
 
+import hashlib
+import json
+import time
 from decimal import Decimal
 from typing import cast
 
 from django.conf import settings
-from django.contrib.auth import authenticate, login
+from django.contrib.auth import authenticate, get_user_model, login
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
 from django.db.models import F, Q
-from django.http.response import JsonResponse
+from django.http.response import (
+    HttpResponse,
+    HttpResponseNotModified,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.urls import include, path, re_path
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.http import http_date, parse_http_date_safe
 from django.utils.translation import gettext_lazy as _
 
 from django_filters import rest_framework as rest_filters
 from django_ical.views import ICalFeed
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 import common.models
@@ -28,8 +42,16 @@ from InvenTree.filters import (
 )
 from InvenTree.helpers import str2bool
 from InvenTree.helpers_model import construct_absolute_url, get_base_url
-from InvenTree.mixins import CreateAPI, ListAPI, ListCreateAPI, RetrieveUpdateDestroyAPI
+from InvenTree.mixins import (
+    CreateAPI,
+    ListAPI,
+    ListCreateAPI,
+    RetrieveAPI,
+    RetrieveUpdateDestroyAPI,
+)
 from order import models, serializers
+from order.export import stream_delimited
+from order.pagination import OrderKeysetPagination
 from order.status_codes import (
     PurchaseOrderStatus,
     PurchaseOrderStatusGroups,
@@ -51,71 +73,298 @@ from order.serializers import SalesOrderSerializer
 import datetime
 
 class PublicCreateSalesOrder(APIView):
+    """Public API endpoint for creating a SalesOrder (e.g. from a webshop).
+
+    An idempotency key can be provided (via the 'Idempotency-Key' header,
+    or the 'idempotency_key' field), so that retried requests do not create
+    duplicate orders. If an order already exists for the provided key,
+    that order is returned. A provided key which is blank, or longer than
+    the stored key field, is rejected.
+    """
+
     permission_classes = [permissions.AllowAny]
 
+    # Timeout for the lock which prevents concurrent requests with the same key
+    IDEMPOTENCY_LOCK_TIMEOUT = 60
+
     def post(self, request):
         data = request.data
 
-        # 1. Get or create customer (same as before)
+        idempotency_key = request.headers.get('Idempotency-Key')
+
+        if idempotency_key is None:
+            idempotency_key = data.get('idempotency_key')
+
+        if idempotency_key is not None:
+            idempotency_key = str(idempotency_key).strip()
+            max_length = models.SalesOrderIdempotencyKey.key.field.max_length
+
+            if not idempotency_key or len(idempotency_key) > max_length:
+                return Response(
+                    {'detail': f'Idempotency key must be 1-{max_length} characters.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            if response := self.existing_order(idempotency_key):
+                # This request has already been processed
+                return response
+
+            # Prevent concurrent retries (with the same key) creating duplicate orders
+            key_hash = hashlib.sha256(idempotency_key.encode()).hexdigest()
+            lock_key = f'public_sales_order_{key_hash}'
+
+            if not cache.add(lock_key, True, self.IDEMPOTENCY_LOCK_TIMEOUT):
+                return Response(
+                    {'detail': 'A request with this idempotency key is in progress.'},
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            try:
+                # Another request may have completed between the check and the lock
+                if response := self.existing_order(idempotency_key):
+                    return response
+
+                return self.create_order(data, idempotency_key)
+            except IntegrityError:
+                # The key was claimed by a concurrent request (e.g. the lock expired)
+                if response := self.existing_order(idempotency_key):
+                    return response
+                raise
+            finally:
+                cache.delete(lock_key)
+
+        return self.create_order(data)
+
+    def existing_order(self, idempotency_key):
+        """Return a response for the order already created with the provided key.
+
+        Returns:
+            Response containing the existing order (or None if there is no order)
+        """
+        existing = (
+            models.SalesOrderIdempotencyKey.objects.filter(key=idempotency_key)
+            .select_related('order')
+            .first()
+        )
+
+        if existing is None:
+            return None
+
+        return Response(
+            SalesOrderSerializer(existing.order).data, status=status.HTTP_200_OK
+        )
+
+    def create_order(self, data, idempotency_key=None):
+        """Create a new SalesOrder from the provided data.
+
+        The customer (if required), the order, its line items and the idempotency key
+        are created in a single transaction.
+        """
+        # 1. Get or validate new customer (same as before)
         customer_id = data.get('customer_id')
         customer = None
+        customer_serializer = None
 
         if customer_id:
             try:
                 customer = Company.objects.get(pk=customer_id)
             except Company.DoesNotExist:
-                return Response({'detail': 'Customer not found.'}, status=status.HTTP_400_BAD_REQUEST)
+                return Response(
+                    {'detail': 'Customer not found.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
         else:
             customer_fields = ['name', 'email', 'phone', 'address', 'currency']
             customer_data = {field: data.get(field) for field in customer_fields}
             if not customer_data['name'] or not customer_data['email']:
-                return Response({'detail': 'Customer name and email are required.'}, status=status.HTTP_400_BAD_REQUEST)
+                return Response(
+                    {'detail': 'Customer name and email are required.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
             customer_data['is_customer'] = True
-            serializer = CompanySerializer(data=customer_data)
-            if serializer.is_valid():
-                customer = serializer.save()
-            else:
-                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            customer_serializer = CompanySerializer(data=customer_data)
+            if not customer_serializer.is_valid():
+                return Response(
+                    customer_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+                )
 
         # 2. Get items (list of products and quantities)
         items = data.get('items')
         if not items or not isinstance(items, list) or len(items) == 0:
-            return Response({'detail': 'At least one item is required.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        now = datetime.datetime.now()
-        reference = f"SO-{now.strftime('%Y%m%d%H%M%S')}"
-        # 3. Create SalesOrder
-        order = SalesOrder.objects.create(
-            customer=customer,
-            reference=reference,
-            description=data.get('description', ''),
-            status=10,  # Or your default status code for new orders
-        )
+            return Response(
+                {'detail': 'At least one item is required.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Resolve all products with a single query
+        lines = []
 
-        # 4. Create SalesOrderLineItems for each item
         for item in items:
+            if not isinstance(item, dict):
+                continue  # skip invalid items
+
             product_id = item.get('product')
             quantity = item.get('quantity')
             if not product_id or not quantity:
                 continue  # skip invalid items
+
             try:
-                part = Part.objects.get(pk=product_id)
-            except Part.DoesNotExist:
+                lines.append((int(product_id), quantity, item))
+            except (TypeError, ValueError):
                 continue  # skip invalid products
 
-            SalesOrderLineItem.objects.create(
-                order=order,
-                part=part,
-                quantity=quantity,
-                reference=item.get('line_reference', ''),
-                notes=item.get('line_notes', ''),
+        parts = Part.objects.in_bulk([product_id for product_id, _q, _i in lines])
+
+        with transaction.atomic():
+            # Create the new customer (if required)
+            if customer_serializer is not None:
+                customer = customer_serializer.save()
+
+            now = datetime.datetime.now()
+            reference = f"SO-{now.strftime('%Y%m%d%H%M%S')}"
+            # 3. Create SalesOrder
+            order = SalesOrder.objects.create(
+                customer=customer,
+                reference=reference,
+                description=data.get('description', ''),
+                status=10,  # Or your default status code for new orders
             )
 
+            if idempotency_key:
+                # The unique key prevents a duplicate order being committed
+                models.SalesOrderIdempotencyKey.objects.create(
+                    key=idempotency_key, order=order
+                )
+
+            # 4. Create SalesOrderLineItems for all items (skip invalid products)
+            SalesOrderLineItem.objects.bulk_create([
+                SalesOrderLineItem(
+                    order=order,
+                    part=parts[product_id],
+                    quantity=quantity,
+                    reference=item.get('line_reference', ''),
+                    notes=item.get('line_notes', ''),
+                    allocated_total=0,
+                )
+                for product_id, quantity, item in lines
+                if product_id in parts
+            ])
+
+            # The order total is calculated once, by bulk_create()
+            order.refresh_from_db()
+
         # 5. Return order data
-        return Response(SalesOrderSerializer(order).data, status=status.HTTP_201_CREATED)
+        return Response(
+            SalesOrderSerializer(order).data, status=status.HTTP_201_CREATED
+        )
+
+
+class StreamingExportMixin:
+    """Mixin class which streams exported data, rather than building the file in memory.
+
+    Streaming export is selected with the 'stream' query parameter
+    (e.g. ?export=csv&stream=true), and supports the following formats:
+
+    - csv: Comma separated values
+    - jsonl: JSON Lines (one JSON object per row)
+
+    Rows are read from the database in chunks and serialized one at a time,
+    so memory usage does not depend on the number of exported rows.
+    """
+
+    STREAM_QUERY_PARAMETER = 'stream'
+    STREAM_FORMATS = {'csv': 'text/csv', 'jsonl': 'application/jsonl'}
+    STREAM_CHUNK_SIZE = 2000
+
+    def get(self, request, *args, **kwargs):
+        """Stream the exported data, if requested."""
+        params = request.query_params
+
+        export_format = str(params.get('export', '')).strip().lower()
+
+        if export_format and (
+            export_format == 'jsonl'
+            or str2bool(params.get(self.STREAM_QUERY_PARAMETER, False))
+        ):
+            if export_format not in self.STREAM_FORMATS:
+                raise ValidationError({
+                    'export': _('Streaming export is only supported for formats')
+                    + ': '
+                    + ', '.join(self.STREAM_FORMATS.keys())
+                })
+
+            return self.stream_export(export_format)
+
+        return super().get(request, *args, **kwargs)
+
+    def stream_export(self, export_format: str) -> StreamingHttpResponse:
+        """Return a streaming response containing the exported data.
+
+        The export serializer (and column headers) match those used by DataExportViewMixin,
+        so streamed and non-streamed exports of the same endpoint contain the same data.
+
+        Arguments:
+            export_format: The file format (csv or jsonl)
+        """
+        serializer_class = self.get_serializer_class()
+        queryset = self.filter_queryset(self.get_queryset())
+
+        serializer = serializer_class(exporting=True)
+
+        # Map of exported field names to column headers
+        headers = serializer.generate_headers()
+
+        rows = (
+            serializer.process_row(serializer.to_representation(instance))
+            for instance in queryset.iterator(chunk_size=self.STREAM_CHUNK_SIZE)
+        )
+
+        if export_format == 'csv':
+            content = self.stream_csv(headers, rows)
+        else:
+            content = self.stream_jsonl(headers, rows)
+
+        filename = serializer.get_exported_filename(export_format)
+
+        response = StreamingHttpResponse(
+            content, content_type=self.STREAM_FORMATS[export_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+        return response
+
+    @staticmethod
+    def stream_csv(headers: dict, rows):
+        """Generate CSV data, one row at a time."""
 
+        def table():
+            yield list(headers.values())
 
-class GeneralExtraLineList(DataExportViewMixin):
+            for row in rows:
+                values = []
+
+                for name in headers:
+                    value = row.get(name)
+
+                    # Nested data is exported as a JSON string
+                    if isinstance(value, (dict, list)):
+                        value = json.dumps(value, cls=DjangoJSONEncoder)
+
+                    values.append('' if value is None else value)
+
+                yield values
+
+        return stream_delimited(table())
+
+    @staticmethod
+    def stream_jsonl(headers: dict, rows):
+        """Generate JSON Lines data, one row at a time (keyed by column header)."""
+        for row in rows:
+            data = {label: row.get(name) for name, label in headers.items()}
+            yield json.dumps(data, cls=DjangoJSONEncoder) + '\n'
+
+
+class GeneralExtraLineList(StreamingExportMixin, DataExportViewMixin):
     """General template for ExtraLine API classes."""
 
     def get_serializer(self, *args, **kwargs):
@@ -166,6 +415,80 @@ class OrderCreateMixin:
         )
 
 
+class OrderFieldSelectionMixin:
+    """Mixin class which allows the client to request a subset of serializer fields.
+
+    Fields are selected with the 'fields' query parameter (e.g. ?fields=pk,reference,status).
+    Only the requested fields are serialized, and only the annotations
+    required by those fields are applied to the queryset.
+    """
+
+    def get_requested_fields(self):
+        """Return the set of fields requested by the client.
+
+        Returns:
+            A set of field names, or None if all fields should be returned
+        """
+        request = getattr(self, 'request', None)
+
+        if request is None or request.method != 'GET':
+            return None
+
+        params = request.query_params
+
+        # Data export requires the complete set of fields
+        if 'export' in params:
+            return None
+
+        fields = {
+            field.strip()
+            for field in params.get('fields', '').split(',')
+            if field.strip()
+        }
+
+        if not fields:
+            return None
+
+        return fields | {'pk'}
+
+    def get_annotated_fields(self):
+        """Return the set of fields which must be annotated onto the queryset.
+
+        Annotations which are required to order the results are included,
+        even if the field itself was not requested.
+        """
+        fields = self.get_requested_fields()
+
+        if fields is None:
+            return None
+
+        ordering = self.request.query_params.get('ordering', None) or getattr(
+            self, 'ordering', None
+        )
+
+        if not ordering:
+            ordering = []
+        elif isinstance(ordering, str):
+            ordering = ordering.split(',')
+
+        return fields | {term.strip().lstrip('-') for term in ordering}
+
+    def select_fields(self, serializer):
+        """Remove any fields from the serializer which were not requested."""
+        fields = self.get_requested_fields()
+
+        if fields is None:
+            return serializer
+
+        # Handle list serializers (many=True)
+        target = getattr(serializer, 'child', serializer)
+
+        for name in set(target.fields.keys()) - fields:
+            target.fields.pop(name)
+
+        return serializer
+
+
 class OrderFilter(rest_filters.FilterSet):
     """Base class for custom API filters for the OrderList endpoint."""
 
@@ -318,7 +641,7 @@ class PurchaseOrderFilter(OrderFilter):
     )
 
 
-class PurchaseOrderMixin:
+class PurchaseOrderMixin(OrderFieldSelectionMixin):
     """Mixin class for PurchaseOrder endpoints."""
 
     queryset = models.PurchaseOrder.objects.all()
@@ -336,23 +659,34 @@ class PurchaseOrderMixin:
         # Ensure the request context is passed through
         kwargs['context'] = self.get_serializer_context()
 
-        return self.serializer_class(*args, **kwargs)
+        return self.select_fields(self.serializer_class(*args, **kwargs))
 
     def get_queryset(self, *args, **kwargs):
         """Return the annotated queryset for this endpoint."""
         queryset = super().get_queryset(*args, **kwargs)
 
+        fields = self.get_annotated_fields()
+
         queryset = queryset.prefetch_related(
-            'supplier', 'project_code', 'lines', 'responsible'
+            'supplier', 'project_code', 'responsible'
         )
 
-        queryset = serializers.PurchaseOrderSerializer.annotate_queryset(queryset)
+        if fields is None:
+            queryset = queryset.prefetch_related('lines')
+
+        queryset = serializers.PurchaseOrderSerializer.annotate_queryset(
+            queryset, fields=fields
+        )
 
         return queryset
 
 
 class PurchaseOrderList(
-    PurchaseOrderMixin, OrderCreateMixin, DataExportViewMixin, ListCreateAPI
+    PurchaseOrderMixin,
+    OrderCreateMixin,
+    StreamingExportMixin,
+    DataExportViewMixin,
+    ListCreateAPI,
 ):
     """API endpoint for accessing a list of PurchaseOrder objects.
 
@@ -378,6 +712,14 @@ class PurchaseOrderList(
 
         return queryset
 
+    pagination_class = OrderKeysetPagination
+
+    keyset_fields = {
+        'reference': 'reference_int',
+        'creation_date': 'creation_date',
+        'target_date': 'target_date',
+    }
+
     filter_backends = SEARCH_ORDER_FILTER_ALIAS
 
     ordering_field_aliases = {
@@ -475,12 +817,52 @@ class PurchaseOrderReceive(PurchaseOrderContextMixin, CreateAPI):
         - batch_code: the batch code for this stock item
         - serial_numbers: serial numbers for this stock item
     - A global location must also be specified. This is used when no locations are specified for items, and no location is given in the PO line item
+
+    If "background" is specified, the items are received by the background worker,
+    and the created PurchaseOrderReceiveJob is returned (with a 202 status code).
+    Job progress can then be checked via the PurchaseOrderReceiveJobDetail endpoint.
     """
 
     queryset = models.PurchaseOrderLineItem.objects.none()
 
     serializer_class = serializers.PurchaseOrderReceiveSerializer
 
+    def create(self, request, *args, **kwargs):
+        """Receive items, or return the background job (if requested)."""
+        self.receive_job = None
+
+        response = super().create(request, *args, **kwargs)
+
+        if self.receive_job:
+            return Response(
+                serializers.PurchaseOrderReceiveJobSerializer(self.receive_job).data,
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        return response
+
+    def perform_create(self, serializer):
+        """Save the serializer, keeping a reference to any background job."""
+        result = serializer.save()
+
+        if isinstance(result, models.PurchaseOrderReceiveJob):
+            self.receive_job = result
+
+
+class PurchaseOrderReceiveJobDetail(RetrieveAPI):
+    """API endpoint for checking the progress of a background 'receive' operation.
+
+    Reports the number of rows processed and failed, and the IDs of created stock items.
+    """
+
+    queryset = models.PurchaseOrderReceiveJob.objects.all()
+    serializer_class = serializers.PurchaseOrderReceiveJobSerializer
+    lookup_url_kwarg = 'job'
+
+    def get_queryset(self):
+        """Limit the queryset to jobs for the specified PurchaseOrder."""
+        return super().get_queryset().filter(order=self.kwargs.get('pk', None))
+
 
 class PurchaseOrderLineItemFilter(LineItemFilter):
     """Custom filters for the PurchaseOrderLineItemList endpoint."""
@@ -620,7 +1002,10 @@ class PurchaseOrderLineItemMixin:
 
 
 class PurchaseOrderLineItemList(
-    PurchaseOrderLineItemMixin, DataExportViewMixin, ListCreateDestroyAPIView
+    PurchaseOrderLineItemMixin,
+    StreamingExportMixin,
+    DataExportViewMixin,
+    ListCreateDestroyAPIView,
 ):
     """API endpoint for accessing a list of PurchaseOrderLineItem objects.
 
@@ -668,6 +1053,14 @@ class PurchaseOrderLineItemList(
             serializer.data, status=status.HTTP_201_CREATED, headers=headers
         )
 
+    pagination_class = OrderKeysetPagination
+
+    keyset_fields = {
+        'order': 'order__reference_int',
+        'creation_date': 'order__creation_date',
+        'target_date': 'target_date',
+    }
+
     filter_backends = SEARCH_ORDER_FILTER_ALIAS
 
     ordering_field_aliases = {
@@ -782,7 +1175,7 @@ class SalesOrderFilter(OrderFilter):
     )
 
 
-class SalesOrderMixin:
+class SalesOrderMixin(OrderFieldSelectionMixin):
     """Mixin class for SalesOrder endpoints."""
 
     queryset = models.SalesOrder.objects.all()
@@ -791,32 +1184,55 @@ class SalesOrderMixin:
     def get_serializer(self, *args, **kwargs):
         """Return serializer instance for this endpoint."""
         try:
-            kwargs['customer_detail'] = str2bool(
-                self.request.query_params.get('customer_detail', False)
-            )
+            params = self.request.query_params
+
+            kwargs['customer_detail'] = str2bool(params.get('customer_detail', False))
+            kwargs['readiness'] = str2bool(params.get('readiness', False))
         except AttributeError:
             pass
 
         # Ensure the context is passed through to the serializer
         kwargs['context'] = self.get_serializer_context()
 
-        return self.serializer_class(*args, **kwargs)
+        serializer = self.select_fields(self.serializer_class(*args, **kwargs))
+
+        if kwargs.get('many') and args:
+            fields = serializer.child.fields
+
+            if any(field in fields for field in serializer.child.READINESS_FIELDS):
+                # Calculate the allocation status of every order with a single query
+                serializer.context['readiness'] = models.SalesOrder.get_readiness(
+                    args[0], include_counts=False
+                )
+
+        return serializer
 
     def get_queryset(self, *args, **kwargs):
         """Return annotated queryset for this endpoint."""
         queryset = super().get_queryset(*args, **kwargs)
 
+        fields = self.get_annotated_fields()
+
         queryset = queryset.prefetch_related(
-            'customer', 'responsible', 'project_code', 'lines'
+            'customer', 'responsible', 'project_code'
         )
 
-        queryset = serializers.SalesOrderSerializer.annotate_queryset(queryset)
+        if fields is None:
+            queryset = queryset.prefetch_related('lines')
+
+        queryset = serializers.SalesOrderSerializer.annotate_queryset(
+            queryset, fields=fields
+        )
 
         return queryset
 
 
 class SalesOrderList(
-    SalesOrderMixin, OrderCreateMixin, DataExportViewMixin, ListCreateAPI
+    SalesOrderMixin,
+    OrderCreateMixin,
+    StreamingExportMixin,
+    DataExportViewMixin,
+    ListCreateAPI,
 ):
     """API endpoint for accessing a list of SalesOrder objects.
 
@@ -841,6 +1257,14 @@ class SalesOrderList(
 
         return queryset
 
+    pagination_class = OrderKeysetPagination
+
+    keyset_fields = {
+        'reference': 'reference_int',
+        'creation_date': 'creation_date',
+        'target_date': 'target_date',
+    }
+
     filter_backends = SEARCH_ORDER_FILTER_ALIAS
 
     ordering_field_aliases = {
@@ -994,12 +1418,23 @@ class SalesOrderLineItemMixin:
 
 
 class SalesOrderLineItemList(
-    SalesOrderLineItemMixin, DataExportViewMixin, ListCreateAPI
+    SalesOrderLineItemMixin,
+    StreamingExportMixin,
+    DataExportViewMixin,
+    ListCreateAPI,
 ):
     """API endpoint for accessing a list of SalesOrderLineItem objects."""
 
     filterset_class = SalesOrderLineItemFilter
 
+    pagination_class = OrderKeysetPagination
+
+    keyset_fields = {
+        'order': 'order__reference_int',
+        'creation_date': 'order__creation_date',
+        'target_date': 'target_date',
+    }
+
     filter_backends = SEARCH_ORDER_FILTER_ALIAS
 
     ordering_fields = [
@@ -1387,7 +1822,7 @@ class ReturnOrderFilter(OrderFilter):
     )
 
 
-class ReturnOrderMixin:
+class ReturnOrderMixin(OrderFieldSelectionMixin):
     """Mixin class for ReturnOrder endpoints."""
 
     queryset = models.ReturnOrder.objects.all()
@@ -1405,23 +1840,34 @@ class ReturnOrderMixin:
         # Ensure the context is passed through to the serializer
         kwargs['context'] = self.get_serializer_context()
 
-        return self.serializer_class(*args, **kwargs)
+        return self.select_fields(self.serializer_class(*args, **kwargs))
 
     def get_queryset(self, *args, **kwargs):
         """Return annotated queryset for this endpoint."""
         queryset = super().get_queryset(*args, **kwargs)
 
+        fields = self.get_annotated_fields()
+
         queryset = queryset.prefetch_related(
-            'customer', 'lines', 'project_code', 'responsible'
+            'customer', 'project_code', 'responsible'
         )
 
-        queryset = serializers.ReturnOrderSerializer.annotate_queryset(queryset)
+        if fields is None:
+            queryset = queryset.prefetch_related('lines')
+
+        queryset = serializers.ReturnOrderSerializer.annotate_queryset(
+            queryset, fields=fields
+        )
 
         return queryset
 
 
 class ReturnOrderList(
-    ReturnOrderMixin, OrderCreateMixin, DataExportViewMixin, ListCreateAPI
+    ReturnOrderMixin,
+    OrderCreateMixin,
+    StreamingExportMixin,
+    DataExportViewMixin,
+    ListCreateAPI,
 ):
     """API endpoint for accessing a list of ReturnOrder objects."""
 
@@ -1566,7 +2012,10 @@ class ReturnOrderLineItemMixin:
 
 
 class ReturnOrderLineItemList(
-    ReturnOrderLineItemMixin, DataExportViewMixin, ListCreateAPI
+    ReturnOrderLineItemMixin,
+    StreamingExportMixin,
+    DataExportViewMixin,
+    ListCreateAPI,
 ):
     """API endpoint for accessing a list of ReturnOrderLineItemList objects."""
 
@@ -1616,6 +2065,13 @@ class OrderCalendarExport(ICalFeed):
     timezone = settings.TIME_ZONE
     file_name = 'calendar.ics'
 
+    # Cache timeout for the rendered calendar feed (seconds)
+    # The cache is also invalidated whenever an order is saved or deleted
+    CALENDAR_CACHE_TIMEOUT = 3600
+
+    # Cache timeout for verified basic auth credentials (seconds)
+    CREDENTIAL_CACHE_TIMEOUT = 300
+
     def __call__(self, request, *args, **kwargs):
         """Overload call in order to check for authentication.
 
@@ -1628,11 +2084,9 @@ class OrderCalendarExport(ICalFeed):
         https://stackoverflow.com/questions/152248/can-i-use-http-basic-authentication-with-django
         https://www.djangosnippets.org/snippets/243/
         """
-        import base64
-
         if request.user.is_authenticated:
             # Authenticated on first try - maybe normal browser call?
-            return super().__call__(request, *args, **kwargs)
+            return self.cached_response(request, *args, **kwargs)
 
         # No login yet - check in headers
         if 'authorization' in request.headers:
@@ -1641,16 +2095,12 @@ class OrderCalendarExport(ICalFeed):
                 # NOTE: We are only support basic authentication for now.
                 #
                 if auth[0].lower() == 'basic':
-                    uname, passwd = base64.b64decode(auth[1]).decode('ascii').split(':')
-                    user = authenticate(username=uname, password=passwd)
-                    if user is not None and user.is_active:
-                        login(request, user)
-                        request.user = user
+                    self.authenticate_basic(request, auth[1])
 
         # Check again
         if request.user.is_authenticated:
             # Authenticated after second try
-            return super().__call__(request, *args, **kwargs)
+            return self.cached_response(request, *args, **kwargs)
 
         # Still nothing - return Unauth. header with info on how to authenticate
         # Information is needed by client, eg Thunderbird
@@ -1661,6 +2111,117 @@ class OrderCalendarExport(ICalFeed):
         response.status_code = 401
         return response
 
+    def authenticate_basic(self, request, credentials: str):
+        """Authenticate the request using the provided basic auth credentials.
+
+        Calendar clients poll the feed frequently, and checking the password hash
+        on every request is expensive. Once a set of credentials has been verified,
+        the result is cached for a short time (keyed on a HMAC of the credentials).
+
+        A cached result is only accepted if the user is still active,
+        and the user's password has not changed since the credentials were verified
+        (the session auth hash, an HMAC of the password hash, is compared).
+        """
+        import base64
+
+        try:
+            uname, passwd = base64.b64decode(credentials).decode('ascii').split(':', 1)
+        except Exception:
+            return
+
+        cache_key = 'order_calendar_auth_' + salted_hmac(
+            'order.calendar.credentials', f'{uname}:{passwd}', algorithm='sha256'
+        ).hexdigest()
+
+        if cached := cache.get(cache_key):
+            user = (
+                get_user_model()
+                .objects.filter(pk=cached['user'], is_active=True)
+                .first()
+            )
+
+            if user is not None and constant_time_compare(
+                user.get_session_auth_hash(), cached['auth_hash']
+            ):
+                request.user = user
+                return
+
+            cache.delete(cache_key)
+
+        user = authenticate(username=uname, password=passwd)
+
+        if user is not None and user.is_active:
+            login(request, user)
+            request.user = user
+
+            cache.set(
+                cache_key,
+                {'user': user.pk, 'auth_hash': user.get_session_auth_hash()},
+                self.CREDENTIAL_CACHE_TIMEOUT,
+            )
+
+    def cached_response(self, request, *args, **kwargs):
+        """Return the calendar feed, using a cached copy where possible.
+
+        - The rendered feed is cached per order type (and include_completed option)
+        - ETag and Last-Modified headers are provided with the response
+        - A '304 Not Modified' response is returned if the client already has the current feed
+        """
+        obj = self.get_object(request, *args, **kwargs)
+
+        cache_key = models.ORDER_CALENDAR_CACHE_KEY.format(
+            ordertype=obj['ordertype'], include_completed=obj['include_completed']
+        )
+
+        feed = cache.get(cache_key)
+
+        if feed is None:
+            response = super().__call__(request, *args, **kwargs)
+
+            if response.status_code != 200:
+                return response
+
+            # The ETag is not used for security purposes
+            content_hash = hashlib.md5(response.content, usedforsecurity=False)
+
+            feed = {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'disposition': response.get('Content-Disposition', None),
+                'etag': f'"{content_hash.hexdigest()}"',
+                'modified': int(time.time()),
+            }
+
+            cache.set(cache_key, feed, self.CALENDAR_CACHE_TIMEOUT)
+
+        if self.is_not_modified(request, feed):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(feed['content'], content_type=feed['content_type'])
+
+            if feed['disposition']:
+                response['Content-Disposition'] = feed['disposition']
+
+        response['ETag'] = feed['etag']
+        response['Last-Modified'] = http_date(feed['modified'])
+
+        return response
+
+    @staticmethod
+    def is_not_modified(request, feed: dict) -> bool:
+        """Determine if the client already has the current version of the feed."""
+        if if_none_match := request.headers.get('If-None-Match', None):
+            etags = [
+                tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+            ]
+            return '*' in etags or feed['etag'] in etags
+
+        if if_modified_since := request.headers.get('If-Modified-Since', None):
+            modified_since = parse_http_date_safe(if_modified_since)
+            return modified_since is not None and feed['modified'] <= modified_since
+
+        return False
+
     def get_object(self, request, *args, **kwargs):
         """This is where settings from the URL etc will be obtained."""
         # Help:
@@ -1728,6 +2289,11 @@ class OrderCalendarExport(ICalFeed):
         else:
             outlist = []
 
+        if obj['ordertype'] == 'purchase-order':
+            outlist = outlist.select_related('supplier')
+        elif obj['ordertype'] in ['sales-order', 'return-order']:
+            outlist = outlist.select_related('customer')
+
         return outlist
 
     def item_title(self, item):
@@ -1790,8 +2356,18 @@ order_api_urls = [
                     ),
                     path(
                         'receive/',
-                        PurchaseOrderReceive.as_view(),
-                        name='api-po-receive',
+                        include([
+                            path(
+                                '<int:job>/',
+                                PurchaseOrderReceiveJobDetail.as_view(),
+                                name='api-po-receive-job',
+                            ),
+                            path(
+                                '',
+                                PurchaseOrderReceive.as_view(),
+                                name='api-po-receive',
+                            ),
+                        ]),
                     ),
                     # PurchaseOrder detail API endpoint
                     path('', PurchaseOrderDetail.as_view(), name='api-po-detail'),
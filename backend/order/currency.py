@@ -0,0 +1,145 @@
+"""Currency conversion helpers for the order app.
+
+Converting each line item individually (via djmoney's convert_money function)
+requires a database lookup for every conversion.
+
+The CurrencyConversionContext class loads all of the required exchange rates
+in a single query, and converts grouped amounts once per source currency.
+"""
+
+from decimal import Decimal
+
+from djmoney.contrib.exchange.exceptions import MissingRate
+from djmoney.contrib.exchange.models import Rate, get_default_backend_name
+from djmoney.money import Money
+
+from common.currency import currency_code_default
+
+
+class CurrencyConversionContext:
+    """Convert monetary amounts into a single target currency.
+
+    Exchange rates are loaded (once) on demand, and cached for the lifetime of the context.
+
+    Example:
+        context = CurrencyConversionContext('USD')
+        total = context.total([Money(10, 'EUR'), Money(5, 'AUD'), Money(7, 'EUR')])
+    """
+
+    def __init__(self, target_currency: str | None = None, currencies=None):
+        """Initialize the conversion context.
+
+        Arguments:
+            target_currency: Currency code to convert into (defaults to the system currency)
+            currencies: Optional list of source currency codes, used to preload exchange rates
+        """
+        if target_currency is None:
+            target_currency = currency_code_default()
+
+        self.target_currency = str(target_currency)
+
+        self.base_currency = None
+        self.rates = None
+
+        if currencies:
+            self.load_rates(currencies)
+
+    def load_rates(self, currencies=None):
+        """Load exchange rates for the provided currencies (in a single query).
+
+        Arguments:
+            currencies: List of source currency codes (if None, all rates are loaded)
+        """
+        rates = Rate.objects.filter(backend=get_default_backend_name())
+
+        if currencies is not None:
+            codes = {str(c) for c in currencies}
+            codes.add(self.target_currency)
+            rates = rates.filter(currency__in=codes)
+
+        self.rates = self.rates or {}
+
+        for rate in rates.select_related('backend'):
+            self.base_currency = rate.backend.base_currency
+            self.rates[rate.currency] = rate.value
+
+    def get_rate(self, currency: str) -> Decimal:
+        """Return the exchange rate from the provided currency to the target currency.
+
+        Raises:
+            MissingRate: If no exchange rate is available
+        """
+        currency = str(currency)
+
+        if currency == self.target_currency:
+            return Decimal(1)
+
+        if self.rates is None or currency not in self.rates:
+            self.load_rates([currency])
+
+        def rate_from_base(code):
+            """Return the exchange rate from the base currency to the provided currency."""
+            if code == self.base_currency:
+                return Decimal(1)
+
+            if code not in self.rates:
+                raise MissingRate(
+                    f'Rate {currency} -> {self.target_currency} does not exist'
+                )
+
+            return self.rates[code]
+
+        return rate_from_base(self.target_currency) / rate_from_base(currency)
+
+    def convert(self, amount: Decimal, currency: str) -> Decimal:
+        """Convert the provided amount into the target currency."""
+        return amount * self.get_rate(currency)
+
+    def convert_money(self, value: Money) -> Money:
+        """Convert the provided Money object into the target currency."""
+        return Money(
+            self.convert(value.amount, str(value.currency)), self.target_currency
+        )
+
+    def total_grouped(self, amounts: dict) -> Money:
+        """Return the total of amounts which are already grouped by currency.
+
+        Arguments:
+            amounts: Mapping of {currency code: Decimal amount}
+        """
+        total = Decimal(0)
+
+        for currency, amount in amounts.items():
+            if amount:
+                total += self.convert(amount, currency)
+
+        return Money(total, self.target_currency)
+
+    def total(self, values) -> Money:
+        """Return the total of the provided Money objects, in the target currency.
+
+        Values are summed per source currency, so each currency is converted only once.
+        Empty (None) values are ignored.
+        """
+        return self.total_grouped(group_amounts(values))
+
+
+def group_amounts(values) -> dict:
+    """Sum the provided Money objects, grouped by currency code.
+
+    Arguments:
+        values: Iterable of Money objects (None values are ignored)
+
+    Returns:
+        dict: Mapping of {currency code: Decimal amount}
+    """
+    amounts = {}
+
+    for value in values:
+        if not value:
+            continue
+
+        currency = str(value.currency)
+        amounts[currency] = amounts.get(currency, Decimal(0)) + value.amount
+
+    return amounts
@@ -37,3 +37,5 @@ class ReturnOrderEvents(BaseEventEnum):
     COMPLETED = 'returnorder.completed'
     CANCELLED = 'returnorder.cancelled'
     HOLD = 'returnorder.hold'
+
+    OVERDUE = 'order.overdue_return_order'
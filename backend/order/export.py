@@ -0,0 +1,24 @@
+"""Helper functions for streaming exported order data."""
+
+import csv
+
+
+class Echo:
+    """Pseudo-buffer which returns the written value, rather than storing it."""
+
+    def write(self, value):
+        """Return the provided value."""
+        return value
+
+
+def stream_delimited(rows, delimiter: str = ','):
+    """Generate delimited (e.g. CSV) text data, one row at a time.
+
+    Arguments:
+        rows: Iterable of rows (each row is a list of values)
+        delimiter: Field delimiter character
+    """
+    writer = csv.writer(Echo(), delimiter=delimiter)
+
+    for row in rows:
+        yield writer.writerow(row)
@@ -0,0 +1,65 @@
+"""Custom management command to check the stored allocation totals for sales order line items.
+
+- Reports any SalesOrderLineItem where 'allocated_total' does not match the allocations
+- Run with --repair to recalculate the incorrect values
+"""
+
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from sql_util.utils import SubquerySum
+
+
+class Command(BaseCommand):
+    """Check (and optionally repair) the 'allocated_total' field for SalesOrderLineItem objects."""
+
+    # Number of line items to repair per query
+    BATCH_SIZE = 1000
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--repair',
+            action='store_true',
+            help='Recalculate the allocated total for any incorrect line items',
+        )
+
+    def handle(self, *args, **kwargs):
+        """Check the allocated total for all SalesOrderLineItem objects."""
+        from order.models import SalesOrderLineItem
+
+        lines = (
+            SalesOrderLineItem.objects.annotate(
+                actual=Coalesce(
+                    SubquerySum('allocations__quantity'),
+                    Decimal(0),
+                    output_field=models.DecimalField(),
+                )
+            )
+            .exclude(allocated_total=F('actual'))
+            .order_by('pk')
+        )
+
+        line_ids = list(lines.values_list('pk', flat=True))
+
+        if not line_ids:
+            self.stdout.write('All line items have the correct allocated total')
+            return
+
+        self.stdout.write(
+            f'Found {len(line_ids)} line items with an incorrect allocated total'
+        )
+
+        if not kwargs.get('repair'):
+            return
+
+        for start in range(0, len(line_ids), self.BATCH_SIZE):
+            SalesOrderLineItem.update_allocated_total(
+                line_ids[start : start + self.BATCH_SIZE]
+            )
+
+        self.stdout.write(f'Repaired {len(line_ids)} line items')
@@ -1,25 +1,28 @@
 """Order model definitions."""
 
 import logging
+import threading
 from datetime import datetime
 from decimal import Decimal
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models, transaction
-from django.db.models import F, Q, Sum
+from django.db import connection, models, transaction
+from django.db.models import Case, Count, F, Max, Q, Sum, Value, When
 from django.db.models.functions import Coalesce
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch.dispatcher import receiver
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from djmoney.contrib.exchange.exceptions import MissingRate
-from djmoney.contrib.exchange.models import convert_money
+from djmoney.contrib.exchange.models import ExchangeBackend
 from djmoney.money import Money
 from mptt.models import TreeForeignKey
+from sql_util.utils import SubquerySum
 
 import common.models as common_models
 import InvenTree.helpers
@@ -30,6 +33,7 @@ import InvenTree.validators
 import order.validators
 import report.mixins
 import stock.models
+import stock.tasks
 import users.models as UserModels
 from common.currency import currency_code_default
 from common.notifications import InvenTreeNotificationBodies
@@ -45,6 +49,7 @@ from InvenTree.fields import (
 )
 from InvenTree.helpers import decimal2string, pui_url
 from InvenTree.helpers_model import notify_responsible
+from order.currency import CurrencyConversionContext, group_amounts
 from order.events import PurchaseOrderEvents, ReturnOrderEvents, SalesOrderEvents
 from order.status_codes import (
     PurchaseOrderStatus,
@@ -57,10 +62,14 @@ from order.status_codes import (
 )
 from part import models as PartModels
 from plugin.events import trigger_event
+from plugin.models import BarcodeHashIndex
 from stock.status_codes import StockHistoryCode, StockStatus
 
 logger = logging.getLogger('inventree')
 
+# Advisory lock ID used to serialize stock item tree ID allocation
+STOCK_TREE_LOCK_ID = 0x53544B54
+
 
 class TotalPriceMixin(models.Model):
     """Mixin which provides 'total_price' field for an order."""
@@ -71,17 +80,15 @@ class TotalPriceMixin(models.Model):
         abstract = True
 
     def save(self, *args, **kwargs):
-        """Update the total_price field when saved."""
-        # Recalculate total_price for this order
-        self.update_total_price(commit=False)
+        """Update the total_price field when saved.
 
-        if hasattr(self, '_SAVING_TOTAL_PRICE') and self._SAVING_TOTAL_PRICE:
-            # Avoid recursion on save
-            return super().save(*args, **kwargs)
-        self._SAVING_TOTAL_PRICE = True
+        A full recalculation is only performed if the stored total price is no longer valid.
+        Changes to individual line items are applied via apply_total_price_delta()
+        """
+        if self.total_price_requires_update():
+            self.update_total_price(commit=False)
 
-        # Save the object as we can not access foreign/m2m fields before saving
-        self.update_total_price(commit=True)
+        super().save(*args, **kwargs)
 
     total_price = InvenTreeModelMoneyField(
         null=True,
@@ -118,6 +125,19 @@ class TotalPriceMixin(models.Model):
         # Return default currency code
         return currency_code_default()
 
+    def total_price_requires_update(self) -> bool:
+        """Determine if the stored total_price needs to be fully recalculated.
+
+        This is the case if:
+        - The order has not yet been saved
+        - The previous calculation failed (e.g. missing exchange rate)
+        - The order currency has changed since the total was calculated
+        """
+        if self.pk is None or self.total_price is None:
+            return True
+
+        return str(self.total_price.currency) != self.currency
+
     def update_total_price(self, commit=True):
         """Recalculate and save the total_price for this order."""
         self.total_price = self.calculate_total_price(target_currency=self.currency)
@@ -125,6 +145,56 @@ class TotalPriceMixin(models.Model):
         if commit:
             self.save()
 
+    def apply_total_price_delta(self, removed=None, added=None):
+        """Incrementally update the total_price for this order.
+
+        Arguments:
+            removed: Line total (Money) which is no longer counted against this order
+            added: Line total (Money) which is now counted against this order
+
+        Amounts are grouped by currency, so that each currency is converted at most once.
+        The resulting delta is applied to the stored total in a single UPDATE query.
+        If the stored total cannot be updated incrementally, a full recalculation is performed.
+        """
+        if self.pk is None:
+            return
+
+        if self.total_price_requires_update():
+            self.update_total_price()
+            return
+
+        context = CurrencyConversionContext(self.currency)
+
+        amounts = group_amounts([added])
+
+        for currency, amount in group_amounts([removed]).items():
+            amounts[currency] = amounts.get(currency, Decimal(0)) - amount
+
+        try:
+            delta = context.total_grouped(amounts).amount
+        except MissingRate:
+            log_error('order.apply_total_price_delta')
+            logger.exception("Missing exchange rate for '%s'", context.target_currency)
+
+            # Fall back to a full recalculation (which will mark the total as invalid)
+            self.update_total_price()
+            return
+
+        if delta == 0:
+            return
+
+        updated = self.__class__.objects.filter(
+            pk=self.pk,
+            total_price__isnull=False,
+            total_price_currency=context.target_currency,
+        ).update(total_price=F('total_price') + delta)
+
+        if updated == 0:
+            # Stored total does not match the expected currency
+            self.update_total_price()
+        else:
+            self.refresh_from_db(fields=['total_price', 'total_price_currency'])
+
     def calculate_total_price(self, target_currency=None):
         """Calculates the total price of all order lines, and converts to the specified target currency.
 
@@ -143,35 +213,33 @@ class TotalPriceMixin(models.Model):
         if self.pk is None:
             return total
 
-        # order items
-        for line in self.lines.all():
-            if not line.price:
-                continue
+        # Sum the line totals (for both order items and extra items), grouped by currency
+        amounts = {}
 
-            try:
-                total += line.quantity * convert_money(line.price, target_currency)
-            except MissingRate:
-                log_error('order.calculate_total_price')
-                logger.exception("Missing exchange rate for '%s'", target_currency)
+        for lines in [self.lines, self.extra_lines]:
+            price_field = lines.model.PRICE_FIELD
 
-                # Return None to indicate the calculated price is invalid
-                return None
+            queryset = lines.exclude(**{price_field: None}).values_list(
+                price_field, f'{price_field}_currency', 'quantity'
+            )
 
-        # extra items
-        for line in self.extra_lines.all():
-            if not line.price:
-                continue
+            for price, currency, quantity in queryset:
+                if price:
+                    amounts[currency] = (
+                        amounts.get(currency, Decimal(0)) + quantity * price
+                    )
 
-            try:
-                total += line.quantity * convert_money(line.price, target_currency)
-            except MissingRate:
-                # Record the error, try to press on
+        # Convert each currency group only once, using a single exchange rate lookup
+        context = CurrencyConversionContext(target_currency, currencies=amounts.keys())
 
-                log_error('order.calculate_total_price')
-                logger.exception("Missing exchange rate for '%s'", target_currency)
+        try:
+            total = context.total_grouped(amounts)
+        except MissingRate:
+            log_error('order.calculate_total_price')
+            logger.exception("Missing exchange rate for '%s'", target_currency)
 
-                # Return None to indicate the calculated price is invalid
-                return None
+            # Return None to indicate the calculated price is invalid
+            return None
 
         # set decimal-places
         total.decimal_places = 4
@@ -179,6 +247,145 @@ class TotalPriceMixin(models.Model):
         return total
 
 
+class OrderReferenceCounter(models.Model):
+    """Counter used to determine the next reference number for each order type.
+
+    Generating the next reference by inspecting the most recent order requires
+    extra queries for every new (or default) order reference.
+    Instead, each order model has a counter row, which tracks the highest allocated reference number.
+    Reading the counter (peek) does not modify it. New orders with a generated reference
+    are allocated the next number atomically (allocate), and manually entered references
+    advance the counter when saved (advance).
+
+    Attributes:
+        model: The name of the order model (e.g. 'purchaseorder')
+        value: The highest saved reference number
+    """
+
+    class Meta:
+        """Metaclass options for this model."""
+
+        verbose_name = _('Order Reference Counter')
+
+    model = models.CharField(max_length=100, unique=True, verbose_name=_('Model'))
+
+    value = models.BigIntegerField(default=0, verbose_name=_('Value'))
+
+    @staticmethod
+    def get_label(model) -> str:
+        """Return the counter label for the provided order model."""
+        return model._meta.model_name
+
+    @classmethod
+    def peek(cls, model) -> int:
+        """Return the next reference number for the provided order model, without allocating it.
+
+        This does not write to the database, so it is safe to call when generating
+        default values (e.g. for an API OPTIONS request).
+        The counter is only advanced when an order is saved (see advance).
+
+        If no counter exists for the model, the highest existing reference number is used.
+        """
+        value = (
+            cls.objects.filter(model=cls.get_label(model))
+            .values_list('value', flat=True)
+            .first()
+        )
+
+        if value is None:
+            value = model.objects.aggregate(value=Max('reference_int'))['value']
+
+        return (value or 0) + 1
+
+    @classmethod
+    def allocate(cls, model) -> int:
+        """Allocate (and return) the next reference number for the provided order model.
+
+        The counter is incremented with a single UPDATE statement, which holds the row lock
+        until the transaction completes, so concurrent callers never receive the same number.
+        """
+        label = cls.get_label(model)
+
+        with transaction.atomic():
+            if not cls.objects.filter(model=label).update(value=F('value') + 1):
+                # Create the counter, starting from the highest existing reference number
+                latest = model.objects.aggregate(value=Max('reference_int'))['value']
+
+                counter, created = cls.objects.get_or_create(
+                    model=label, defaults={'value': (latest or 0) + 1}
+                )
+
+                if created:
+                    return counter.value
+
+                # The counter was created by a concurrent request
+                cls.objects.filter(model=label).update(value=F('value') + 1)
+
+            return cls.objects.filter(model=label).values_list('value', flat=True).get()
+
+    @classmethod
+    def advance(cls, model, value: int):
+        """Ensure that the counter for the provided model is not behind the provided value.
+
+        This is called whenever an order reference is saved (whether generated or entered manually).
+        If no counter exists for the model, it is created (starting from the highest existing reference number).
+        """
+        label = cls.get_label(model)
+
+        if cls.objects.filter(model=label, value__lt=value).update(value=value):
+            return
+
+        if not cls.objects.filter(model=label).exists():
+            latest = model.objects.aggregate(value=Max('reference_int'))['value']
+
+            cls.objects.get_or_create(
+                model=label, defaults={'value': max(value, latest or 0)}
+            )
+
+
+# Thread-local flag which selects reference allocation (see Order.allocate_reference)
+_reference_allocation = threading.local()
+
+
+class OrderQuerySet(models.QuerySet):
+    """Custom queryset for order models.
+
+    QuerySet.update() and bulk_update() do not send model signals,
+    so any cached calendar feed for the order type is invalidated here.
+    """
+
+    # Order fields which are rendered in the calendar feed
+    CALENDAR_FIELDS = {
+        'reference',
+        'description',
+        'status',
+        'target_date',
+        'creation_date',
+        'supplier',
+        'supplier_id',
+        'customer',
+        'customer_id',
+    }
+
+    def invalidate_calendar(self, fields):
+        """Invalidate the calendar feed, if any of the provided fields are rendered in it."""
+        if self.CALENDAR_FIELDS.intersection(fields):
+            if ordertype := ORDER_CALENDAR_TYPES.get(self.model):
+                invalidate_order_calendar(ordertype)
+
+    def update(self, **kwargs):
+        """Update the selected orders, and invalidate the calendar feed."""
+        result = super().update(**kwargs)
+        self.invalidate_calendar(kwargs.keys())
+        return result
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """Update the provided orders in bulk, and invalidate the calendar feed."""
+        result = super().bulk_update(objs, fields, *args, **kwargs)
+        self.invalidate_calendar(fields)
+        return result
+
+
 class Order(
     StateTransitionMixin,
     InvenTree.models.InvenTreeAttachmentMixin,
@@ -209,17 +416,72 @@ class Order(
 
     REQUIRE_RESPONSIBLE_SETTING = None
 
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         """Metaclass options. Abstract ensures no database table is created."""
 
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Record the reference and status as loaded from the database.
+
+        This is used to determine if these fields have changed when the order is saved.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_reference = instance.__dict__.get('reference')
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    @classmethod
+    def get_next_reference(cls):
+        """Return the next available reference number for this order type.
+
+        The number is read from an OrderReferenceCounter (rather than by inspecting the most recent order).
+        By default the number is not allocated (e.g. for field defaults and OPTIONS requests),
+        unless called via allocate_reference().
+        """
+        if getattr(_reference_allocation, 'active', False):
+            return OrderReferenceCounter.allocate(cls)
+
+        return OrderReferenceCounter.peek(cls)
+
+    @classmethod
+    def allocate_reference(cls) -> str:
+        """Generate a new reference, using an atomically allocated reference number.
+
+        Concurrent callers are guaranteed to receive different reference numbers.
+        """
+        _reference_allocation.active = True
+
+        try:
+            return cls.generate_reference()
+        finally:
+            _reference_allocation.active = False
+
     def save(self, *args, **kwargs):
         """Custom save method for the order models.
 
-        Ensures that the reference field is rebuilt whenever the instance is saved.
+        - A new order with a generated (default) reference is allocated a unique reference
+        - The reference field is rebuilt whenever the reference is changed
         """
-        self.reference_int = self.rebuild_reference_field(self.reference)
+        if self.pk is None and isinstance(
+            self.reference, order.validators.GeneratedReference
+        ):
+            # The default reference is only a preview, which may be used concurrently
+            self.reference = self.allocate_reference()
+
+        if self.pk is None or self.reference != getattr(
+            self, '_loaded_reference', None
+        ):
+            self.reference_int = self.rebuild_reference_field(self.reference)
+
+            # Ensure that automatically generated references do not clash with this one
+            OrderReferenceCounter.advance(self.__class__, self.reference_int)
+
+            self._loaded_reference = self.reference
+
         if not self.creation_date:
             self.creation_date = InvenTree.helpers.current_date()
 
@@ -270,6 +532,8 @@ class Order(
         """A generic implementation of an 'overdue' filter for the Model class.
 
         It requires any subclasses to implement the get_status_class() class method
+
+        Note: Any changes to this filter must also be reflected in the is_overdue property
         """
         today = InvenTree.helpers.current_date()
         return (
@@ -282,12 +546,21 @@ class Order(
     def is_overdue(self):
         """Method to determine if this order is overdue.
 
-        Makes use of the overdue_filter() method to avoid code duplication
+        The rules of the overdue_filter() method are applied to the loaded instance data,
+        so that no database query is required.
+
+        If the instance has been annotated with an 'overdue' value
+        (e.g. by the API serializer), the annotated value is used instead.
         """
+        overdue = getattr(self, 'overdue', None)
+
+        if overdue is not None:
+            return bool(overdue)
+
         return (
-            self.__class__.objects.filter(pk=self.pk)
-            .filter(self.__class__.overdue_filter())
-            .exists()
+            self.status in self.get_status_class().OPEN
+            and self.target_date is not None
+            and self.target_date < InvenTree.helpers.current_date()
         )
 
     description = models.CharField(
@@ -381,6 +654,9 @@ class PurchaseOrder(TotalPriceMixin, Order):
     REFERENCE_PATTERN_SETTING = 'PURCHASEORDER_REFERENCE_PATTERN'
     REQUIRE_RESPONSIBLE_SETTING = 'PURCHASEORDER_REQUIRE_RESPONSIBLE'
 
+    # Number of stock items to create per bulk query when receiving items
+    RECEIVE_CHUNK_SIZE = 500
+
     class Meta:
         """Model meta options."""
 
@@ -796,122 +1072,404 @@ class PurchaseOrder(TotalPriceMixin, Order):
     def receive_line_item(
         self, line, location, quantity, user, status=StockStatus.OK.value, **kwargs
     ):
-        """Receive a line item (or partial line item) against this PurchaseOrder."""
-        # Extract optional batch code for the new stock item
-        batch_code = kwargs.get('batch_code', '')
+        """Receive a line item (or partial line item) against this PurchaseOrder.
 
-        # Extract optional list of serial numbers
-        serials = kwargs.get('serials')
-
-        # Extract optional notes field
-        notes = kwargs.get('notes', '')
+        This is a convenience wrapper around receive_line_items() for a single line.
+        """
+        return self.receive_line_items(
+            location,
+            [{'line_item': line, 'quantity': quantity, 'status': status, **kwargs}],
+            user,
+        )
 
-        # Extract optional packaging field
-        packaging = kwargs.get('packaging')
+    @transaction.atomic
+    def receive_line_items(
+        self, location, items: list, user, progress=None, notify=True
+    ) -> list:
+        """Receive multiple line items against this PurchaseOrder.
 
-        if not packaging:
-            # Default to the packaging field for the linked supplier part
-            if line.part:
-                packaging = line.part.packaging
+        Stock items (and their tracking entries) are created in bulk (in chunks of RECEIVE_CHUNK_SIZE),
+        and the line items are updated with a single query.
+        The order is checked for completion once, after all lines have been received.
 
-        # Extract optional barcode field
-        barcode = kwargs.get('barcode')
+        Arguments:
+            location: Default StockLocation to receive items into
+            items: List of dicts describing the items to receive (see below)
+            user: The User performing the action
+            progress: Optional callback function, called as progress(processed, total) after each chunk
+            notify: If True, notify responsible users that items have been received
+
+        Each entry in 'items' contains:
+            line_item: The PurchaseOrderLineItem to receive against
+            quantity: The quantity to receive (number of packs)
+            location: Destination location (optional, overrides the default location)
+            status: Status code for the received stock (optional)
+            batch_code: Batch code for the received stock (optional)
+            serials: List of serial numbers (optional)
+            packaging: Packaging information (optional)
+            barcode: Barcode data to assign to the received stock (optional)
+            notes: Notes for the stock tracking entries (optional)
 
-        # Prevent null values for barcode
-        if barcode is None:
-            barcode = ''
+        Returns:
+            list: The newly created StockItem objects
 
+        Raises:
+            ValidationError: If the order is not PLACED, or the provided data is invalid
+        """
         if self.status != PurchaseOrderStatus.PLACED:
             raise ValidationError(
                 "Lines can only be received against an order marked as 'PLACED'"
             )
 
-        try:
-            if quantity < 0:
-                raise ValidationError({
-                    'quantity': _('Quantity must be a positive number')
-                })
-            quantity = InvenTree.helpers.clean_decimal(quantity)
-        except TypeError:
-            raise ValidationError({'quantity': _('Invalid quantity provided')})
+        # Fetch all referenced line items (and their linked parts) in a single query
+        line_ids = {item['line_item'].pk for item in items}
+
+        lines = {
+            line.pk: line
+            for line in self.lines.filter(pk__in=line_ids).select_related(
+                'part', 'part__part'
+            )
+        }
+
+        if len(lines) != len(line_ids):
+            raise ValidationError({
+                'line_item': _('Line item does not match purchase order')
+            })
 
-        # Create a new stock item
-        if line.part and quantity > 0:
-            # Calculate received quantity in base units
-            stock_quantity = line.part.base_quantity(quantity)
+        new_items = []
+        tracking_data = []
+        received_items = []
+        received_lines = {}
 
-            # Calculate unit purchase price (in base units)
-            if line.purchase_price:
-                unit_purchase_price = line.purchase_price
-                unit_purchase_price /= line.part.base_quantity(1)
-            else:
-                unit_purchase_price = None
+        for item in items:
+            line = lines[item['line_item'].pk]
+            quantity = item['quantity']
 
-            # Determine if we should individually serialize the items, or not
-            if type(serials) is list and len(serials) > 0:
-                serialize = True
-            else:
-                serialize = False
-                serials = [None]
-
-            for sn in serials:
-                item = stock.models.StockItem(
-                    part=line.part.part,
-                    supplier_part=line.part,
-                    location=location,
-                    quantity=1 if serialize else stock_quantity,
-                    purchase_order=self,
-                    status=status,
-                    batch=batch_code,
-                    packaging=packaging,
-                    serial=sn,
-                    purchase_price=unit_purchase_price,
-                )
+            try:
+                if quantity < 0:
+                    raise ValidationError({
+                        'quantity': _('Quantity must be a positive number')
+                    })
+                quantity = InvenTree.helpers.clean_decimal(quantity)
+            except TypeError:
+                raise ValidationError({'quantity': _('Invalid quantity provided')})
+
+            status = item.get('status', StockStatus.OK.value)
+
+            # Select location (in descending order of priority)
+            loc = item.get('location') or location or line.get_destination()
+
+            # Default to the packaging field for the linked supplier part
+            packaging = item.get('packaging') or (
+                line.part.packaging if line.part else None
+            )
 
-                # Assign the provided barcode
-                if barcode:
-                    item.assign_barcode(barcode_data=barcode, save=False)
+            barcode = item.get('barcode') or ''
+            barcode_hash = ''
+            notes = item.get('notes') or ''
+
+            if barcode:
+                # Hash the barcode once, rather than once per received item
+                barcode_hash = InvenTree.helpers.hash_barcode(barcode)
+
+                if stock.models.StockItem.lookup_barcode(barcode_hash):
+                    raise ValidationError({'barcode': _('Barcode is already in use')})
+
+            if line.part and quantity > 0:
+                # Calculate received quantity in base units
+                stock_quantity = line.part.base_quantity(quantity)
+
+                # Calculate unit purchase price (in base units)
+                if line.purchase_price:
+                    unit_purchase_price = line.purchase_price
+                    unit_purchase_price /= line.part.base_quantity(1)
+                else:
+                    unit_purchase_price = None
+
+                serials = item.get('serials')
+
+                # Determine if we should individually serialize the items, or not
+                if type(serials) is list and len(serials) > 0:
+                    serialize = True
+                else:
+                    serialize = False
+                    serials = [None]
+
+                deltas = {'status': status, 'purchaseorder': self.pk}
+
+                if loc:
+                    deltas['location'] = loc.pk
+
+                deltas['quantity'] = float(quantity)
+
+                for sn in serials:
+                    stock_item = stock.models.StockItem(
+                        part=line.part.part,
+                        supplier_part=line.part,
+                        location=loc,
+                        quantity=1 if serialize else stock_quantity,
+                        purchase_order=self,
+                        status=status,
+                        batch=item.get('batch_code', ''),
+                        packaging=packaging,
+                        serial=sn,
+                        purchase_price=unit_purchase_price,
+                        barcode_data=barcode,
+                        barcode_hash=barcode_hash,
+                    )
+
+                    new_items.append(stock_item)
+                    tracking_data.append((stock_item, notes, deltas))
+                    received_items.append((stock_item, line.pk))
+
+            # Update the number of parts received against the particular line item
+            # Note that this quantity does *not* take the pack_quantity into account, it is "number of packs"
+            line.received += quantity
+            received_lines[line.pk] = line
+
+        # Serial numbers must be checked across the entire request (not per chunk)
+        self.validate_serial_numbers(new_items)
 
-                item.save(add_note=False)
+        total = len(tracking_data)
+        now = InvenTree.helpers.current_time()
 
-                tracking_info = {'status': status, 'purchaseorder': self.pk}
+        # Create the new stock items (and tracking entries) in chunks
+        for start in range(0, total, self.RECEIVE_CHUNK_SIZE):
+            chunk = tracking_data[start : start + self.RECEIVE_CHUNK_SIZE]
 
-                item.add_tracking_entry(
-                    StockHistoryCode.RECEIVED_AGAINST_PURCHASE_ORDER,
-                    user,
+            self.bulk_create_stock_items([stock_item for stock_item, _n, _d in chunk])
+
+            stock.models.StockItemTracking.objects.bulk_create([
+                stock.models.StockItemTracking(
+                    item=stock_item,
+                    tracking_type=StockHistoryCode.RECEIVED_AGAINST_PURCHASE_ORDER.value,
+                    user=user,
+                    date=now,
                     notes=notes,
-                    deltas=tracking_info,
-                    location=location,
-                    purchaseorder=self,
-                    quantity=float(quantity),
+                    deltas=deltas,
                 )
+                for stock_item, notes, deltas in chunk
+            ])
+
+            processed = start + len(chunk)
 
-                trigger_event(
-                    PurchaseOrderEvents.ITEM_RECEIVED,
-                    order_id=self.pk,
-                    item_id=item.pk,
-                    line_id=line.pk,
+            if total > self.RECEIVE_CHUNK_SIZE:
+                logger.info(
+                    'Received %s of %s stock items against %s', processed, total, self
                 )
 
-        # Update the number of parts received against the particular line item
-        # Note that this quantity does *not* take the pack_quantity into account, it is "number of packs"
-        line.received += quantity
-        line.save()
+            if progress:
+                progress(processed, total)
+
+        if new_items:
+            tree_ids = [stock_item.tree_id for stock_item in new_items]
+
+            transaction.on_commit(
+                lambda: self.check_stock_item_trees(min(tree_ids), max(tree_ids))
+            )
+
+        # The 'received' field does not affect the order total, so save() can be bypassed
+        PurchaseOrderLineItem.objects.bulk_update(
+            list(received_lines.values()), ['received']
+        )
+
+        # Availability receivers skip bulk created items, so mark all parts at once
+        mark_part_availability_stale({stock_item.part_id for stock_item in new_items})
+
+        # Pricing data is normally updated when each new stock item is saved
+        for part in {stock_item.part for stock_item in new_items}:
+            part.schedule_pricing_update(create=True)
+
+        for stock_item, line_id in received_items:
+            trigger_event(
+                PurchaseOrderEvents.ITEM_RECEIVED,
+                order_id=self.pk,
+                item_id=stock_item.pk,
+                line_id=line_id,
+            )
 
         # Has this order been completed?
-        if len(self.pending_line_items()) == 0:
-            if get_global_setting('PURCHASEORDER_AUTO_COMPLETE', True):
+        if get_global_setting('PURCHASEORDER_AUTO_COMPLETE', True):
+            if self.pending_line_count == 0:
                 self.received_by = user
                 self.complete_order()  # This will save the model
 
-        # Issue a notification to interested parties, that this order has been "updated"
-        notify_responsible(
-            self,
-            PurchaseOrder,
-            exclude=user,
-            content=InvenTreeNotificationBodies.ItemsReceived,
+        if notify:
+            # Issue a notification to interested parties, that this order has been "updated"
+            notify_responsible(
+                self,
+                PurchaseOrder,
+                exclude=user,
+                content=InvenTreeNotificationBodies.ItemsReceived,
+            )
+
+        return new_items
+
+    @staticmethod
+    def validate_serial_numbers(items: list):
+        """Check that the serial numbers assigned to new (unsaved) stock items are unique.
+
+        This replicates the serial number check performed by StockItem.validate_unique(),
+        with a single query per part tree (rather than a query per item).
+
+        Arguments:
+            items: List of unsaved StockItem instances
+
+        Raises:
+            ValidationError: If a serial number is duplicated, or already exists
+        """
+        globally_unique = get_global_setting('SERIAL_NUMBER_GLOBALLY_UNIQUE', False)
+
+        # Serial numbers are unique within each part tree (or globally)
+        serials = {}
+
+        for item in items:
+            if item.serial in [None, '']:
+                continue
+
+            serial = str(item.serial).strip()
+            tree_id = None if globally_unique else item.part.tree_id
+            group = serials.setdefault(tree_id, set())
+
+            if serial in group:
+                raise ValidationError({
+                    'serials': _('Duplicate serial number') + f': {serial}'
+                })
+
+            group.add(serial)
+
+        for tree_id, group in serials.items():
+            existing = stock.models.StockItem.objects.filter(serial__in=group)
+
+            if tree_id is not None:
+                existing = existing.filter(part__tree_id=tree_id)
+
+            if duplicate := existing.values_list('serial', flat=True).first():
+                raise ValidationError({
+                    'serials': _('Serial number already exists') + f': {duplicate}'
+                })
+
+    @staticmethod
+    def lock_stock_item_trees():
+        """Lock stock item tree ID allocation until the end of the current transaction.
+
+        PostgreSQL uses a transaction level advisory lock.
+        Other database backends lock the root stock item with the highest tree ID.
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [STOCK_TREE_LOCK_ID])
+        else:
+            list(
+                stock.models.StockItem.objects.select_for_update()
+                .filter(level=0)
+                .order_by('-tree_id')
+                .values_list('pk', flat=True)[:1]
+            )
+
+    @staticmethod
+    def bulk_create_stock_items(items: list) -> list:
+        """Create the provided (unsaved) StockItem instances with a single bulk query.
+
+        Each new item is the root node of its own stock item tree,
+        so the MPTT fields are assigned here (bulk_create bypasses the tree manager).
+        Tree IDs are allocated while holding a lock (see lock_stock_item_trees).
+
+        StockItem.save() is not called, but the post_save signal is sent for each new item
+        (with the extra argument bulk=True, so that receivers can skip per-item work
+        which has already been performed for the entire batch).
+
+        Arguments:
+            items: List of unsaved StockItem instances
+
+        Returns:
+            list: The created StockItem instances (with primary keys assigned)
+        """
+        if not items:
+            return items
+
+        StockItem = stock.models.StockItem
+
+        with transaction.atomic():
+            PurchaseOrder.lock_stock_item_trees()
+
+            tree_id = (
+                StockItem.objects.aggregate(tree_id=Max('tree_id'))['tree_id'] or 0
+            )
+
+            for item in items:
+                tree_id += 1
+
+                item.parent = None
+                item.tree_id = tree_id
+                item.level = 0
+                item.lft = 1
+                item.rght = 2
+
+                item.update_serial_number()
+
+            StockItem.objects.bulk_create(items)
+
+            # Some database backends do not return primary keys from bulk_create
+            if any(item.pk is None for item in items):
+                pk_map = dict(
+                    StockItem.objects.filter(
+                        tree_id__in=[item.tree_id for item in items], level=0
+                    ).values_list('tree_id', 'pk')
+                )
+
+                for item in items:
+                    item.pk = pk_map.get(item.tree_id)
+
+            # Index any assigned barcodes (in a single query)
+            BarcodeHashIndex.add_instances(items)
+
+            using = StockItem.objects.db
+
+            for item in items:
+                item._state.adding = False
+                item._state.db = using
+
+                post_save.send(
+                    sender=StockItem,
+                    instance=item,
+                    created=True,
+                    update_fields=None,
+                    raw=False,
+                    using=using,
+                    bulk=True,
+                )
+
+        return items
+
+    @staticmethod
+    def check_stock_item_trees(min_tree_id: int, max_tree_id: int):
+        """Check that bulk created stock items do not share a tree ID with another root node.
+
+        Bulk created stock items allocate tree IDs while holding a lock,
+        but stock items saved individually (via the tree manager) do not take that lock,
+        so a concurrent transaction could still allocate the same tree ID.
+        If any such clash is found, the stock item tree is rebuilt (once) in the background.
+
+        Arguments:
+            min_tree_id: Lowest tree ID to check
+            max_tree_id: Highest tree ID to check
+        """
+        clashes = (
+            stock.models.StockItem.objects.filter(
+                tree_id__gte=min_tree_id, tree_id__lte=max_tree_id, level=0
+            )
+            .values('tree_id')
+            .annotate(roots=Count('pk'))
+            .filter(roots__gt=1)
         )
 
+        if clashes.exists():
+            logger.warning('Duplicate StockItem tree IDs found - rebuilding tree')
+            InvenTree.tasks.offload_task(
+                stock.tasks.rebuild_stock_item_tree, group='stock'
+            )
+
 
 class SalesOrder(TotalPriceMixin, Order):
     """A SalesOrder represents a list of goods shipped outwards to a customer."""
@@ -1083,17 +1641,106 @@ class SalesOrder(TotalPriceMixin, Order):
             line__in=[line.pk for line in self.lines.all()]
         )
 
+    @classmethod
+    def get_readiness(cls, orders, include_counts: bool = True) -> dict:
+        """Calculate allocation and shipping status for multiple orders.
+
+        The allocated, fulfilled and shipped totals for every line are fetched in a single query,
+        (rather than separate queries for each line item).
+
+        Arguments:
+            orders: Queryset (or list) of SalesOrder objects
+            include_counts: If True, also count pending shipments and allocations (two extra queries)
+
+        Returns:
+            dict: Mapping of {order ID: readiness data}, where the readiness data contains:
+            - fully_allocated: True if all line items are fully allocated
+            - overallocated: True if any line item is over-allocated
+            - completed: True if all line items have been shipped
+            - pending_lines: Number of line items which have not been shipped
+            - pending_shipments: Number of shipments which have not been shipped (if include_counts)
+            - pending_allocations: Number of allocations which have not been shipped (if include_counts)
+        """
+        statuses = {order.pk: order.status for order in orders}
+
+        readiness = {
+            pk: {
+                'fully_allocated': True,
+                'overallocated': False,
+                'completed': True,
+                'pending_lines': 0,
+            }
+            for pk in statuses
+        }
+
+        lines = (
+            SalesOrderLineItem.objects.filter(order__in=statuses.keys())
+            .annotate(
+                allocated=SalesOrderLineItem.allocated_annotation(),
+                fulfilled=SalesOrderLineItem.fulfilled_annotation(),
+            )
+            .values_list('order', 'quantity', 'shipped', 'allocated', 'fulfilled')
+        )
+
+        for order_id, quantity, shipped, allocated, fulfilled in lines:
+            data = readiness[order_id]
+
+            if statuses[order_id] == SalesOrderStatus.SHIPPED.value:
+                is_allocated = fulfilled >= quantity
+            else:
+                is_allocated = allocated >= quantity
+
+            if not is_allocated:
+                data['fully_allocated'] = False
+
+            if allocated > quantity:
+                data['overallocated'] = True
+
+            if shipped < quantity:
+                data['completed'] = False
+                data['pending_lines'] += 1
+
+        if include_counts:
+            shipments = dict(
+                SalesOrderShipment.objects.filter(
+                    order__in=statuses.keys(), shipment_date=None
+                )
+                .order_by()
+                .values('order')
+                .annotate(n=Count('pk'))
+                .values_list('order', 'n')
+            )
+
+            allocations = dict(
+                SalesOrderAllocation.objects.filter(line__order__in=statuses.keys())
+                .filter(Q(shipment=None) | Q(shipment__shipment_date=None))
+                .order_by()
+                .values('line__order')
+                .annotate(n=Count('pk', distinct=True))
+                .values_list('line__order', 'n')
+            )
+
+            for pk, data in readiness.items():
+                data['pending_shipments'] = shipments.get(pk, 0)
+                data['pending_allocations'] = allocations.get(pk, 0)
+
+        return readiness
+
+    def readiness(self, include_counts: bool = True) -> dict:
+        """Return the allocation and shipping status for this order (see get_readiness)."""
+        return self.get_readiness([self], include_counts=include_counts)[self.pk]
+
     def is_fully_allocated(self):
         """Return True if all line items are fully allocated."""
-        return all(line.is_fully_allocated() for line in self.lines.all())
+        return self.readiness(include_counts=False)['fully_allocated']
 
     def is_overallocated(self):
         """Return true if any lines in the order are over-allocated."""
-        return any(line.is_overallocated() for line in self.lines.all())
+        return self.readiness(include_counts=False)['overallocated']
 
     def is_completed(self):
         """Check if this order is "shipped" (all line items delivered)."""
-        return all(line.is_completed() for line in self.lines.all())
+        return self.readiness(include_counts=False)['completed']
 
     def can_complete(self, raise_error=False, allow_incomplete_lines=False):
         """Test if this SalesOrder can be completed.
@@ -1111,17 +1758,19 @@ class SalesOrder(TotalPriceMixin, Order):
             if self.is_open and not self.is_completed:
                 raise ValidationError(_('Only an open order can be marked as complete'))
 
-            if self.pending_shipment_count > 0:
+            readiness = self.readiness()
+
+            if readiness['pending_shipments'] > 0:
                 raise ValidationError(
                     _('Order cannot be completed as there are incomplete shipments')
                 )
 
-            if self.pending_allocation_count > 0:
+            if readiness['pending_allocations'] > 0:
                 raise ValidationError(
                     _('Order cannot be completed as there are incomplete allocations')
                 )
 
-            if not allow_incomplete_lines and self.pending_line_count > 0:
+            if not allow_incomplete_lines and readiness['pending_lines'] > 0:
                 raise ValidationError(
                     _('Order cannot be completed as there are incomplete line items')
                 )
@@ -1378,6 +2027,152 @@ def after_save_sales_order(sender, instance: SalesOrder, created: bool, **kwargs
         notify_responsible(instance, sender, exclude=instance.created_by)
 
 
+@receiver(
+    post_save, sender=ExchangeBackend, dispatch_uid='exchange_backend_post_save_order'
+)
+def after_save_exchange_backend(sender, instance, created: bool, **kwargs):
+    """Callback function to be executed after the exchange rates are updated.
+
+    Order totals are maintained incrementally as line items change,
+    so they must be recalculated when the exchange rates change.
+    """
+    if (
+        not InvenTree.ready.canAppAccessDatabase(allow_test=True)
+        or InvenTree.ready.isImportingData()
+    ):
+        return
+
+    import order.tasks
+
+    # Wait until the new exchange rates have been committed to the database
+    transaction.on_commit(
+        lambda: InvenTree.tasks.offload_task(
+            order.tasks.recalculate_order_totals, group='order'
+        )
+    )
+
+
+class SalesOrderIdempotencyKey(models.Model):
+    """Idempotency key for a SalesOrder created via the public API.
+
+    The key is unique, so a retried request can never create a duplicate order,
+    and the order for a given key can be found without scanning order metadata.
+
+    Attributes:
+        key: The idempotency key provided by the client
+        order: The SalesOrder which was created for this key
+        created: The date / time the key was first used
+    """
+
+    class Meta:
+        """Metaclass options for this model."""
+
+        verbose_name = _('Sales Order Idempotency Key')
+
+    key = models.CharField(max_length=255, unique=True, verbose_name=_('Key'))
+
+    order = models.OneToOneField(
+        SalesOrder,
+        on_delete=models.CASCADE,
+        related_name='idempotency_key',
+        verbose_name=_('Order'),
+    )
+
+    created = models.DateTimeField(auto_now_add=True, verbose_name=_('Created'))
+
+
+class OrderLineItemQuerySet(models.QuerySet):
+    """Custom queryset for order line item models.
+
+    Bulk operations do not call the save() method of each line item,
+    so the 'total_price' field of any affected orders is recalculated here.
+    Deleted line items are handled by the post_delete signal (after_delete_order_line).
+    """
+
+    def total_fields(self) -> set:
+        """Return the names of the fields which affect the line total."""
+        price_field = self.model.PRICE_FIELD
+
+        return {
+            'order',
+            'order_id',
+            'quantity',
+            price_field,
+            f'{price_field}_currency',
+        }
+
+    def update_order_totals(self, order_ids):
+        """Recalculate the total price for the provided orders."""
+        order_model = self.model._meta.get_field('order').related_model
+
+        for order in order_model.objects.filter(pk__in=set(order_ids)):
+            order.update_total_price()
+
+    def delete(self):
+        """Delete the selected line items, and update the affected orders.
+
+        The orders are recalculated once (rather than once per deleted line item).
+        """
+        with transaction.atomic():
+            order_ids = set(self.values_list('order_id', flat=True))
+
+            result = super().delete()
+
+            self.update_order_totals(order_ids)
+
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Create line items in bulk, and update the affected orders."""
+        with transaction.atomic():
+            objs = super().bulk_create(objs, *args, **kwargs)
+
+            self.update_order_totals(line.order_id for line in objs)
+
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """Update line items in bulk, and update the affected orders."""
+        if not self.total_fields().intersection(fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+        with transaction.atomic():
+            # Orders which the line items were previously assigned to
+            order_ids = set(
+                self.model.objects.filter(
+                    pk__in=[line.pk for line in objs]
+                ).values_list('order_id', flat=True)
+            )
+
+            result = super().bulk_update(objs, fields, *args, **kwargs)
+
+            self.update_order_totals(order_ids | {line.order_id for line in objs})
+
+        return result
+
+    def update(self, **kwargs):
+        """Update the selected line items, and update the affected orders."""
+        if not self.total_fields().intersection(kwargs.keys()):
+            return super().update(**kwargs)
+
+        with transaction.atomic():
+            pks = list(self.values_list('pk', flat=True))
+
+            order_ids = set(
+                self.model.objects.filter(pk__in=pks).values_list('order_id', flat=True)
+            )
+
+            result = super().update(**kwargs)
+
+            order_ids |= set(
+                self.model.objects.filter(pk__in=pks).values_list('order_id', flat=True)
+            )
+
+            self.update_order_totals(order_ids)
+
+        return result
+
+
 class OrderLineItem(InvenTree.models.InvenTreeMetadataModel):
     """Abstract model for an order line item.
 
@@ -1393,21 +2188,63 @@ class OrderLineItem(InvenTree.models.InvenTreeMetadataModel):
 
         abstract = True
 
+    # Name of the model field which stores the unit price for this line
+    PRICE_FIELD = 'price'
+
+    objects = OrderLineItemQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Record the line total as loaded from the database.
+
+        This is used to calculate the change in order total when the line is saved.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._record_line_total()
+        return instance
+
+    def _record_line_total(self):
+        """Take a snapshot of the current line total, and the order it is counted against."""
+        deferred = self.get_deferred_fields()
+
+        if {self.PRICE_FIELD, f'{self.PRICE_FIELD}_currency', 'quantity'} & deferred:
+            # Line total cannot be determined without extra queries
+            self._saved_line_total = None
+        else:
+            self._saved_line_total = (self.pk, self.order_id, self.total_line_price)
+
     def save(self, *args, **kwargs):
         """Custom save method for the OrderLineItem model.
 
-        Calls save method on the linked order
+        Applies the change in line total to the total price of the linked order
         """
+        # Note: A line which has not been loaded from the database has no snapshot
+        snapshot = getattr(self, '_saved_line_total', ())
+
         super().save(*args, **kwargs)
-        self.order.save()
 
-    def delete(self, *args, **kwargs):
-        """Custom delete method for the OrderLineItem model.
+        if snapshot is None:
+            self.order.update_total_price()
+        else:
+            previous = None
+
+            if snapshot:
+                pk, order_id, line_total = snapshot
 
-        Calls save method on the linked order
-        """
-        super().delete(*args, **kwargs)
-        self.order.save()
+                if pk == self.pk and order_id == self.order_id:
+                    previous = line_total
+                elif pk == self.pk and order_id is not None:
+                    # Line item has been moved from a different order
+                    order_model = self._meta.get_field('order').related_model
+
+                    if old_order := order_model.objects.filter(pk=order_id).first():
+                        old_order.update_total_price()
+
+            self.order.apply_total_price_delta(
+                removed=previous, added=self.total_line_price
+            )
+
+        self._record_line_total()
 
     quantity = RoundingDecimalField(
         verbose_name=_('Quantity'),
@@ -1501,6 +2338,8 @@ class PurchaseOrderLineItem(OrderLineItem):
 
         verbose_name = _('Purchase Order Line Item')
 
+    PRICE_FIELD = 'purchase_price'
+
     # Filter for determining if a particular PurchaseOrderLineItem is overdue
     OVERDUE_FILTER = (
         Q(received__lt=F('quantity'))
@@ -1660,6 +2499,104 @@ class PurchaseOrderExtraLine(OrderExtraLine):
     )
 
 
+class PurchaseOrderReceiveJob(models.Model):
+    """Tracks the progress of receiving items against a PurchaseOrder in the background.
+
+    Attributes:
+        order: The PurchaseOrder which items are being received against
+        user: The user who requested the operation
+        status: Current status of the job
+        created: Date and time that the job was created
+        completed: Date and time that the job finished (if finished)
+        updated: Date and time that the job was last claimed or updated
+        claim: Token identifying the worker which currently holds the job
+        data: Validated receive data (stored as primary key values)
+        total: Total number of rows to receive
+        processed: Number of rows which have been received
+        failed: Number of rows which could not be received
+        stock_items: List of IDs for the created StockItem objects
+        errors: List of error messages for rows which could not be received
+    """
+
+    class Meta:
+        """Model meta options."""
+
+        verbose_name = _('Purchase Order Receive Job')
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETE = 'complete'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (COMPLETE, _('Complete')),
+        (FAILED, _('Failed')),
+    ]
+
+    # Number of rows to receive per database transaction
+    BATCH_SIZE = 50
+
+    # Time (seconds) after which a RUNNING job with no progress can be claimed by another worker
+    STALE_TIMEOUT = 600
+
+    def __str__(self):
+        """Render a string representation of this job."""
+        return f'{self.order} - {self.processed} / {self.total}'
+
+    @property
+    def is_finished(self):
+        """Return True if this job has finished (successfully or not)."""
+        return self.status in [self.COMPLETE, self.FAILED]
+
+    order = models.ForeignKey(
+        PurchaseOrder,
+        on_delete=models.CASCADE,
+        related_name='receive_jobs',
+        verbose_name=_('Order'),
+        help_text=_('Purchase Order'),
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='+',
+        verbose_name=_('User'),
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name=_('Status'),
+    )
+
+    created = models.DateTimeField(auto_now_add=True, verbose_name=_('Created'))
+
+    completed = models.DateTimeField(
+        blank=True, null=True, verbose_name=_('Completed')
+    )
+
+    updated = models.DateTimeField(auto_now=True, verbose_name=_('Updated'))
+
+    claim = models.UUIDField(blank=True, null=True, verbose_name=_('Claim'))
+
+    data = models.JSONField(default=dict, verbose_name=_('Data'))
+
+    total = models.PositiveIntegerField(default=0, verbose_name=_('Total'))
+
+    processed = models.PositiveIntegerField(default=0, verbose_name=_('Processed'))
+
+    failed = models.PositiveIntegerField(default=0, verbose_name=_('Failed'))
+
+    stock_items = models.JSONField(default=list, verbose_name=_('Stock Items'))
+
+    errors = models.JSONField(default=list, verbose_name=_('Errors'))
+
+
 class SalesOrderLineItem(OrderLineItem):
     """Model for a single LineItem in a SalesOrder.
 
@@ -1668,6 +2605,7 @@ class SalesOrderLineItem(OrderLineItem):
         part: Link to a Part object (may be null)
         sale_price: The unit sale price for this OrderLineItem
         shipped: The number of items which have actually shipped against this line item
+        allocated_total: The total quantity of stock allocated against this line item (maintained automatically)
     """
 
     class Meta:
@@ -1675,6 +2613,8 @@ class SalesOrderLineItem(OrderLineItem):
 
         verbose_name = _('Sales Order Line Item')
 
+    PRICE_FIELD = 'sale_price'
+
     # Filter for determining if a particular SalesOrderLineItem is overdue
     OVERDUE_FILTER = (
         Q(shipped__lt=F('quantity'))
@@ -1743,6 +2683,105 @@ class SalesOrderLineItem(OrderLineItem):
         validators=[MinValueValidator(0)],
     )
 
+    allocated_total = RoundingDecimalField(
+        verbose_name=_('Allocated'),
+        help_text=_('Allocated quantity'),
+        null=True,
+        blank=True,
+        default=None,
+        max_digits=15,
+        decimal_places=5,
+        editable=False,
+    )
+
+    def save(self, *args, **kwargs):
+        """Save this line item.
+
+        A new line item has no allocations, so the allocated total is known to be zero.
+        (A null value indicates that the total has not yet been calculated.)
+        """
+        if self._state.adding and self.allocated_total is None:
+            self.allocated_total = 0
+
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def use_allocated_total() -> bool:
+        """Return True if the stored 'allocated_total' field should be used for allocation queries.
+
+        The field is always kept up to date, but is only used (instead of a subquery)
+        if the SALESORDER_CACHE_ALLOCATED_QUANTITY setting is enabled.
+        """
+        return get_global_setting('SALESORDER_CACHE_ALLOCATED_QUANTITY', False)
+
+    @classmethod
+    def allocated_annotation(cls):
+        """Return a queryset annotation for the total quantity allocated against each line item.
+
+        If the stored 'allocated_total' field is used, any line item which has not yet been
+        calculated (e.g. existing line items, until backfill_allocated_total has run)
+        falls back to a subquery.
+        """
+        live = Coalesce(
+            SubquerySum('allocations__quantity'),
+            Decimal(0),
+            output_field=models.DecimalField(),
+        )
+
+        if not cls.use_allocated_total():
+            return live
+
+        return Coalesce(F('allocated_total'), live, output_field=models.DecimalField())
+
+    @staticmethod
+    def update_allocated_total(line_ids):
+        """Recalculate the 'allocated_total' field for the specified line items (with a single query).
+
+        Arguments:
+            line_ids: Iterable of SalesOrderLineItem ID values (None values are ignored)
+        """
+        line_ids = {pk for pk in line_ids if pk}
+
+        if not line_ids:
+            return
+
+        allocated = (
+            SalesOrderAllocation.objects.filter(line=models.OuterRef('pk'))
+            .order_by()
+            .values('line')
+            .annotate(total=Sum('quantity'))
+            .values('total')
+        )
+
+        SalesOrderLineItem.objects.filter(pk__in=line_ids).update(
+            allocated_total=Coalesce(
+                models.Subquery(allocated),
+                Decimal(0),
+                output_field=models.DecimalField(),
+            )
+        )
+
+    @staticmethod
+    def fulfilled_annotation():
+        """Return a queryset annotation for the total stock quantity fulfilled against each line item.
+
+        This is the annotated equivalent of fulfilled_quantity():
+        the quantity of stock items which have been fulfilled against the same order and part.
+        """
+        fulfilled = (
+            stock.models.StockItem.objects.filter(
+                sales_order=models.OuterRef('order'), part=models.OuterRef('part')
+            )
+            .order_by()
+            .values('sales_order')
+            .annotate(total=Sum('quantity'))
+            .values('total')
+        )
+
+        return Coalesce(
+            models.Subquery(fulfilled), Decimal(0), output_field=models.DecimalField()
+        )
+
     def fulfilled_quantity(self):
         """Return the total stock quantity fulfilled against this line item."""
         if not self.pk:
@@ -1757,11 +2796,16 @@ class SalesOrderLineItem(OrderLineItem):
     def allocated_quantity(self):
         """Return the total stock quantity allocated to this LineItem.
 
-        This is a summation of the quantity of each attached StockItem
+        This is a summation of the quantity of each attached StockItem.
+        If the stored 'allocated_total' field is used (and has been calculated),
+        it is returned without a database query.
         """
         if not self.pk:
             return 0
 
+        if self.allocated_total is not None and self.use_allocated_total():
+            return self.allocated_total
+
         query = self.allocations.aggregate(
             allocated=Coalesce(Sum('quantity'), Decimal(0))
         )
@@ -1803,6 +2847,7 @@ class SalesOrderShipment(
         checked_by: User reference field indicating who checked this order
         reference: Custom reference text for this shipment (e.g. consignment number?)
         notes: Custom notes field for this shipment
+        completed_allocation: ID of the last allocation processed by the shipment completion task
     """
 
     class Meta:
@@ -1812,6 +2857,9 @@ class SalesOrderShipment(
         unique_together = ['order', 'reference']
         verbose_name = _('Sales Order Shipment')
 
+    # Number of allocations to complete per database transaction
+    COMPLETE_BATCH_SIZE = 100
+
     @staticmethod
     def get_api_url():
         """Return the API URL associated with the SalesOrderShipment model."""
@@ -1890,6 +2938,14 @@ class SalesOrderShipment(
         blank=True, verbose_name=_('Link'), help_text=_('Link to external page')
     )
 
+    completed_allocation = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_('Completed Allocation'),
+        help_text=_('Last allocation processed when completing this shipment'),
+    )
+
     def is_complete(self):
         """Return True if this shipment has already been completed."""
         return self.shipment_date is not None
@@ -2002,6 +3058,71 @@ class SalesOrderExtraLine(OrderExtraLine):
     )
 
 
+class SalesOrderAllocationQuerySet(models.QuerySet):
+    """Custom queryset for the SalesOrderAllocation model.
+
+    Bulk operations do not send model signals,
+    so the 'allocated_total' field of any affected line items is updated here.
+    """
+
+    # Fields which affect the allocated total for a line item
+    TOTAL_FIELDS = {'line', 'line_id', 'quantity'}
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Create allocations in bulk, and update the affected line items."""
+        with transaction.atomic():
+            objs = super().bulk_create(objs, *args, **kwargs)
+
+            SalesOrderLineItem.update_allocated_total(
+                allocation.line_id for allocation in objs
+            )
+
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        """Update allocations in bulk, and update the affected line items."""
+        if not self.TOTAL_FIELDS.intersection(fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+        with transaction.atomic():
+            # Line items which the allocations were previously assigned to
+            line_ids = set(
+                self.model.objects.filter(
+                    pk__in=[allocation.pk for allocation in objs]
+                ).values_list('line_id', flat=True)
+            )
+
+            result = super().bulk_update(objs, fields, *args, **kwargs)
+
+            SalesOrderLineItem.update_allocated_total(
+                line_ids | {allocation.line_id for allocation in objs}
+            )
+
+        return result
+
+    def update(self, **kwargs):
+        """Update the selected allocations, and update the affected line items."""
+        if not self.TOTAL_FIELDS.intersection(kwargs.keys()):
+            return super().update(**kwargs)
+
+        with transaction.atomic():
+            pks = list(self.values_list('pk', flat=True))
+
+            line_ids = set(
+                self.model.objects.filter(pk__in=pks).values_list('line_id', flat=True)
+            )
+
+            result = super().update(**kwargs)
+
+            line_ids |= set(
+                self.model.objects.filter(pk__in=pks).values_list('line_id', flat=True)
+            )
+
+            SalesOrderLineItem.update_allocated_total(line_ids)
+
+        return result
+
+
 class SalesOrderAllocation(models.Model):
     """This model is used to 'allocate' stock items to a SalesOrder. Items that are "allocated" to a SalesOrder are not yet "attached" to the order, but they will be once the order is fulfilled.
 
@@ -2017,11 +3138,31 @@ class SalesOrderAllocation(models.Model):
 
         verbose_name = _('Sales Order Allocation')
 
+    objects = SalesOrderAllocationQuerySet.as_manager()
+
+    # Filters for stock items which can be allocated to a sales order
+    ITEM_FILTERS = {
+        'part__salable': True,
+        'part__virtual': False,
+        'belongs_to': None,
+        'sales_order': None,
+    }
+
     @staticmethod
     def get_api_url():
         """Return the API URL associated with the SalesOrderAllocation model."""
         return reverse('api-so-allocation-list')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Record the line item as loaded from the database.
+
+        This is used to update the allocated total for the previous line, if the line is changed.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_line_id = instance.__dict__.get('line_id')
+        return instance
+
     def clean(self):
         """Validate the SalesOrderAllocation object.
 
@@ -2081,6 +3222,134 @@ class SalesOrderAllocation(models.Model):
         if len(errors) > 0:
             raise ValidationError(errors)
 
+    @staticmethod
+    def allocated_annotations() -> dict:
+        """Return annotations for the quantity of a StockItem which is already allocated.
+
+        - build_allocated: Quantity allocated to build orders
+        - sales_allocated: Quantity allocated to open sales orders (and not yet shipped)
+
+        These match the allocations counted by StockItem.unallocated_quantity()
+        """
+        return {
+            'build_allocated': Coalesce(
+                SubquerySum('allocations__quantity'),
+                Decimal(0),
+                output_field=models.DecimalField(),
+            ),
+            'sales_allocated': Coalesce(
+                SubquerySum(
+                    'sales_order_allocations__quantity',
+                    filter=Q(
+                        line__order__status__in=SalesOrderStatusGroups.OPEN,
+                        shipment__shipment_date__isnull=True,
+                    ),
+                ),
+                Decimal(0),
+                output_field=models.DecimalField(),
+            ),
+        }
+
+    @classmethod
+    def validate_batch(cls, allocations: list) -> list:
+        """Validate a batch of new (unsaved) SalesOrderAllocation objects.
+
+        This performs the same checks as full_clean() (including the ITEM_FILTERS choice limits),
+        but the required data is fetched for the entire batch with a single query
+        (rather than several queries per allocation).
+
+        Only open allocations (against an open order, and not yet shipped) count
+        towards the quantity already allocated from each stock item.
+
+        Allocated quantities are accumulated across the batch,
+        so a stock item cannot be over-allocated by multiple entries in the same batch.
+
+        Arguments:
+            allocations: List of unsaved SalesOrderAllocation objects
+
+        Returns:
+            list: A dict of errors for each allocation (empty if the allocation is valid)
+        """
+        item_ids = {allocation.item_id for allocation in allocations}
+
+        # Fetch all stock items, annotated with existing allocations
+        stock_items = (
+            stock.models.StockItem.objects.filter(pk__in=item_ids)
+            .select_related('part')
+            .annotate(
+                allocatable=Case(
+                    When(Q(**cls.ITEM_FILTERS), then=Value(True)),
+                    default=Value(False),
+                    output_field=models.BooleanField(),
+                ),
+                **cls.allocated_annotations(),
+            )
+            .in_bulk()
+        )
+
+        # Running total of allocated quantity for each stock item
+        allocated = {
+            pk: item.build_allocated + item.sales_allocated
+            for pk, item in stock_items.items()
+        }
+
+        results = []
+
+        for allocation in allocations:
+            errors = {}
+
+            item = stock_items.get(allocation.item_id)
+            line = allocation.line
+            part = line.part
+
+            if item is None:
+                results.append({'item': _('Stock item has not been assigned')})
+                continue
+
+            if not item.allocatable:
+                # Stock item does not match the choice limits for the 'item' field
+                results.append({
+                    'item': _('Stock item cannot be allocated to a sales order')
+                })
+                continue
+
+            if part is None:
+                errors['line'] = _('Cannot allocate stock to a line without a product')
+            elif item.part.pk != part.pk and not (
+                item.part.tree_id == part.tree_id
+                and part.lft <= item.part.lft
+                and item.part.rght <= part.rght
+            ):
+                # Stock item must be for the same part (or a variant of that part)
+                errors['item'] = _(
+                    'Cannot allocate stock item to a line with a different part'
+                )
+
+            if allocation.quantity > item.quantity:
+                errors['quantity'] = _('Allocation quantity cannot exceed stock quantity')
+
+            allocated[item.pk] += allocation.quantity
+
+            if allocated[item.pk] > item.quantity:
+                errors['quantity'] = _('Stock item is over-allocated')
+
+            if allocation.quantity <= 0:
+                errors['quantity'] = _('Allocation quantity must be greater than zero')
+
+            if item.serial and allocation.quantity != 1:
+                errors['quantity'] = _('Quantity must be 1 for serialized stock item')
+
+            if allocation.shipment and line.order_id != allocation.shipment.order_id:
+                errors['line'] = _('Sales order does not match shipment')
+                errors['shipment'] = _('Shipment does not match sales order')
+
+            # Use the annotated instance when the allocation is saved
+            allocation.item = item
+
+            results.append(errors)
+
+        return results
+
     line = models.ForeignKey(
         SalesOrderLineItem,
         on_delete=models.CASCADE,
@@ -2102,12 +3371,7 @@ class SalesOrderAllocation(models.Model):
         'stock.StockItem',
         on_delete=models.CASCADE,
         related_name='sales_order_allocations',
-        limit_choices_to={
-            'part__salable': True,
-            'part__virtual': False,
-            'belongs_to': None,
-            'sales_order': None,
-        },
+        limit_choices_to=ITEM_FILTERS,
         verbose_name=_('Item'),
         help_text=_('Select stock item to allocate'),
     )
@@ -2151,6 +3415,441 @@ class SalesOrderAllocation(models.Model):
         self.item = item
         self.save()
 
+    @classmethod
+    def complete_allocations(cls, allocations: list, user):
+        """Complete multiple allocations (called when a shipment is completed).
+
+        Performs the same steps as complete_allocation(), except that the 'shipped' quantity
+        is updated once for each line (rather than once for each allocation).
+
+        Arguments:
+            allocations: List of SalesOrderAllocation objects to complete
+            user: The user who is completing the allocations
+        """
+        shipped = {}
+        updated = []
+
+        for allocation in allocations:
+            order = allocation.line.order
+
+            item = allocation.item.allocateToCustomer(
+                order.customer, quantity=allocation.quantity, order=order, user=user
+            )
+
+            shipped[allocation.line_id] = (
+                shipped.get(allocation.line_id, Decimal(0)) + allocation.quantity
+            )
+
+            # The StockItem may have changed if the stock was split
+            if item.pk != allocation.item_id:
+                allocation.item = item
+                updated.append(allocation)
+
+        # The 'shipped' field does not affect the order total, so save() can be bypassed
+        for line_id, quantity in shipped.items():
+            SalesOrderLineItem.objects.filter(pk=line_id).update(
+                shipped=F('shipped') + quantity
+            )
+
+        cls.objects.bulk_update(updated, ['item'])
+
+
+@receiver(
+    post_save, sender=SalesOrderAllocation, dispatch_uid='sales_order_allocation_post_save'
+)
+def after_save_sales_order_allocation(sender, instance, created, **kwargs):
+    """Update the allocated total for the line item(s) affected by a saved SalesOrderAllocation."""
+    SalesOrderLineItem.update_allocated_total([
+        instance.line_id,
+        getattr(instance, '_loaded_line_id', None),
+    ])
+
+    instance._loaded_line_id = instance.line_id
+
+
+@receiver(
+    post_delete,
+    sender=SalesOrderAllocation,
+    dispatch_uid='sales_order_allocation_post_delete',
+)
+def after_delete_sales_order_allocation(sender, instance, **kwargs):
+    """Update the allocated total for the line item affected by a deleted SalesOrderAllocation."""
+    SalesOrderLineItem.update_allocated_total([instance.line_id])
+
+
+class PartAvailability(models.Model):
+    """Stored stock availability data for a single Part.
+
+    Calculating availability for a part requires a number of subqueries,
+    which is expensive when listing many sales order line items.
+    This data is instead calculated in the background,
+    and marked as stale whenever the underlying stock, allocation or order data changes.
+
+    Attributes:
+        part: The Part which this data refers to
+        stale: True if the data needs to be recalculated
+        updated: Date and time that the data was last calculated
+        total_stock: Total quantity of stock for this part
+        allocated_to_sales_orders: Quantity allocated to sales orders
+        allocated_to_build_orders: Quantity allocated to build orders
+        variant_stock_total: Total quantity of salable variant stock
+        variant_so_allocations: Quantity of variant stock allocated to sales orders
+        variant_bo_allocations: Quantity of variant stock allocated to build orders
+        on_order: Quantity on order (from open purchase orders)
+        building: Quantity in production (from open build orders)
+    """
+
+    class Meta:
+        """Model meta options."""
+
+        verbose_name = _('Part Availability')
+
+    # Names of the stored availability fields
+    AVAILABILITY_FIELDS = [
+        'total_stock',
+        'allocated_to_sales_orders',
+        'allocated_to_build_orders',
+        'variant_stock_total',
+        'variant_so_allocations',
+        'variant_bo_allocations',
+        'on_order',
+        'building',
+    ]
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Return True if stored availability data should be used."""
+        return get_global_setting('SALESORDER_CACHE_PART_AVAILABILITY', False)
+
+    @staticmethod
+    def live_annotations(reference: str = 'part__') -> dict:
+        """Return the (live) subquery annotations for each availability field.
+
+        Arguments:
+            reference: The relationship reference to the Part model
+        """
+        import part.filters as part_filters
+
+        # Variant stock items must be salable and active
+        variant_stock_query = part_filters.variant_stock_query(
+            reference=reference
+        ).filter(part__salable=True, part__active=True)
+
+        return {
+            'total_stock': part_filters.annotate_total_stock(reference=reference),
+            'allocated_to_sales_orders': part_filters.annotate_sales_order_allocations(
+                reference=reference
+            ),
+            'allocated_to_build_orders': part_filters.annotate_build_order_allocations(
+                reference=reference
+            ),
+            'variant_stock_total': part_filters.annotate_variant_quantity(
+                variant_stock_query, reference='quantity'
+            ),
+            'variant_so_allocations': part_filters.annotate_variant_quantity(
+                variant_stock_query, reference='sales_order_allocations__quantity'
+            ),
+            'variant_bo_allocations': part_filters.annotate_variant_quantity(
+                variant_stock_query, reference='allocations__quantity'
+            ),
+            'on_order': part_filters.annotate_on_order_quantity(reference=reference),
+            'building': part_filters.annotate_in_production_quantity(
+                reference=reference
+            ),
+        }
+
+    @classmethod
+    def annotations(cls, reference: str = 'part__') -> dict:
+        """Return availability annotations for a queryset of objects which reference a Part.
+
+        If stored availability data is enabled, the stored values are used (via a join),
+        falling back to live subqueries for any part where the stored data is missing or stale.
+
+        Arguments:
+            reference: The relationship reference to the Part model
+        """
+        live = cls.live_annotations(reference=reference)
+
+        if not cls.is_enabled():
+            return live
+
+        return {
+            name: Case(
+                When(
+                    **{f'{reference}availability__stale': False},
+                    then=F(f'{reference}availability__{name}'),
+                ),
+                default=expression,
+                output_field=models.DecimalField(),
+            )
+            for name, expression in live.items()
+        }
+
+    @classmethod
+    def mark_stale(cls, part_ids):
+        """Mark stored availability data as stale for the specified parts.
+
+        Variant stock is counted against parent parts,
+        so any parent (template) parts are also marked as stale.
+
+        Arguments:
+            part_ids: Iterable of Part ID values (None values are ignored)
+        """
+        part_ids = {pk for pk in part_ids if pk}
+
+        if not part_ids:
+            return
+
+        query = Q()
+
+        for tree_id, lft, rght in PartModels.Part.objects.filter(
+            pk__in=part_ids
+        ).values_list('tree_id', 'lft', 'rght'):
+            query |= Q(part__tree_id=tree_id, part__lft__lte=lft, part__rght__gte=rght)
+
+        if query:
+            cls.objects.filter(query, stale=False).update(stale=True)
+
+    @classmethod
+    def refresh(cls, part_ids=None):
+        """Recalculate stored availability data.
+
+        Arguments:
+            part_ids: List of Part ID values to calculate (if None, all stale data is recalculated)
+        """
+        if part_ids is not None:
+            # Ensure that a row exists for each part
+            cls.objects.bulk_create(
+                [cls(part_id=pk) for pk in part_ids], ignore_conflicts=True
+            )
+
+        with transaction.atomic():
+            # Lock the rows, so any concurrent change will mark them as stale again *after* this update
+            rows = cls.objects.select_for_update(of=('self',))
+
+            if part_ids is None:
+                rows = rows.filter(stale=True)
+            else:
+                rows = rows.filter(part__in=part_ids)
+
+            rows = list(rows.annotate(**{
+                f'live_{name}': expression
+                for name, expression in cls.live_annotations().items()
+            }))
+
+            now = InvenTree.helpers.current_time()
+
+            for row in rows:
+                for name in cls.AVAILABILITY_FIELDS:
+                    setattr(row, name, getattr(row, f'live_{name}') or Decimal(0))
+
+                row.stale = False
+                row.updated = now
+
+            cls.objects.bulk_update(
+                rows, [*cls.AVAILABILITY_FIELDS, 'stale', 'updated'], batch_size=500
+            )
+
+        return len(rows)
+
+    part = models.OneToOneField(
+        'part.Part',
+        on_delete=models.CASCADE,
+        related_name='availability',
+        verbose_name=_('Part'),
+    )
+
+    stale = models.BooleanField(default=True, verbose_name=_('Stale'))
+
+    updated = models.DateTimeField(null=True, blank=True, verbose_name=_('Updated'))
+
+    total_stock = models.DecimalField(
+        max_digits=15, decimal_places=5, default=0, verbose_name=_('Total Stock')
+    )
+
+    allocated_to_sales_orders = models.DecimalField(
+        max_digits=15,
+        decimal_places=5,
+        default=0,
+        verbose_name=_('Allocated to Sales Orders'),
+    )
+
+    allocated_to_build_orders = models.DecimalField(
+        max_digits=15,
+        decimal_places=5,
+        default=0,
+        verbose_name=_('Allocated to Build Orders'),
+    )
+
+    variant_stock_total = models.DecimalField(
+        max_digits=15, decimal_places=5, default=0, verbose_name=_('Variant Stock')
+    )
+
+    variant_so_allocations = models.DecimalField(
+        max_digits=15,
+        decimal_places=5,
+        default=0,
+        verbose_name=_('Variant Stock Allocated to Sales Orders'),
+    )
+
+    variant_bo_allocations = models.DecimalField(
+        max_digits=15,
+        decimal_places=5,
+        default=0,
+        verbose_name=_('Variant Stock Allocated to Build Orders'),
+    )
+
+    on_order = models.DecimalField(
+        max_digits=15, decimal_places=5, default=0, verbose_name=_('On Order')
+    )
+
+    building = models.DecimalField(
+        max_digits=15, decimal_places=5, default=0, verbose_name=_('In Production')
+    )
+
+
+def mark_part_availability_stale(part_ids):
+    """Mark stored part availability data as stale, and schedule a background refresh.
+
+    If stored availability data is disabled, no work is done
+    (all data is marked as stale when the setting is enabled again).
+
+    Arguments:
+        part_ids: Iterable of Part ID values (querysets are only evaluated if required)
+    """
+    import order.tasks
+
+    if not PartAvailability.is_enabled():
+        return
+
+    PartAvailability.mark_stale(part_ids)
+
+    transaction.on_commit(
+        lambda: InvenTree.tasks.offload_task(
+            order.tasks.refresh_part_availability, group='order'
+        )
+    )
+
+
+@receiver(post_save, sender='stock.StockItem', dispatch_uid='availability_stock_save')
+@receiver(
+    post_delete, sender='stock.StockItem', dispatch_uid='availability_stock_delete'
+)
+def after_change_stock_item(sender, instance, **kwargs):
+    """Mark part availability as stale when a StockItem is changed."""
+    if kwargs.get('bulk', False):
+        # Bulk operations mark all affected parts at once
+        return
+
+    mark_part_availability_stale([instance.part_id])
+
+
+@receiver(
+    post_save, sender=SalesOrderAllocation, dispatch_uid='availability_so_alloc_save'
+)
+@receiver(
+    post_delete,
+    sender=SalesOrderAllocation,
+    dispatch_uid='availability_so_alloc_delete',
+)
+@receiver(post_save, sender='build.BuildItem', dispatch_uid='availability_bo_alloc_save')
+@receiver(
+    post_delete, sender='build.BuildItem', dispatch_uid='availability_bo_alloc_delete'
+)
+def after_change_allocation(sender, instance, **kwargs):
+    """Mark part availability as stale when a stock allocation is changed."""
+    item_id = getattr(instance, 'item_id', None) or getattr(
+        instance, 'stock_item_id', None
+    )
+
+    mark_part_availability_stale(
+        stock.models.StockItem.objects.filter(pk=item_id).values_list(
+            'part', flat=True
+        )
+    )
+
+
+@receiver(
+    post_save, sender=PurchaseOrderLineItem, dispatch_uid='availability_po_line_save'
+)
+@receiver(
+    post_delete,
+    sender=PurchaseOrderLineItem,
+    dispatch_uid='availability_po_line_delete',
+)
+def after_change_purchase_order_line(sender, instance, **kwargs):
+    """Mark part availability as stale when a PurchaseOrderLineItem is changed."""
+    mark_part_availability_stale(
+        SupplierPart.objects.filter(pk=instance.part_id).values_list('part', flat=True)
+    )
+
+
+@receiver(post_save, sender=PurchaseOrder, dispatch_uid='availability_po_save')
+def after_save_purchase_order(sender, instance, created, **kwargs):
+    """Mark part availability as stale when a PurchaseOrder is changed (e.g. placed or completed)."""
+    if not created:
+        mark_part_availability_stale(
+            instance.lines.values_list('part__part', flat=True)
+        )
+
+
+@receiver(post_save, sender=SalesOrder, dispatch_uid='availability_so_save')
+def after_save_sales_order_availability(sender, instance, created, **kwargs):
+    """Mark part availability as stale when the status of a SalesOrder is changed.
+
+    Only allocations against open orders are counted as allocated stock.
+    """
+    status = getattr(instance, '_loaded_status', None)
+    instance._loaded_status = instance.status
+
+    if not created and status != instance.status:
+        mark_part_availability_stale(
+            instance.lines.values_list('part', flat=True).distinct()
+        )
+
+
+@receiver(
+    post_save, sender=SalesOrderShipment, dispatch_uid='availability_shipment_save'
+)
+def after_save_shipment_availability(sender, instance, created, **kwargs):
+    """Mark part availability as stale when a SalesOrderShipment is changed (e.g. shipped).
+
+    Only allocations which have not been shipped are counted as allocated stock.
+    """
+    if not created:
+        mark_part_availability_stale(
+            instance.allocations.values_list('item__part', flat=True).distinct()
+        )
+
+
+@receiver(post_save, sender='build.Build', dispatch_uid='availability_build_save')
+def after_save_build(sender, instance, **kwargs):
+    """Mark part availability as stale when a Build is changed."""
+    mark_part_availability_stale([instance.part_id])
+
+
+@receiver(
+    post_save, sender='common.InvenTreeSetting', dispatch_uid='availability_setting_save'
+)
+def after_save_availability_setting(sender, instance, **kwargs):
+    """Mark all part availability data as stale when stored availability data is enabled.
+
+    Changes are not tracked while the setting is disabled, so any stored data may be out of date.
+    """
+    import order.tasks
+
+    if instance.key != 'SALESORDER_CACHE_PART_AVAILABILITY':
+        return
+
+    if InvenTree.helpers.str2bool(instance.value):
+        PartAvailability.objects.filter(stale=False).update(stale=True)
+
+        transaction.on_commit(
+            lambda: InvenTree.tasks.offload_task(
+                order.tasks.refresh_part_availability, group='order'
+            )
+        )
+
 
 class ReturnOrder(TotalPriceMixin, Order):
     """A ReturnOrder represents goods returned from a customer, e.g. an RMA or warranty.
@@ -2564,3 +4263,80 @@ class ReturnOrderExtraLine(OrderExtraLine):
         verbose_name=_('Order'),
         help_text=_('Return Order'),
     )
+
+
+# Cache key for the rendered calendar feed, for each order type
+ORDER_CALENDAR_CACHE_KEY = 'order_calendar_{ordertype}_{include_completed}'
+
+# Map of order model to calendar feed type
+ORDER_CALENDAR_TYPES = {
+    PurchaseOrder: 'purchase-order',
+    SalesOrder: 'sales-order',
+    ReturnOrder: 'return-order',
+}
+
+
+def invalidate_order_calendar(ordertype: str):
+    """Remove any cached calendar feeds for the provided order type."""
+    cache.delete_many([
+        ORDER_CALENDAR_CACHE_KEY.format(
+            ordertype=ordertype, include_completed=include_completed
+        )
+        for include_completed in [True, False]
+    ])
+
+
+@receiver(post_save, sender=PurchaseOrder, dispatch_uid='calendar_po_save')
+@receiver(post_delete, sender=PurchaseOrder, dispatch_uid='calendar_po_delete')
+@receiver(post_save, sender=SalesOrder, dispatch_uid='calendar_so_save')
+@receiver(post_delete, sender=SalesOrder, dispatch_uid='calendar_so_delete')
+@receiver(post_save, sender=ReturnOrder, dispatch_uid='calendar_ro_save')
+@receiver(post_delete, sender=ReturnOrder, dispatch_uid='calendar_ro_delete')
+def after_change_order_calendar(sender, instance, **kwargs):
+    """Invalidate the cached calendar feed when an order is changed."""
+    if ordertype := ORDER_CALENDAR_TYPES.get(sender):
+        invalidate_order_calendar(ordertype)
+
+
+@receiver(post_save, sender=Company, dispatch_uid='calendar_company_save')
+def after_save_company_calendar(sender, instance, **kwargs):
+    """Invalidate the cached calendar feeds when a company is changed (e.g. renamed).
+
+    The company name is rendered in the description of each calendar event.
+    """
+    for ordertype in ORDER_CALENDAR_TYPES.values():
+        invalidate_order_calendar(ordertype)
+
+
+@receiver(post_delete, sender=PurchaseOrderLineItem, dispatch_uid='po_line_delete')
+@receiver(post_delete, sender=PurchaseOrderExtraLine, dispatch_uid='po_extra_delete')
+@receiver(post_delete, sender=SalesOrderLineItem, dispatch_uid='so_line_delete')
+@receiver(post_delete, sender=SalesOrderExtraLine, dispatch_uid='so_extra_delete')
+@receiver(post_delete, sender=ReturnOrderLineItem, dispatch_uid='ro_line_delete')
+@receiver(post_delete, sender=ReturnOrderExtraLine, dispatch_uid='ro_extra_delete')
+def after_delete_order_line(sender, instance, origin=None, **kwargs):
+    """Remove the line total from the total price of the linked order.
+
+    This covers line items which are deleted individually, or via a cascade.
+    Line items deleted via a queryset are handled by OrderLineItemQuerySet.delete(),
+    and there is nothing to update if the order itself is being deleted.
+    """
+    order_model = sender._meta.get_field('order').related_model
+
+    if isinstance(origin, models.QuerySet):
+        if issubclass(origin.model, OrderLineItem) or origin.model is order_model:
+            return
+    elif isinstance(origin, order_model):
+        return
+
+    order = order_model.objects.filter(pk=instance.order_id).first()
+
+    if order is None:
+        return
+
+    snapshot = getattr(instance, '_saved_line_total', None)
+
+    if snapshot and snapshot[1] == instance.order_id:
+        order.apply_total_price_delta(removed=snapshot[2])
+    else:
+        order.update_total_price()
@@ -0,0 +1,210 @@
+"""Pagination classes for the order API.
+
+Limit / offset pagination requires the database to scan (and discard) every row
+before the requested offset, so paging through a large table gets slower with each page.
+
+Keyset pagination instead filters against the ordering key of the last row returned,
+so each page is fetched in (roughly) constant time.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import F, Q
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class OrderKeysetPagination(LimitOffsetPagination):
+    """Pagination class which supports both limit / offset and keyset pagination.
+
+    Keyset pagination is selected by providing the 'cursor' query parameter:
+
+    - The first page is requested with an empty cursor (e.g. ?cursor=&limit=100)
+    - Subsequent pages are requested using the 'next' link provided in the response
+
+    Results are ordered by a single key (plus the primary key, to ensure a stable ordering).
+    The key is selected with the 'ordering' query parameter, and must be one of the
+    fields defined in the 'keyset_fields' attribute of the view, e.g.
+
+        keyset_fields = {'reference': 'reference_int', 'creation_date': 'creation_date'}
+
+    Null values are always sorted last, irrespective of the ordering direction.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = _('Invalid cursor')
+
+    # Page size used for keyset pagination, if no limit is provided
+    default_cursor_limit = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate the queryset, using keyset pagination if a cursor is provided."""
+        self.use_keyset = self.cursor_query_param in request.query_params
+
+        if not self.use_keyset:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.request = request
+        self.limit = self.get_limit(request) or self.default_cursor_limit
+
+        ordering, field = self.get_keyset_ordering(request, view)
+        cursor = self.decode_cursor(request.query_params[self.cursor_query_param])
+
+        if cursor and cursor.get('ordering') != ordering:
+            raise ValidationError({
+                self.cursor_query_param: _('Cursor does not match the requested ordering')
+            })
+
+        descending = ordering.startswith('-')
+
+        if field:
+            queryset = queryset.annotate(_keyset_value=F(field))
+
+            if descending:
+                queryset = queryset.order_by(
+                    F('_keyset_value').desc(nulls_last=True), '-pk'
+                )
+            else:
+                queryset = queryset.order_by(
+                    F('_keyset_value').asc(nulls_last=True), 'pk'
+                )
+        else:
+            queryset = queryset.order_by('-pk' if descending else 'pk')
+
+        if cursor:
+            queryset = queryset.filter(
+                self.keyset_filter(field, cursor['value'], cursor['pk'], descending)
+            )
+
+        # Fetch one extra row, to determine if there is a next page
+        results = list(queryset[: self.limit + 1])
+
+        self.next_cursor = None
+
+        if len(results) > self.limit:
+            results = results[: self.limit]
+            last = results[-1]
+
+            self.next_cursor = self.encode_cursor({
+                'ordering': ordering,
+                'value': getattr(last, '_keyset_value', None) if field else None,
+                'pk': last.pk,
+            })
+
+        return results
+
+    def get_paginated_response(self, data):
+        """Return the paginated response."""
+        if not self.use_keyset:
+            return super().get_paginated_response(data)
+
+        return Response({'next': self.get_next_cursor_link(), 'results': data})
+
+    def get_next_cursor_link(self):
+        """Return the URL for the next page of keyset results."""
+        if self.next_cursor is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.cursor_query_param, self.next_cursor)
+        return replace_query_param(url, self.limit_query_param, self.limit)
+
+    def get_keyset_ordering(self, request, view) -> tuple:
+        """Determine the ordering key for keyset pagination.
+
+        Returns:
+            A tuple of (ordering, field), where 'ordering' is the requested ordering term
+            and 'field' is the database field to order by (or None to order by pk)
+
+        Raises:
+            ValidationError: If the requested ordering does not support keyset pagination
+        """
+        keyset_fields = getattr(view, 'keyset_fields', {})
+
+        ordering = request.query_params.get('ordering', None) or getattr(
+            view, 'ordering', None
+        )
+
+        if not ordering:
+            return 'pk', None
+
+        ordering = str(ordering).strip()
+        key = ordering.lstrip('-')
+
+        if key == 'pk':
+            return ordering, None
+
+        if key not in keyset_fields:
+            raise ValidationError({
+                'ordering': _('Cursor pagination is only supported for ordering by')
+                + ': '
+                + ', '.join(['pk', *keyset_fields.keys()])
+            })
+
+        return ordering, keyset_fields[key]
+
+    @staticmethod
+    def keyset_filter(field, value, pk, descending: bool) -> Q:
+        """Construct a filter which returns rows after the provided key.
+
+        Arguments:
+            field: The database field used for ordering (or None to order by pk)
+            value: Value of the ordering field for the last returned row
+            pk: Primary key of the last returned row
+            descending: True if results are ordered in descending order
+        """
+        pk_lookup = 'pk__lt' if descending else 'pk__gt'
+
+        if field is None:
+            return Q(**{pk_lookup: pk})
+
+        if value is None:
+            # Null values are sorted last, so only other null values can follow
+            return Q(_keyset_value__isnull=True, **{pk_lookup: pk})
+
+        value_lookup = '_keyset_value__lt' if descending else '_keyset_value__gt'
+
+        return (
+            Q(**{value_lookup: value})
+            | Q(_keyset_value=value, **{pk_lookup: pk})
+            | Q(_keyset_value__isnull=True)
+        )
+
+    @staticmethod
+    def encode_cursor(data: dict) -> str:
+        """Encode cursor data into an opaque string."""
+        content = json.dumps(data, default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(content.encode()).decode()
+
+    def decode_cursor(self, cursor: str):
+        """Decode cursor data from the provided string.
+
+        Returns:
+            A dict of cursor data, or None if the cursor is empty (first page)
+
+        Raises:
+            NotFound: If the cursor is invalid
+        """
+        if not cursor:
+            return None
+
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if (
+            not isinstance(data, dict)
+            or not {'ordering', 'value', 'pk'}.issubset(data.keys())
+            or not isinstance(data['ordering'], str)
+            or type(data['pk']) is not int
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return data
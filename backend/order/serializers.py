@@ -14,12 +14,11 @@ from django.db.models import (
     Value,
     When,
 )
-from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 from rest_framework.serializers import ValidationError
-from sql_util.utils import SubqueryCount, SubquerySum
+from sql_util.utils import SubqueryCount
 
 import order.models
 import part.filters as part_filters
@@ -28,6 +27,7 @@ import stock.models
 import stock.serializers
 import stock.status_codes
 from common.serializers import ProjectCodeSerializer
+from common.settings import get_global_setting
 from company.serializers import (
     AddressBriefSerializer,
     CompanyBriefSerializer,
@@ -41,7 +41,6 @@ from InvenTree.helpers import (
     current_date,
     extract_serial_numbers,
     hash_barcode,
-    normalize,
     str2bool,
 )
 from InvenTree.serializers import (
@@ -62,6 +61,37 @@ from stock.status_codes import StockStatus
 from users.serializers import OwnerSerializer
 
 
+def annotate_fields(queryset, annotations: dict, fields=None):
+    """Apply annotations to a queryset, only for the requested serializer fields.
+
+    Arguments:
+        queryset: The queryset to annotate
+        annotations: Mapping of {field name: callable which returns the annotation expression}
+        fields: Set of requested field names (if None, all annotations are applied)
+
+    Returns:
+        The annotated queryset
+    """
+    expressions = {
+        name: expression()
+        for name, expression in annotations.items()
+        if fields is None or name in fields
+    }
+
+    if expressions:
+        queryset = queryset.annotate(**expressions)
+
+    return queryset
+
+
+def overdue_annotation(model):
+    """Return an annotation expression for the 'overdue' status of an order model."""
+    return Case(
+        When(model.overdue_filter(), then=Value(True, output_field=BooleanField())),
+        default=Value(False, output_field=BooleanField()),
+    )
+
+
 class TotalPriceMixin(serializers.Serializer):
     """Serializer mixin which provides total price fields."""
 
@@ -171,11 +201,16 @@ class AbstractOrderSerializer(DataImportExportSerializerMixin, serializers.Seria
         return reference
 
     @staticmethod
-    def annotate_queryset(queryset):
-        """Add extra information to the queryset."""
-        queryset = queryset.annotate(line_items=SubqueryCount('lines'))
+    def annotate_queryset(queryset, fields=None):
+        """Add extra information to the queryset.
 
-        return queryset
+        Arguments:
+            queryset: The queryset to annotate
+            fields: Optional set of requested fields (only the matching annotations are applied)
+        """
+        return annotate_fields(
+            queryset, {'line_items': lambda: SubqueryCount('lines')}, fields
+        )
 
     @staticmethod
     def order_fields(extra_fields):
@@ -345,32 +380,29 @@ class PurchaseOrderSerializer(
         return [*fields, 'duplicate']
 
     @staticmethod
-    def annotate_queryset(queryset):
+    def annotate_queryset(queryset, fields=None):
         """Add extra information to the queryset.
 
         - Number of lines in the PurchaseOrder
         - Overdue status of the PurchaseOrder
-        """
-        queryset = AbstractOrderSerializer.annotate_queryset(queryset)
 
-        queryset = queryset.annotate(
-            completed_lines=SubqueryCount(
-                'lines', filter=Q(quantity__lte=F('received'))
-            )
-        )
+        Arguments:
+            queryset: The queryset to annotate
+            fields: Optional set of requested fields (only the matching annotations are applied)
+        """
+        queryset = AbstractOrderSerializer.annotate_queryset(queryset, fields)
 
-        queryset = queryset.annotate(
-            overdue=Case(
-                When(
-                    order.models.PurchaseOrder.overdue_filter(),
-                    then=Value(True, output_field=BooleanField()),
+        return annotate_fields(
+            queryset,
+            {
+                'completed_lines': lambda: SubqueryCount(
+                    'lines', filter=Q(quantity__lte=F('received'))
                 ),
-                default=Value(False, output_field=BooleanField()),
-            )
+                'overdue': lambda: overdue_annotation(order.models.PurchaseOrder),
+            },
+            fields,
         )
 
-        return queryset
-
     supplier_name = serializers.CharField(
         source='supplier.name', read_only=True, label=_('Supplier Name')
     )
@@ -727,7 +759,7 @@ class PurchaseOrderLineItemReceiveSerializer(serializers.Serializer):
 
     def validate_line_item(self, item):
         """Validation for the 'line_item' field."""
-        if item.order != self.context['order']:
+        if item.order_id != self.context['order'].pk:
             raise ValidationError(_('Line item does not match purchase order'))
 
         return item
@@ -810,6 +842,30 @@ class PurchaseOrderLineItemReceiveSerializer(serializers.Serializer):
 
         return barcode
 
+    @staticmethod
+    def existing_serial_numbers(part, serials: list) -> list:
+        """Return the provided serial numbers which are already in use.
+
+        Arguments:
+            part: The Part which the serial numbers will be assigned to
+            serials: List of serial numbers to check
+
+        Returns:
+            list: Serial numbers (in the provided order) which already exist
+        """
+        if not serials:
+            return []
+
+        items = stock.models.StockItem.objects.filter(serial__in=serials)
+
+        if not get_global_setting('SERIAL_NUMBER_GLOBALLY_UNIQUE', False):
+            # Serial number must only be unique across this part "tree"
+            items = items.filter(part__tree_id=part.tree_id)
+
+        existing = set(items.values_list('serial', flat=True))
+
+        return [serial for serial in serials if serial in existing]
+
     def validate(self, data):
         """Custom validation for the serializer.
 
@@ -847,13 +903,26 @@ class PurchaseOrderLineItemReceiveSerializer(serializers.Serializer):
                 raise ValidationError({'serial_numbers': e.messages})
 
             invalid_serials = []
+            check_serials = []
 
-            # Check the serial numbers are valid
+            # Run the serial numbers through any custom validation plugins
             for serial in data['serials']:
                 try:
-                    base_part.validate_serial_number(serial, raise_error=True)
+                    valid = base_part.validate_serial_number(
+                        serial, check_duplicates=False, raise_error=True
+                    )
                 except (ValidationError, DjangoValidationError):
                     invalid_serials.append(serial)
+                    continue
+
+                # A plugin may explicitly accept the serial number, skipping the duplicate check
+                if valid is not True:
+                    check_serials.append(serial)
+
+            # Check for duplicate serial numbers with a single query
+            invalid_serials.extend(
+                self.existing_serial_numbers(base_part, check_serials)
+            )
 
             if len(invalid_serials) > 0:
                 msg = _('The following serial numbers already exist or are invalid')
@@ -869,10 +938,17 @@ class PurchaseOrderReceiveSerializer(serializers.Serializer):
     class Meta:
         """Metaclass options."""
 
-        fields = ['items', 'location']
+        fields = ['items', 'location', 'background']
 
     items = PurchaseOrderLineItemReceiveSerializer(many=True)
 
+    background = serializers.BooleanField(
+        default=False,
+        write_only=True,
+        label=_('Background'),
+        help_text=_('Receive items using the background worker (for large deliveries)'),
+    )
+
     location = serializers.PrimaryKeyRelatedField(
         queryset=stock.models.StockLocation.objects.all(),
         many=False,
@@ -941,32 +1017,92 @@ class PurchaseOrderReceiveSerializer(serializers.Serializer):
         # Location can be provided, or default to the order destination
         location = data.get('location', order.destination)
 
-        # Now we can actually receive the items into stock
-        with transaction.atomic():
-            for item in items:
-                # Select location (in descending order of priority)
-                loc = (
-                    item.get('location', None)
-                    or location
-                    or item['line_item'].get_destination()
-                )
+        if data.get('background', False):
+            return self.save_background(order, location, items, request)
 
-                try:
-                    order.receive_line_item(
-                        item['line_item'],
-                        loc,
-                        item['quantity'],
-                        request.user if request else None,
-                        status=item['status'],
-                        barcode=item.get('barcode', ''),
-                        batch_code=item.get('batch_code', ''),
-                        packaging=item.get('packaging', ''),
-                        serials=item.get('serials', None),
-                        notes=item.get('note', None),
-                    )
-                except (ValidationError, DjangoValidationError) as exc:
-                    # Catch model errors and re-throw as DRF errors
-                    raise ValidationError(detail=serializers.as_serializer_error(exc))
+        # Now we can actually receive the items into stock (in bulk)
+        try:
+            order.receive_line_items(
+                location,
+                [
+                    {
+                        'line_item': item['line_item'],
+                        'quantity': item['quantity'],
+                        'location': item.get('location', None),
+                        'status': item['status'],
+                        'barcode': item.get('barcode', ''),
+                        'batch_code': item.get('batch_code', ''),
+                        'packaging': item.get('packaging', ''),
+                        'serials': item.get('serials', None),
+                        'notes': item.get('note', None),
+                    }
+                    for item in items
+                ],
+                request.user if request else None,
+            )
+        except (ValidationError, DjangoValidationError) as exc:
+            # Catch model errors and re-throw as DRF errors
+            raise ValidationError(detail=serializers.as_serializer_error(exc))
+
+    def save_background(self, purchase_order, location, items, request):
+        """Create a PurchaseOrderReceiveJob, and offload the validated items to the background worker.
+
+        Returns:
+            PurchaseOrderReceiveJob: The job which can be used to track progress
+        """
+        from InvenTree.tasks import offload_task
+        from order.tasks import receive_purchase_order_items
+
+        rows = [
+            {
+                'line_item': item['line_item'].pk,
+                'quantity': str(item['quantity']),
+                'location': item['location'].pk if item.get('location') else None,
+                'status': item['status'],
+                'barcode': item.get('barcode') or '',
+                'batch_code': item.get('batch_code', ''),
+                'packaging': item.get('packaging', ''),
+                'serials': item.get('serials', None),
+                'notes': item.get('note') or '',
+            }
+            for item in items
+        ]
+
+        job = order.models.PurchaseOrderReceiveJob.objects.create(
+            order=purchase_order,
+            user=request.user if request else None,
+            total=len(rows),
+            data={'location': location.pk if location else None, 'items': rows},
+        )
+
+        transaction.on_commit(
+            lambda: offload_task(receive_purchase_order_items, job.pk, group='order')
+        )
+
+        return job
+
+
+class PurchaseOrderReceiveJobSerializer(InvenTreeModelSerializer):
+    """Serializer for reporting the status of a PurchaseOrderReceiveJob."""
+
+    class Meta:
+        """Metaclass options."""
+
+        model = order.models.PurchaseOrderReceiveJob
+        fields = [
+            'pk',
+            'order',
+            'user',
+            'status',
+            'created',
+            'completed',
+            'total',
+            'processed',
+            'failed',
+            'stock_items',
+            'errors',
+        ]
+        read_only_fields = fields
 
 
 @register_importer()
@@ -993,21 +1129,31 @@ class SalesOrderSerializer(
             'order_currency',
             'shipments_count',
             'completed_shipments_count',
+            'fully_allocated',
+            'overallocated',
         ])
 
         read_only_fields = ['status', 'creation_date', 'shipment_date']
 
         extra_kwargs = {'order_currency': {'required': False}}
 
+    # Fields which are only included when readiness data is requested
+    READINESS_FIELDS = ['fully_allocated', 'overallocated']
+
     def __init__(self, *args, **kwargs):
         """Initialization routine for the serializer."""
         customer_detail = kwargs.pop('customer_detail', False)
+        readiness = kwargs.pop('readiness', False)
 
         super().__init__(*args, **kwargs)
 
         if customer_detail is not True:
             self.fields.pop('customer_detail', None)
 
+        if readiness is not True:
+            for field in self.READINESS_FIELDS:
+                self.fields.pop(field, None)
+
     def skip_create_fields(self):
         """Skip these fields when instantiating a new object."""
         fields = super().skip_create_fields()
@@ -1015,39 +1161,35 @@ class SalesOrderSerializer(
         return [*fields, 'duplicate']
 
     @staticmethod
-    def annotate_queryset(queryset):
+    def annotate_queryset(queryset, fields=None):
         """Add extra information to the queryset.
 
         - Number of line items in the SalesOrder
         - Number of completed line items in the SalesOrder
         - Overdue status of the SalesOrder
-        """
-        queryset = AbstractOrderSerializer.annotate_queryset(queryset)
+        - Shipment details
 
-        queryset = queryset.annotate(
-            completed_lines=SubqueryCount('lines', filter=Q(quantity__lte=F('shipped')))
-        )
+        Arguments:
+            queryset: The queryset to annotate
+            fields: Optional set of requested fields (only the matching annotations are applied)
+        """
+        queryset = AbstractOrderSerializer.annotate_queryset(queryset, fields)
 
-        queryset = queryset.annotate(
-            overdue=Case(
-                When(
-                    order.models.SalesOrder.overdue_filter(),
-                    then=Value(True, output_field=BooleanField()),
+        return annotate_fields(
+            queryset,
+            {
+                'completed_lines': lambda: SubqueryCount(
+                    'lines', filter=Q(quantity__lte=F('shipped'))
                 ),
-                default=Value(False, output_field=BooleanField()),
-            )
-        )
-
-        # Annotate shipment details
-        queryset = queryset.annotate(
-            shipments_count=SubqueryCount('shipments'),
-            completed_shipments_count=SubqueryCount(
-                'shipments', filter=Q(shipment_date__isnull=False)
-            ),
+                'overdue': lambda: overdue_annotation(order.models.SalesOrder),
+                'shipments_count': lambda: SubqueryCount('shipments'),
+                'completed_shipments_count': lambda: SubqueryCount(
+                    'shipments', filter=Q(shipment_date__isnull=False)
+                ),
+            },
+            fields,
         )
 
-        return queryset
-
     customer_detail = CompanyBriefSerializer(
         source='customer', many=False, read_only=True
     )
@@ -1058,6 +1200,31 @@ class SalesOrderSerializer(
         read_only=True, label=_('Completed Shipments')
     )
 
+    fully_allocated = serializers.SerializerMethodField(label=_('Fully Allocated'))
+
+    overallocated = serializers.SerializerMethodField(label=_('Overallocated'))
+
+    def get_readiness(self, instance) -> dict:
+        """Return the allocation status of the provided order.
+
+        The list endpoint calculates the status of every order on the page at once
+        (see SalesOrder.get_readiness), and provides it via the serializer context.
+        """
+        readiness = self.context.get('readiness') or {}
+
+        if instance.pk in readiness:
+            return readiness[instance.pk]
+
+        return instance.readiness(include_counts=False)
+
+    def get_fully_allocated(self, instance) -> bool:
+        """Return True if all line items are fully allocated."""
+        return self.get_readiness(instance)['fully_allocated']
+
+    def get_overallocated(self, instance) -> bool:
+        """Return True if any line items are over-allocated."""
+        return self.get_readiness(instance)['overallocated']
+
 
 class SalesOrderIssueSerializer(OrderAdjustSerializer):
     """Serializer for issuing a SalesOrder."""
@@ -1146,14 +1313,13 @@ class SalesOrderLineItemSerializer(
 
         # Annotate each line with the available stock quantity
         # To do this, we need to look at the total stock and any allocations
+        # Stored availability data is used where available (see PartAvailability)
+        availability = order.models.PartAvailability.annotations(reference='part__')
+
         queryset = queryset.alias(
-            total_stock=part_filters.annotate_total_stock(reference='part__'),
-            allocated_to_sales_orders=part_filters.annotate_sales_order_allocations(
-                reference='part__'
-            ),
-            allocated_to_build_orders=part_filters.annotate_build_order_allocations(
-                reference='part__'
-            ),
+            total_stock=availability['total_stock'],
+            allocated_to_sales_orders=availability['allocated_to_sales_orders'],
+            allocated_to_build_orders=availability['allocated_to_build_orders'],
         )
 
         queryset = queryset.annotate(
@@ -1165,22 +1331,11 @@ class SalesOrderLineItemSerializer(
             )
         )
 
-        # Filter for "variant" stock: Variant stock items must be salable and active
-        variant_stock_query = part_filters.variant_stock_query(
-            reference='part__'
-        ).filter(part__salable=True, part__active=True)
-
         # Also add in available "variant" stock
         queryset = queryset.alias(
-            variant_stock_total=part_filters.annotate_variant_quantity(
-                variant_stock_query, reference='quantity'
-            ),
-            variant_bo_allocations=part_filters.annotate_variant_quantity(
-                variant_stock_query, reference='sales_order_allocations__quantity'
-            ),
-            variant_so_allocations=part_filters.annotate_variant_quantity(
-                variant_stock_query, reference='allocations__quantity'
-            ),
+            variant_stock_total=availability['variant_stock_total'],
+            variant_so_allocations=availability['variant_so_allocations'],
+            variant_bo_allocations=availability['variant_bo_allocations'],
         )
 
         queryset = queryset.annotate(
@@ -1193,22 +1348,15 @@ class SalesOrderLineItemSerializer(
         )
 
         # Add information about the quantity of parts currently on order
-        queryset = queryset.annotate(
-            on_order=part_filters.annotate_on_order_quantity(reference='part__')
-        )
+        queryset = queryset.annotate(on_order=availability['on_order'])
 
         # Add information about the quantity of parts currently in production
-        queryset = queryset.annotate(
-            building=part_filters.annotate_in_production_quantity(reference='part__')
-        )
+        queryset = queryset.annotate(building=availability['building'])
 
         # Annotate total 'allocated' stock quantity
+        # (the stored allocation total avoids a subquery for each row, if enabled)
         queryset = queryset.annotate(
-            allocated=Coalesce(
-                SubquerySum('allocations__quantity'),
-                Decimal(0),
-                output_field=models.DecimalField(),
-            )
+            allocated=order.models.SalesOrderLineItem.allocated_annotation()
         )
 
         return queryset
@@ -1461,7 +1609,7 @@ class SalesOrderShipmentAllocationItemSerializer(serializers.Serializer):
         order = self.context['order']
 
         # Ensure that the line item points to the correct order
-        if line_item.order != order:
+        if line_item.order_id != order.pk:
             raise ValidationError(_('Line item is not associated with this order'))
 
         return line_item
@@ -1489,7 +1637,8 @@ class SalesOrderShipmentAllocationItemSerializer(serializers.Serializer):
         """Custom validation for the serializer.
 
         - Ensure that the quantity is 1 for serialized stock
-        - Quantity cannot exceed the available amount
+
+        Available quantity is checked (for all items at once) by the parent serializer.
         """
         data = super().validate(data)
 
@@ -1501,11 +1650,6 @@ class SalesOrderShipmentAllocationItemSerializer(serializers.Serializer):
                 'quantity': _('Quantity must be 1 for serialized stock item')
             })
 
-        q = normalize(stock_item.unallocated_quantity())
-
-        if quantity > q:
-            raise ValidationError({'quantity': _(f'Available quantity ({q}) exceeded')})
-
         return data
 
 
@@ -1607,7 +1751,7 @@ class SalesOrderSerialAllocationSerializer(serializers.Serializer):
         order = self.context['order']
 
         # Ensure that the line item points to the correct order
-        if line_item.order != order:
+        if line_item.order_id != order.pk:
             raise ValidationError(_('Line item is not associated with this order'))
 
         return line_item
@@ -1673,25 +1817,48 @@ class SalesOrderSerialAllocationSerializer(serializers.Serializer):
         serials_unavailable = set()
         stock_items_to_allocate = []
 
-        for serial in data['serials']:
-            serial = str(serial).strip()
+        serials = [str(serial).strip() for serial in data['serials']]
 
-            items = stock.models.StockItem.objects.filter(
-                part=part, serial=serial, quantity=1
+        # Fetch all matching stock items in a single query,
+        # annotated with stock status and existing allocations
+        items = (
+            stock.models.StockItem.objects.filter(
+                part=part, serial__in=serials, quantity=1
+            )
+            .annotate(
+                available=Case(
+                    When(
+                        stock.models.StockItem.IN_STOCK_FILTER,
+                        then=Value(True, output_field=BooleanField()),
+                    ),
+                    default=Value(False, output_field=BooleanField()),
+                ),
+                # Only open (unshipped) sales order allocations are counted
+                **order.models.SalesOrderAllocation.allocated_annotations(),
             )
+            .order_by('pk')
+        )
 
-            if not items.exists():
-                serials_not_exist.add(str(serial))
-                continue
+        stock_items = {}
+
+        for item in items:
+            stock_items.setdefault(item.serial, item)
 
-            stock_item = items[0]
+        for serial in serials:
+            stock_item = stock_items.get(serial)
 
-            if not stock_item.in_stock:
-                serials_unavailable.add(str(serial))
+            if stock_item is None:
+                serials_not_exist.add(serial)
                 continue
 
-            if stock_item.unallocated_quantity() < 1:
-                serials_unavailable.add(str(serial))
+            if not stock_item.available:
+                serials_unavailable.add(serial)
+                continue
+
+            allocated = stock_item.build_allocated + stock_item.sales_allocated
+
+            if stock_item.quantity - allocated < 1:
+                serials_unavailable.add(serial)
                 continue
 
             # At this point, the serial number is valid, and can be added to the list
@@ -1734,8 +1901,14 @@ class SalesOrderSerialAllocationSerializer(serializers.Serializer):
             )
 
         with transaction.atomic():
+            # Allocated totals are updated by the bulk_create() method
             order.models.SalesOrderAllocation.objects.bulk_create(allocations)
 
+            # bulk_create does not send post_save signals
+            order.models.mark_part_availability_stale(
+                {stock_item.part_id for stock_item in stock_items}
+            )
+
 
 class SalesOrderShipmentAllocationSerializer(serializers.Serializer):
     """DRF serializer for allocation of stock items against a sales order / shipment."""
@@ -1768,38 +1941,66 @@ class SalesOrderShipmentAllocationSerializer(serializers.Serializer):
         return shipment
 
     def validate(self, data):
-        """Serializer validation."""
-        data = super().validate(data)
+        """Serializer validation.
 
-        # Extract SalesOrder from serializer context
-        # order = self.context['order']
+        All allocations are validated together, with a fixed number of database queries.
+        """
+        data = super().validate(data)
 
         items = data.get('items', [])
+        shipment = data.get('shipment')
 
         if len(items) == 0:
             raise ValidationError(_('Allocation items must be provided'))
 
+        # Fetch all referenced line items (and their parts) in a single query
+        lines = (
+            order.models.SalesOrderLineItem.objects.filter(
+                pk__in={entry['line_item'].pk for entry in items}
+            )
+            .select_related('part')
+            .in_bulk()
+        )
+
+        allocations = [
+            order.models.SalesOrderAllocation(
+                line=lines[entry['line_item'].pk],
+                item=entry['stock_item'],
+                quantity=entry['quantity'],
+                shipment=shipment,
+            )
+            for entry in items
+        ]
+
+        errors = order.models.SalesOrderAllocation.validate_batch(allocations)
+
+        if any(errors):
+            # Map model field names to serializer field names
+            field_map = {'line': 'line_item', 'item': 'stock_item'}
+
+            raise ValidationError({
+                'items': [
+                    {field_map.get(k, k): v for k, v in entry.items()}
+                    for entry in errors
+                ]
+            })
+
+        data['allocations'] = allocations
+
         return data
 
     def save(self):
         """Perform the allocation of items against this order."""
         data = self.validated_data
 
-        items = data['items']
-        shipment = data.get('shipment')
-
         with transaction.atomic():
-            for entry in items:
-                # Create a new SalesOrderAllocation
-                allocation = order.models.SalesOrderAllocation(
-                    line=entry.get('line_item'),
-                    item=entry.get('stock_item'),
-                    quantity=entry.get('quantity'),
-                    shipment=shipment,
-                )
+            # Allocated totals are updated by the bulk_create() method
+            order.models.SalesOrderAllocation.objects.bulk_create(data['allocations'])
 
-                allocation.full_clean()
-                allocation.save()
+            # bulk_create does not send post_save signals
+            order.models.mark_part_availability_stale(
+                {allocation.item.part_id for allocation in data['allocations']}
+            )
 
 
 @register_importer()
@@ -1859,28 +2060,26 @@ class ReturnOrderSerializer(
         return [*fields, 'duplicate']
 
     @staticmethod
-    def annotate_queryset(queryset):
-        """Custom annotation for the serializer queryset."""
-        queryset = AbstractOrderSerializer.annotate_queryset(queryset)
+    def annotate_queryset(queryset, fields=None):
+        """Custom annotation for the serializer queryset.
 
-        queryset = queryset.annotate(
-            completed_lines=SubqueryCount(
-                'lines', filter=~Q(outcome=ReturnOrderLineStatus.PENDING.value)
-            )
-        )
+        Arguments:
+            queryset: The queryset to annotate
+            fields: Optional set of requested fields (only the matching annotations are applied)
+        """
+        queryset = AbstractOrderSerializer.annotate_queryset(queryset, fields)
 
-        queryset = queryset.annotate(
-            overdue=Case(
-                When(
-                    order.models.ReturnOrder.overdue_filter(),
-                    then=Value(True, output_field=BooleanField()),
+        return annotate_fields(
+            queryset,
+            {
+                'completed_lines': lambda: SubqueryCount(
+                    'lines', filter=~Q(outcome=ReturnOrderLineStatus.PENDING.value)
                 ),
-                default=Value(False, output_field=BooleanField()),
-            )
+                'overdue': lambda: overdue_annotation(order.models.ReturnOrder),
+            },
+            fields,
         )
 
-        return queryset
-
     customer_detail = CompanyBriefSerializer(
         source='customer', many=False, read_only=True
     )
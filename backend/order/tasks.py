@@ -1,162 +1,546 @@
 """Background tasks for the 'order' app."""
 
 import logging
+import uuid
 from datetime import datetime, timedelta
+from decimal import Decimal
 
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import F
+from django.db.models import F, Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 import common.notifications
 import InvenTree.helpers_model
 import order.models
+import stock.models
+from common.notifications import InvenTreeNotificationBodies
 from InvenTree.tasks import ScheduledTask, scheduled_task
-from order.events import PurchaseOrderEvents, SalesOrderEvents
-from order.status_codes import PurchaseOrderStatusGroups, SalesOrderStatusGroups
+from order.events import PurchaseOrderEvents, ReturnOrderEvents, SalesOrderEvents
 from plugin.events import trigger_event
 
 logger = logging.getLogger('inventree')
 
 
-def notify_overdue_purchase_order(po: order.models.PurchaseOrder):
-    """Notify users that a PurchaseOrder has just become 'overdue'."""
-    targets = []
+# Configuration for overdue order notifications, for each order type
+OVERDUE_ORDER_TYPES = {
+    'purchase_order': {
+        'model': lambda: order.models.PurchaseOrder,
+        'name': _('Overdue Purchase Order'),
+        'message': _('Purchase order {order} is now overdue'),
+        'template': 'email/overdue_purchase_order.html',
+        'event': PurchaseOrderEvents.OVERDUE,
+        # Filter for line items which are still outstanding
+        'line_filter': Q(lines__received__lt=F('lines__quantity')),
+    },
+    'sales_order': {
+        'model': lambda: order.models.SalesOrder,
+        'name': _('Overdue Sales Order'),
+        'message': _('Sales order {order} is now overdue'),
+        'template': 'email/overdue_sales_order.html',
+        'event': SalesOrderEvents.OVERDUE,
+        'line_filter': Q(lines__shipped__lt=F('lines__quantity')),
+    },
+    'return_order': {
+        'model': lambda: order.models.ReturnOrder,
+        'name': _('Overdue Return Order'),
+        'message': _('Return order {order} is now overdue'),
+        'template': 'email/overdue_return_order.html',
+        'event': ReturnOrderEvents.OVERDUE,
+        'line_filter': Q(lines__received_date__isnull=True),
+    },
+}
+
+
+def get_overdue_order_ids(model, line_filter: Q, target_date) -> list:
+    """Return the IDs of open orders which have just become overdue.
+
+    An order is included if either the order itself,
+    or any outstanding line item, has a target date matching the provided date.
+
+    Arguments:
+        model: The order model class
+        line_filter: Filter for outstanding line items (relative to the order)
+        target_date: The target date to check against
+    """
+    return list(
+        model.objects.filter(status__in=model.get_status_class().OPEN)
+        .filter(
+            Q(target_date=target_date)
+            | (Q(lines__target_date=target_date) & line_filter)
+        )
+        .values_list('pk', flat=True)
+        .distinct()
+    )
+
+
+class OverdueTargetResolver:
+    """Resolve the users to be notified about an overdue order.
+
+    Responsible owners are commonly shared between many orders,
+    so each owner is expanded to the matching users only once.
+    """
+
+    def __init__(self):
+        """Initialize the resolver cache."""
+        self.owners = {}
+
+    def get_targets(self, instance) -> list:
+        """Return the list of users to notify for the provided order."""
+        targets = {}
+
+        if instance.created_by:
+            targets[instance.created_by.pk] = instance.created_by
+
+        if instance.responsible:
+            for user in self.get_owner_users(instance.responsible):
+                targets[user.pk] = user
+
+        return list(targets.values())
+
+    def get_owner_users(self, owner) -> list:
+        """Return the users associated with the provided owner (cached)."""
+        if owner.pk not in self.owners:
+            self.owners[owner.pk] = [
+                related.owner
+                for related in owner.get_related_owners(include_group=False)
+                if isinstance(related.owner, User)
+            ]
+
+        return self.owners[owner.pk]
+
 
-    if po.created_by:
-        targets.append(po.created_by)
+def notify_overdue_order(instance, order_type: str, targets=None):
+    """Notify users that an order has just become 'overdue'.
 
-    if po.responsible:
-        targets.append(po.responsible)
+    Arguments:
+        instance: The overdue order
+        order_type: The type of order (key into OVERDUE_ORDER_TYPES)
+        targets: Optional list of notification targets (defaults to the order creator and responsible owner)
+    """
+    config = OVERDUE_ORDER_TYPES[order_type]
+
+    if targets is None:
+        targets = [
+            target for target in [instance.created_by, instance.responsible] if target
+        ]
 
-    name = _('Overdue Purchase Order')
+    name = config['name']
 
     context = {
-        'order': po,
+        'order': instance,
         'name': name,
-        'message': _(f'Purchase order {po} is now overdue'),
-        'link': InvenTree.helpers_model.construct_absolute_url(po.get_absolute_url()),
-        'template': {'html': 'email/overdue_purchase_order.html', 'subject': name},
+        'message': config['message'].format(order=instance),
+        'link': InvenTree.helpers_model.construct_absolute_url(
+            instance.get_absolute_url()
+        ),
+        'template': {'html': config['template'], 'subject': name},
     }
 
-    event_name = PurchaseOrderEvents.OVERDUE
+    event_name = config['event']
 
     # Send a notification to the appropriate users
     common.notifications.trigger_notification(
-        po, event_name, targets=targets, context=context
+        instance, event_name, targets=targets, context=context
     )
 
     # Register a matching event to the plugin system
-    trigger_event(event_name, purchase_order=po.pk)
+    trigger_event(event_name, **{order_type: instance.pk})
 
 
-@scheduled_task(ScheduledTask.DAILY)
-def check_overdue_purchase_orders():
-    """Check if any outstanding PurchaseOrders have just become overdue.
+def notify_overdue_purchase_order(po: order.models.PurchaseOrder):
+    """Notify users that a PurchaseOrder has just become 'overdue'."""
+    notify_overdue_order(po, 'purchase_order')
+
+
+def notify_overdue_sales_order(so: order.models.SalesOrder):
+    """Notify appropriate users that a SalesOrder has just become 'overdue'."""
+    notify_overdue_order(so, 'sales_order')
+
+
+def notify_overdue_return_order(ro: order.models.ReturnOrder):
+    """Notify appropriate users that a ReturnOrder has just become 'overdue'."""
+    notify_overdue_order(ro, 'return_order')
+
+
+def check_overdue_orders(order_type: str) -> int:
+    """Check if any outstanding orders of the given type have just become overdue.
 
     Rules:
-    - This check is performed daily
-    - Look at the 'target_date' of any outstanding PurchaseOrder objects
+    - Look at the 'target_date' of any outstanding orders (and outstanding line items)
     - If the 'target_date' expired *yesterday* then the order is just out of date
+
+    All overdue orders are found with a single query, and the users to notify
+    are resolved once per responsible owner (rather than once per order).
+    Each order is notified separately (so recent notifications are not repeated),
+    and a plugin event is triggered for each order.
+
+    Arguments:
+        order_type: The type of order (key into OVERDUE_ORDER_TYPES)
+
+    Returns:
+        The number of overdue orders which were notified
     """
+    config = OVERDUE_ORDER_TYPES[order_type]
+    model = config['model']()
+
     yesterday = datetime.now().date() - timedelta(days=1)
 
-    # Check for PurchaseOrder objects that have a target date of yesterday
-    overdue_orders = order.models.PurchaseOrder.objects.filter(
-        target_date=yesterday, status__in=PurchaseOrderStatusGroups.OPEN
-    )
+    order_ids = get_overdue_order_ids(model, config['line_filter'], yesterday)
+
+    if not order_ids:
+        return 0
 
-    # Check for individual line items that are overdue
-    overdue_lines = order.models.PurchaseOrderLineItem.objects.filter(
-        target_date=yesterday,
-        order__status__in=PurchaseOrderStatusGroups.OPEN,
-        received__lt=F('quantity'),
+    orders = model.objects.filter(pk__in=order_ids).select_related(
+        'created_by', 'responsible'
     )
 
-    notified_orders = set()
+    resolver = OverdueTargetResolver()
 
-    for po in overdue_orders:
-        notify_overdue_purchase_order(po)
-        notified_orders.add(po.pk)
+    for instance in orders:
+        notify_overdue_order(
+            instance, order_type, targets=resolver.get_targets(instance)
+        )
 
-    for line in overdue_lines:
-        if line.order.pk not in notified_orders:
-            notify_overdue_purchase_order(line.order)
-            notified_orders.add(line.order.pk)
+    logger.info('Notified %s overdue orders (%s)', len(order_ids), order_type)
 
+    return len(order_ids)
 
-def notify_overdue_sales_order(so: order.models.SalesOrder):
-    """Notify appropriate users that a SalesOrder has just become 'overdue'."""
-    targets = []
 
-    if so.created_by:
-        targets.append(so.created_by)
+@scheduled_task(ScheduledTask.DAILY)
+def check_overdue_purchase_orders():
+    """Check if any outstanding PurchaseOrders have just become overdue."""
+    check_overdue_orders('purchase_order')
 
-    if so.responsible:
-        targets.append(so.responsible)
 
-    name = _('Overdue Sales Order')
+@scheduled_task(ScheduledTask.DAILY)
+def check_overdue_sales_orders():
+    """Check if any outstanding SalesOrders have just become overdue."""
+    check_overdue_orders('sales_order')
 
-    context = {
-        'order': so,
-        'name': name,
-        'message': _(f'Sales order {so} is now overdue'),
-        'link': InvenTree.helpers_model.construct_absolute_url(so.get_absolute_url()),
-        'template': {'html': 'email/overdue_sales_order.html', 'subject': name},
-    }
 
-    event_name = SalesOrderEvents.OVERDUE
+@scheduled_task(ScheduledTask.DAILY)
+def check_overdue_return_orders():
+    """Check if any outstanding ReturnOrders have just become overdue."""
+    check_overdue_orders('return_order')
 
-    # Send a notification to the appropriate users
-    common.notifications.trigger_notification(
-        so, event_name, targets=targets, context=context
-    )
 
-    # Register a matching event to the plugin system
-    trigger_event(event_name, sales_order=so.pk)
+def recalculate_order_totals():
+    """Recalculate the total price for all open orders.
+
+    Order totals are updated incrementally when line items change,
+    so a full recalculation is required when the exchange rates are updated.
+    """
+    for model in [
+        order.models.PurchaseOrder,
+        order.models.SalesOrder,
+        order.models.ReturnOrder,
+    ]:
+        orders = model.objects.filter(status__in=model.get_status_class().OPEN)
+
+        for instance in orders:
+            total_price = instance.calculate_total_price(
+                target_currency=instance.currency
+            )
+
+            # Update the total price without triggering a full save of the order
+            model.objects.filter(pk=instance.pk).update(total_price=total_price)
+
+
+def refresh_part_availability():
+    """Recalculate any stale part availability data."""
+    if not order.models.PartAvailability.is_enabled():
+        return
+
+    count = order.models.PartAvailability.refresh()
+
+    if count > 0:
+        logger.info('Refreshed availability data for %s parts', count)
 
 
 @scheduled_task(ScheduledTask.DAILY)
-def check_overdue_sales_orders():
-    """Check if any outstanding SalesOrders have just become overdue.
+def rebuild_part_availability():
+    """Recalculate stored availability data for all salable parts.
 
-    - This check is performed daily
-    - Look at the 'target_date' of any outstanding SalesOrder objects
-    - If the 'target_date' expired *yesterday* then the order is just out of date
+    Availability data is normally refreshed when the underlying data changes,
+    but this ensures that data exists for every salable part.
     """
-    yesterday = datetime.now().date() - timedelta(days=1)
+    if not order.models.PartAvailability.is_enabled():
+        return
 
-    overdue_orders = order.models.SalesOrder.objects.filter(
-        target_date=yesterday, status__in=SalesOrderStatusGroups.OPEN
-    )
+    from part.models import Part
 
-    overdue_lines = order.models.SalesOrderLineItem.objects.filter(
-        target_date=yesterday,
-        order__status__in=SalesOrderStatusGroups.OPEN,
-        shipped__lt=F('quantity'),
-    )
+    part_ids = list(Part.objects.filter(salable=True).values_list('pk', flat=True))
 
-    notified_orders = set()
+    batch_size = 500
 
-    for po in overdue_orders:
-        notify_overdue_sales_order(po)
-        notified_orders.add(po.pk)
+    for start in range(0, len(part_ids), batch_size):
+        order.models.PartAvailability.refresh(part_ids[start : start + batch_size])
 
-    for line in overdue_lines:
-        if line.order.pk not in notified_orders:
-            notify_overdue_sales_order(line.order)
-            notified_orders.add(line.order.pk)
+    logger.info('Rebuilt availability data for %s parts', len(part_ids))
 
 
-def complete_sales_order_shipment(shipment_id: int, user_id: int) -> None:
+@scheduled_task(ScheduledTask.HOURLY)
+def backfill_allocated_total(batch_size: int = 1000) -> int:
+    """Calculate the 'allocated_total' field for any SalesOrderLineItem which has no stored value.
+
+    Line items which existed before the field was added have a null value,
+    and are calculated here in batches (until then, queries fall back to a subquery).
+
+    Arguments:
+        batch_size: Number of line items to calculate per query
+
+    Returns:
+        The number of line items which were calculated
+    """
+    Line = order.models.SalesOrderLineItem
+
+    count = 0
+
+    while True:
+        line_ids = list(
+            Line.objects.filter(allocated_total=None).values_list('pk', flat=True)[
+                :batch_size
+            ]
+        )
+
+        if not line_ids:
+            break
+
+        Line.update_allocated_total(line_ids)
+        count += len(line_ids)
+
+    if count:
+        logger.info('Calculated allocated totals for %s sales order lines', count)
+
+    return count
+
+
+class ReceiveJobClaimLost(Exception):
+    """Raised when a PurchaseOrderReceiveJob has been claimed by another worker."""
+
+
+def claim_receive_job(job_id: int):
+    """Claim a PurchaseOrderReceiveJob for the current worker.
+
+    The job row is locked while it is checked, and the status is changed with a compare-and-set,
+    so that two workers cannot run the same job at the same time.
+    A RUNNING job can only be claimed once its progress is older than STALE_TIMEOUT
+    (i.e. the worker which was running it has stopped).
+
+    Each claim stores a new token against the job. Progress is only saved
+    while the token matches, so a worker whose job has been reclaimed stops.
+
+    Returns:
+        The claimed PurchaseOrderReceiveJob, or None if the job cannot be claimed
+    """
+    Job = order.models.PurchaseOrderReceiveJob
+
+    with transaction.atomic():
+        try:
+            job = (
+                Job.objects.select_for_update(of=('self',))
+                .select_related('order', 'user')
+                .get(pk=job_id)
+            )
+        except Job.DoesNotExist:
+            logger.warning(
+                'Failed to receive items - no matching PurchaseOrderReceiveJob for ID <%s>',
+                job_id,
+            )
+            return None
+
+        if job.is_finished:
+            return None
+
+        now = timezone.now()
+
+        if job.status == Job.RUNNING and job.updated > now - timedelta(
+            seconds=Job.STALE_TIMEOUT
+        ):
+            logger.info('PurchaseOrderReceiveJob <%s> is already running', job_id)
+            return None
+
+        claim = uuid.uuid4()
+
+        claimed = Job.objects.filter(
+            pk=job.pk, status=job.status, updated=job.updated
+        ).update(status=Job.RUNNING, updated=now, claim=claim)
+
+        if not claimed:
+            return None
+
+        job.status = Job.RUNNING
+        job.updated = now
+        job.claim = claim
+
+    return job
+
+
+def receive_purchase_order_items(job_id: int) -> None:
+    """Receive items against a PurchaseOrder, as specified by a PurchaseOrderReceiveJob.
+
+    Rows are received in batches (each batch in a separate transaction),
+    and the job progress is saved in the same transaction as each batch.
+    If the task is interrupted (or run again), it resumes from the first unprocessed row.
+
+    If a batch fails, each row in that batch is retried individually,
+    so that a single invalid row does not prevent the other rows from being received.
+    """
+    job = claim_receive_job(job_id)
+
+    if job is None:
+        return
+
+    try:
+        process_receive_job(job)
+    except ReceiveJobClaimLost:
+        logger.warning(
+            'PurchaseOrderReceiveJob <%s> was claimed by another worker', job_id
+        )
+
+
+def process_receive_job(job) -> None:
+    """Receive the outstanding rows for a claimed PurchaseOrderReceiveJob.
+
+    Raises:
+        ReceiveJobClaimLost: If the job has been claimed by another worker
+            (the current batch is rolled back)
+    """
+    Job = order.models.PurchaseOrderReceiveJob
+
+    po = job.order
+    user = job.user
+    rows = job.data.get('items', [])
+
+    # Fetch all referenced line items and locations up front
+    lines = po.lines.in_bulk([row['line_item'] for row in rows])
+
+    locations = stock.models.StockLocation.objects.in_bulk([
+        pk for pk in [job.data.get('location')] + [row['location'] for row in rows] if pk
+    ])
+
+    location = locations.get(job.data.get('location'))
+
+    def receive_rows(batch: list) -> list:
+        """Receive the provided rows (in a single transaction)."""
+        items = []
+
+        for row in batch:
+            if row['line_item'] not in lines:
+                raise ValidationError(_('Line item does not match purchase order'))
+
+            items.append({
+                **row,
+                'line_item': lines[row['line_item']],
+                'location': locations.get(row['location']),
+                'quantity': Decimal(row['quantity']),
+            })
+
+        with transaction.atomic():
+            created = po.receive_line_items(location, items, user, notify=False)
+
+        return [item.pk for item in created]
+
+    def save_progress(processed: int):
+        """Record job progress (within the current transaction).
+
+        The update only succeeds if this worker still holds the claim,
+        and no other worker has recorded progress in the meantime.
+        """
+        saved = Job.objects.filter(
+            pk=job.pk, claim=job.claim, processed=job.processed
+        ).update(
+            processed=processed,
+            failed=job.failed,
+            stock_items=job.stock_items,
+            errors=job.errors,
+            updated=timezone.now(),
+        )
+
+        if not saved:
+            raise ReceiveJobClaimLost
+
+        job.processed = processed
+
+    if job.processed:
+        logger.info(
+            'Resuming receipt of %s rows against %s (from row %s)',
+            len(rows),
+            po,
+            job.processed,
+        )
+    else:
+        logger.info('Receiving %s rows against %s', len(rows), po)
+
+    for start in range(job.processed, len(rows), Job.BATCH_SIZE):
+        batch = rows[start : start + Job.BATCH_SIZE]
+
+        count = len(job.stock_items)
+
+        try:
+            with transaction.atomic():
+                job.stock_items.extend(receive_rows(batch))
+                save_progress(start + len(batch))
+        except ReceiveJobClaimLost:
+            raise
+        except Exception:
+            # Discard any items recorded by the rolled back transaction
+            del job.stock_items[count:]
+
+            for offset, row in enumerate(batch):
+                with transaction.atomic():
+                    try:
+                        job.stock_items.extend(receive_rows([row]))
+                    except Exception as exc:
+                        job.failed += 1
+                        job.errors.append({
+                            'line_item': row['line_item'],
+                            'error': '; '.join(getattr(exc, 'messages', [str(exc)])),
+                        })
+
+                    save_progress(start + offset + 1)
+
+    job.status = Job.FAILED if job.failed and not job.stock_items else Job.COMPLETE
+    job.completed = timezone.now()
+
+    if not Job.objects.filter(pk=job.pk, claim=job.claim).update(
+        status=job.status, completed=job.completed, updated=job.completed
+    ):
+        raise ReceiveJobClaimLost
+
+    if job.stock_items:
+        # Issue a single notification for the entire job
+        InvenTree.helpers_model.notify_responsible(
+            po,
+            order.models.PurchaseOrder,
+            exclude=user,
+            content=InvenTreeNotificationBodies.ItemsReceived,
+        )
+
+
+def complete_sales_order_shipment(
+    shipment_id: int, user_id: int, batch_size: int | None = None
+) -> None:
     """Complete allocations for a pending shipment against a SalesOrder.
 
     At this stage, the shipment is assumed to be complete,
     and we need to perform the required "processing" tasks.
+
+    Allocations are completed in batches, each in a separate transaction.
+    The last completed allocation is recorded against the shipment after each batch,
+    so if the task is interrupted, running it again resumes from where it stopped.
+
+    Arguments:
+        shipment_id: ID of the SalesOrderShipment to complete
+        user_id: ID of the User who completed the shipment
+        batch_size: Number of allocations per batch (defaults to SalesOrderShipment.COMPLETE_BATCH_SIZE)
     """
-    try:
-        shipment = order.models.SalesOrderShipment.objects.get(pk=shipment_id)
-    except Exception:
+    Shipment = order.models.SalesOrderShipment
+
+    if not Shipment.objects.filter(pk=shipment_id).exists():
         # Shipping object does not exist
         logger.warning(
             'Failed to complete shipment - no matching SalesOrderShipment for ID <%s>',
@@ -169,8 +553,36 @@ def complete_sales_order_shipment(shipment_id: int, user_id: int) -> None:
     except Exception:
         user = None
 
-    logger.info('Completing SalesOrderShipment <%s>', shipment)
+    batch_size = batch_size or Shipment.COMPLETE_BATCH_SIZE
 
-    with transaction.atomic():
-        for allocation in shipment.allocations.all():
-            allocation.complete_allocation(user=user)
+    processed = 0
+
+    while True:
+        with transaction.atomic():
+            # Lock the shipment, so that allocations cannot be completed twice
+            shipment = Shipment.objects.select_for_update().get(pk=shipment_id)
+
+            if processed == 0:
+                logger.info('Completing SalesOrderShipment <%s>', shipment)
+
+            allocations = list(
+                shipment.allocations.filter(pk__gt=shipment.completed_allocation or 0)
+                .select_related('item', 'line', 'line__order', 'line__order__customer')
+                .order_by('pk')[:batch_size]
+            )
+
+            if not allocations:
+                break
+
+            order.models.SalesOrderAllocation.complete_allocations(allocations, user)
+
+            # Record progress against the shipment
+            Shipment.objects.filter(pk=shipment_id).update(
+                completed_allocation=allocations[-1].pk
+            )
+
+        processed += len(allocations)
+
+        logger.info(
+            'Completed %s allocations for SalesOrderShipment <%s>', processed, shipment
+        )
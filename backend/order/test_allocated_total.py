@@ -0,0 +1,133 @@
+"""Unit tests for the stored 'allocated_total' field of sales order line items."""
+
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from company.models import Company
+from order.models import SalesOrder, SalesOrderAllocation, SalesOrderLineItem
+from part.models import Part
+from stock.models import StockItem
+
+
+class AllocatedTotalTest(TestCase):
+    """Check that SalesOrderLineItem.allocated_total matches the allocations."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a sales order with two line items, and stock to allocate."""
+        super().setUpTestData()
+
+        customer = Company.objects.create(name='Allocating Customer', is_customer=True)
+
+        part = Part.objects.create(
+            name='Allocated Part', description='An allocated part', salable=True
+        )
+
+        cls.items = [StockItem.objects.create(part=part, quantity=50) for _ in range(2)]
+
+        cls.order = SalesOrder.objects.create(reference='SO-6001', customer=customer)
+
+        cls.lines = [
+            SalesOrderLineItem.objects.create(order=cls.order, part=part, quantity=10)
+            for _ in range(2)
+        ]
+
+    def allocate(self, line, item, quantity) -> SalesOrderAllocation:
+        """Allocate stock against a line item."""
+        return SalesOrderAllocation.objects.create(
+            line=line, item=item, quantity=quantity
+        )
+
+    def assertAllocated(self, *totals):
+        """Check the stored allocated total for each line item."""
+        for line, total in zip(self.lines, totals):
+            line.refresh_from_db()
+            self.assertEqual(line.allocated_total, total)
+
+    def test_signals(self):
+        """Saving, moving and deleting an allocation updates the stored total."""
+        self.assertAllocated(0, 0)
+
+        allocation = self.allocate(self.lines[0], self.items[0], 5)
+        self.assertAllocated(5, 0)
+
+        allocation = SalesOrderAllocation.objects.get(pk=allocation.pk)
+        allocation.quantity = 3
+        allocation.save()
+        self.assertAllocated(3, 0)
+
+        # Move the allocation to a different line item
+        allocation.line = self.lines[1]
+        allocation.save()
+        self.assertAllocated(0, 3)
+
+        allocation.delete()
+        self.assertAllocated(0, 0)
+
+    def test_queryset(self):
+        """Bulk queryset operations update the stored total."""
+        allocations = SalesOrderAllocation.objects.bulk_create([
+            SalesOrderAllocation(line=self.lines[0], item=self.items[0], quantity=2),
+            SalesOrderAllocation(line=self.lines[0], item=self.items[1], quantity=4),
+        ])
+        self.assertAllocated(6, 0)
+
+        SalesOrderAllocation.objects.filter(line=self.lines[0]).update(quantity=1)
+        self.assertAllocated(2, 0)
+
+        allocations[0].quantity = 5
+        allocations[1].line = self.lines[1]
+        SalesOrderAllocation.objects.bulk_update(allocations, ['quantity', 'line'])
+        self.assertAllocated(5, 1)
+
+        SalesOrderAllocation.objects.filter(line=self.lines[1]).delete()
+        self.assertAllocated(5, 0)
+
+    def test_cached(self):
+        """The stored total is used (without a query) when the setting is enabled."""
+        self.allocate(self.lines[0], self.items[0], 10)
+
+        line = SalesOrderLineItem.objects.select_related('order').get(
+            pk=self.lines[0].pk
+        )
+
+        with mock.patch.object(
+            SalesOrderLineItem, 'use_allocated_total', return_value=True
+        ):
+            with self.assertNumQueries(0):
+                self.assertEqual(line.allocated_quantity(), 10)
+                self.assertTrue(line.is_fully_allocated())
+                self.assertFalse(line.is_overallocated())
+
+            # A line item which has not been calculated falls back to the allocations
+            line.allocated_total = None
+            self.assertEqual(line.allocated_quantity(), 10)
+
+        # Without the setting, the allocations are always counted
+        line.allocated_total = 0
+        self.assertEqual(line.allocated_quantity(), 10)
+
+    def test_check_command(self):
+        """The check_allocated_total command reports (and repairs) incorrect totals."""
+        self.allocate(self.lines[0], self.items[0], 4)
+
+        SalesOrderLineItem.objects.filter(pk=self.lines[0].pk).update(
+            allocated_total=50
+        )
+
+        output = StringIO()
+        call_command('check_allocated_total', stdout=output)
+        self.assertIn('Found 1 line items', output.getvalue())
+        self.assertAllocated(50, 0)
+
+        output = StringIO()
+        call_command('check_allocated_total', repair=True, stdout=output)
+        self.assertIn('Repaired 1 line items', output.getvalue())
+        self.assertAllocated(4, 0)
+
+        output = StringIO()
+        call_command('check_allocated_total', stdout=output)
+        self.assertIn('the correct allocated total', output.getvalue())
@@ -0,0 +1,112 @@
+"""Unit tests for the 'overdue' status of orders."""
+
+from datetime import timedelta
+
+from django.test import TestCase
+
+import InvenTree.helpers
+from company.models import Company
+from order.models import PurchaseOrder, ReturnOrder, SalesOrder
+from order.serializers import overdue_annotation
+from order.status_codes import PurchaseOrderStatus, ReturnOrderStatus, SalesOrderStatus
+
+
+class OrderOverdueTest(TestCase):
+    """Check that Order.is_overdue agrees with the Order.overdue_filter() query.
+
+    The property is evaluated in Python (to avoid a query per order),
+    so it must apply exactly the same rules as the database filter.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a single order of each type."""
+        super().setUpTestData()
+
+        company = Company.objects.create(
+            name='Overdue Company', is_supplier=True, is_customer=True
+        )
+
+        cls.orders = [
+            (
+                PurchaseOrder.objects.create(reference='PO-8001', supplier=company),
+                PurchaseOrderStatus,
+            ),
+            (
+                SalesOrder.objects.create(reference='SO-8001', customer=company),
+                SalesOrderStatus,
+            ),
+            (
+                ReturnOrder.objects.create(reference='RMA-8001', customer=company),
+                ReturnOrderStatus,
+            ),
+        ]
+
+    def target_dates(self) -> dict:
+        """Return the target dates to check (either side of the overdue boundary)."""
+        today = InvenTree.helpers.current_date()
+
+        return {
+            'none': None,
+            'last_week': today - timedelta(days=7),
+            'yesterday': today - timedelta(days=1),
+            'today': today,
+            'tomorrow': today + timedelta(days=1),
+        }
+
+    def test_is_overdue(self):
+        """Check each combination of order type, status and target date."""
+        for instance, status_class in self.orders:
+            model = instance.__class__
+            open_codes = model.get_status_class().OPEN
+
+            for status in status_class:
+                for label, target_date in self.target_dates().items():
+                    with self.subTest(
+                        model=model.__name__, status=status.name, target_date=label
+                    ):
+                        # Update without calling save(), to avoid any side effects
+                        model.objects.filter(pk=instance.pk).update(
+                            status=status.value, target_date=target_date
+                        )
+
+                        order = model.objects.get(pk=instance.pk)
+
+                        in_filter = (
+                            model.objects.filter(model.overdue_filter())
+                            .filter(pk=instance.pk)
+                            .exists()
+                        )
+
+                        self.assertEqual(order.is_overdue, in_filter)
+
+                        # Check the expected result explicitly
+                        expected = (
+                            status.value in open_codes
+                            and label in ['last_week', 'yesterday']
+                        )
+
+                        self.assertEqual(order.is_overdue, expected)
+
+                        # The annotated value (as used by the API) must also agree
+                        annotated = model.objects.annotate(
+                            overdue=overdue_annotation(model)
+                        ).get(pk=instance.pk)
+
+                        self.assertEqual(annotated.is_overdue, expected)
+
+    def test_status_groups(self):
+        """Every open status is covered, and closed statuses are never overdue."""
+        yesterday = self.target_dates()['yesterday']
+
+        for instance, status_class in self.orders:
+            model = instance.__class__
+            open_codes = model.get_status_class().OPEN
+
+            self.assertTrue(len(open_codes) > 0)
+
+            for status in status_class:
+                instance.status = status.value
+                instance.target_date = yesterday
+
+                self.assertEqual(instance.is_overdue, status.value in open_codes)
@@ -0,0 +1,84 @@
+"""Unit tests for the public sales order API endpoint."""
+
+import hashlib
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from company.models import Company
+from order.models import SalesOrder, SalesOrderIdempotencyKey
+from part.models import Part
+
+
+class PublicCreateSalesOrderTest(TestCase):
+    """Tests for idempotent creation of sales orders via the public API."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a customer and a salable part."""
+        super().setUpTestData()
+
+        cls.customer = Company.objects.create(name='Webshop Customer', is_customer=True)
+
+        cls.part = Part.objects.create(
+            name='Webshop Part', description='A part sold online', salable=True
+        )
+
+    def setUp(self):
+        """Clear any idempotency locks left in the cache."""
+        super().setUp()
+        cache.clear()
+
+    def create(self, key=None, expected_code=201):
+        """Post a new order to the public API, with the provided idempotency key."""
+        extra = {} if key is None else {'HTTP_IDEMPOTENCY_KEY': key}
+
+        response = self.client.post(
+            reverse('api-create-sales-order'),
+            {
+                'customer_id': self.customer.pk,
+                'items': [{'product': self.part.pk, 'quantity': 2}],
+            },
+            content_type='application/json',
+            **extra,
+        )
+
+        self.assertEqual(response.status_code, expected_code)
+        return response
+
+    def test_replay(self):
+        """A retried request returns the original order, without creating another."""
+        response = self.create('order-1234')
+        self.assertEqual(SalesOrder.objects.count(), 1)
+
+        replay = self.create('  order-1234  ', expected_code=200)
+        self.assertEqual(replay.data['pk'], response.data['pk'])
+        self.assertEqual(SalesOrder.objects.count(), 1)
+
+        key = SalesOrderIdempotencyKey.objects.get(key='order-1234')
+        self.assertEqual(key.order.pk, response.data['pk'])
+
+    def test_in_progress(self):
+        """A request is rejected while another request with the same key is running."""
+        key_hash = hashlib.sha256(b'order-5678').hexdigest()
+        cache.add(f'public_sales_order_{key_hash}', True, 60)
+
+        response = self.create('order-5678', expected_code=409)
+        self.assertIn('in progress', str(response.data['detail']))
+        self.assertEqual(SalesOrder.objects.count(), 0)
+
+        # Once the lock is released, the order can be created
+        cache.clear()
+        self.create('order-5678')
+        self.assertEqual(SalesOrder.objects.count(), 1)
+
+    def test_invalid_key(self):
+        """Blank or over-long idempotency keys are rejected."""
+        self.create('', expected_code=400)
+        self.create('    ', expected_code=400)
+        self.create('x' * 256, expected_code=400)
+        self.assertEqual(SalesOrder.objects.count(), 0)
+
+        self.create('x' * 255)
+        self.assertEqual(SalesOrderIdempotencyKey.objects.count(), 1)
@@ -0,0 +1,112 @@
+"""Unit tests for calculating the allocation status of sales orders."""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from company.models import Company
+from order.models import SalesOrder, SalesOrderAllocation, SalesOrderLineItem
+from part.models import Part
+from stock.models import StockItem
+
+
+class SalesOrderReadinessTest(TestCase):
+    """Check that readiness is calculated without per-order (or per-line) queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a customer, and stock which can be allocated to orders."""
+        super().setUpTestData()
+
+        cls.user = User.objects.create_superuser('ready', password='password')
+
+        cls.customer = Company.objects.create(name='Ready Customer', is_customer=True)
+
+        cls.part = Part.objects.create(
+            name='Ready Part', description='A part for sale', salable=True
+        )
+
+        cls.item = StockItem.objects.create(part=cls.part, quantity=1000)
+
+    def create_orders(self, count: int, allocated: int) -> list:
+        """Create orders with three lines, allocating the given quantity per line."""
+        orders = []
+
+        for _ in range(count):
+            order = SalesOrder.objects.create(customer=self.customer)
+
+            for _ in range(3):
+                line = SalesOrderLineItem.objects.create(
+                    order=order, part=self.part, quantity=5
+                )
+
+                SalesOrderAllocation.objects.create(
+                    line=line, item=self.item, quantity=allocated
+                )
+
+            orders.append(order)
+
+        return orders
+
+    def test_get_readiness(self):
+        """Readiness for multiple orders is found with a fixed number of queries."""
+        ready = self.create_orders(2, 5)
+        partial = self.create_orders(2, 3)
+        over = self.create_orders(1, 6)
+
+        orders = list(SalesOrder.objects.all())
+
+        with self.assertNumQueries(1):
+            readiness = SalesOrder.get_readiness(orders, include_counts=False)
+
+        with self.assertNumQueries(3):
+            SalesOrder.get_readiness(orders)
+
+        for order in ready:
+            self.assertTrue(readiness[order.pk]['fully_allocated'])
+            self.assertFalse(readiness[order.pk]['overallocated'])
+
+        for order in partial:
+            self.assertFalse(readiness[order.pk]['fully_allocated'])
+
+        for order in over:
+            self.assertTrue(readiness[order.pk]['overallocated'])
+
+    def list_orders(self, **params):
+        """Request the sales order list, and return the results and query count."""
+        url = reverse('api-so-list')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'limit': 100, **params})
+
+        self.assertEqual(response.status_code, 200)
+
+        return response.data['results'], len(queries)
+
+    def test_list(self):
+        """The list endpoint does not query the readiness of each order."""
+        self.client.force_login(self.user)
+
+        self.create_orders(2, 5)
+        self.create_orders(1, 3)
+
+        # Readiness fields are only included when requested
+        results, _count = self.list_orders()
+        self.assertNotIn('fully_allocated', results[0])
+
+        results, count = self.list_orders(readiness=True)
+        self.assertEqual(len(results), 3)
+
+        self.assertEqual(
+            sorted(result['fully_allocated'] for result in results),
+            [False, True, True],
+        )
+
+        # The number of queries does not depend on the number of orders
+        self.create_orders(5, 5)
+
+        results, more = self.list_orders(readiness=True)
+        self.assertEqual(len(results), 8)
+        self.assertEqual(count, more)
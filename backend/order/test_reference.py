@@ -0,0 +1,60 @@
+"""Unit tests for generating order references."""
+
+from django.test import TestCase
+
+from company.models import Company
+from order.models import OrderReferenceCounter, SalesOrder
+from order.validators import GeneratedReference
+
+
+class OrderReferenceCounterTest(TestCase):
+    """Tests for allocating order references from the OrderReferenceCounter table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a customer, and an existing order."""
+        super().setUpTestData()
+
+        cls.customer = Company.objects.create(
+            name='Reference Customer', is_customer=True
+        )
+
+        SalesOrder.objects.create(reference='SO-0010', customer=cls.customer)
+
+    def test_allocate(self):
+        """Each allocation returns a different number, without saving an order."""
+        first = OrderReferenceCounter.allocate(SalesOrder)
+        second = OrderReferenceCounter.allocate(SalesOrder)
+
+        self.assertEqual(first, 11)
+        self.assertEqual(second, 12)
+
+        # Peeking does not allocate
+        self.assertEqual(OrderReferenceCounter.peek(SalesOrder), 13)
+        self.assertEqual(OrderReferenceCounter.peek(SalesOrder), 13)
+
+    def test_generated(self):
+        """Orders created with the same default reference get unique references."""
+        orders = [SalesOrder(customer=self.customer) for _ in range(2)]
+
+        # Both orders were given the same (previewed) default reference
+        self.assertIsInstance(orders[0].reference, GeneratedReference)
+        self.assertEqual(orders[0].reference, orders[1].reference)
+
+        for instance in orders:
+            instance.save()
+
+        self.assertEqual(
+            sorted(instance.reference_int for instance in orders), [11, 12]
+        )
+
+        self.assertNotEqual(orders[0].reference, orders[1].reference)
+
+    def test_manual(self):
+        """A manually entered reference advances the counter."""
+        SalesOrder.objects.create(reference='SO-0100', customer=self.customer)
+
+        self.assertEqual(OrderReferenceCounter.peek(SalesOrder), 101)
+
+        instance = SalesOrder.objects.create(customer=self.customer)
+        self.assertEqual(instance.reference_int, 101)
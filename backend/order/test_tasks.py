@@ -0,0 +1,169 @@
+"""Unit tests for background tasks in the 'order' app."""
+
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+import order.tasks
+from company.models import Company, SupplierPart
+from order.models import PurchaseOrder, PurchaseOrderLineItem, PurchaseOrderReceiveJob
+from order.status_codes import PurchaseOrderStatus
+from part.models import Part
+from stock.models import StockItem, StockLocation
+from stock.status_codes import StockStatus
+
+
+class PurchaseOrderReceiveJobTest(TestCase):
+    """Tests for receiving purchase order items in the background."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a placed purchase order with a single line item."""
+        super().setUpTestData()
+
+        cls.user = User.objects.create_user('receiver', password='password')
+
+        part = Part.objects.create(
+            name='Widget', description='A purchaseable widget', purchaseable=True
+        )
+
+        supplier = Company.objects.create(name='Widget Supplier', is_supplier=True)
+
+        supplier_part = SupplierPart.objects.create(
+            part=part, supplier=supplier, SKU='WIDGET-001'
+        )
+
+        cls.location = StockLocation.objects.create(name='Goods In')
+
+        cls.order = PurchaseOrder.objects.create(
+            reference='PO-9001',
+            supplier=supplier,
+            status=PurchaseOrderStatus.PLACED.value,
+        )
+
+        cls.line = PurchaseOrderLineItem.objects.create(
+            order=cls.order, part=supplier_part, quantity=100
+        )
+
+    def create_job(self, rows: int = 4, **kwargs) -> PurchaseOrderReceiveJob:
+        """Create a receive job, with one row (of 5 items) per batch code."""
+        items = [
+            {
+                'line_item': self.line.pk,
+                'quantity': '5',
+                'location': None,
+                'status': StockStatus.OK.value,
+                'barcode': '',
+                'batch_code': f'B{idx}',
+                'packaging': '',
+                'serials': None,
+                'notes': '',
+            }
+            for idx in range(rows)
+        ]
+
+        return PurchaseOrderReceiveJob.objects.create(
+            order=self.order,
+            user=self.user,
+            total=rows,
+            data={'location': self.location.pk, 'items': items},
+            **kwargs,
+        )
+
+    def received_batches(self) -> set:
+        """Return the batch codes of all stock received against the order."""
+        return set(
+            StockItem.objects.filter(purchase_order=self.order).values_list(
+                'batch', flat=True
+            )
+        )
+
+    def test_receive(self):
+        """All rows are received, and running the job again has no effect."""
+        job = self.create_job()
+
+        order.tasks.receive_purchase_order_items(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PurchaseOrderReceiveJob.COMPLETE)
+        self.assertEqual(job.processed, 4)
+        self.assertEqual(len(job.stock_items), 4)
+        self.assertEqual(self.received_batches(), {'B0', 'B1', 'B2', 'B3'})
+
+        # Running a finished job again must not receive any rows
+        order.tasks.receive_purchase_order_items(job.pk)
+
+        self.line.refresh_from_db()
+        self.assertEqual(self.line.received, 20)
+        self.assertEqual(StockItem.objects.filter(purchase_order=self.order).count(), 4)
+
+    def test_resume(self):
+        """A partly processed job resumes from the first unprocessed row."""
+        job = self.create_job(status=PurchaseOrderReceiveJob.RUNNING, processed=2)
+
+        # Simulate a worker which stopped after receiving the first two rows
+        PurchaseOrderReceiveJob.objects.filter(pk=job.pk).update(
+            updated=timezone.now()
+            - timedelta(seconds=PurchaseOrderReceiveJob.STALE_TIMEOUT + 60)
+        )
+
+        order.tasks.receive_purchase_order_items(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PurchaseOrderReceiveJob.COMPLETE)
+        self.assertEqual(job.processed, 4)
+        self.assertEqual(len(job.stock_items), 2)
+
+        # Only the unprocessed rows are received
+        self.assertEqual(self.received_batches(), {'B2', 'B3'})
+
+        self.line.refresh_from_db()
+        self.assertEqual(self.line.received, 10)
+
+    def test_running(self):
+        """A job which is running in another worker cannot be claimed."""
+        job = self.create_job(status=PurchaseOrderReceiveJob.RUNNING, processed=1)
+
+        self.assertIsNone(order.tasks.claim_receive_job(job.pk))
+
+        order.tasks.receive_purchase_order_items(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PurchaseOrderReceiveJob.RUNNING)
+        self.assertEqual(job.processed, 1)
+        self.assertEqual(self.received_batches(), set())
+
+    def test_claim(self):
+        """A pending job can only be claimed once."""
+        job = self.create_job()
+
+        claimed = order.tasks.claim_receive_job(job.pk)
+
+        self.assertIsNotNone(claimed)
+        self.assertEqual(claimed.status, PurchaseOrderReceiveJob.RUNNING)
+        self.assertIsNone(order.tasks.claim_receive_job(job.pk))
+
+    def test_claim_lost(self):
+        """A worker stops without receiving, once another worker claims its job."""
+        job = self.create_job()
+
+        claimed = order.tasks.claim_receive_job(job.pk)
+        self.assertIsNotNone(claimed.claim)
+
+        # Simulate a second worker reclaiming the job (e.g. after the stale timeout)
+        PurchaseOrderReceiveJob.objects.filter(pk=job.pk).update(claim=uuid.uuid4())
+
+        with self.assertRaises(order.tasks.ReceiveJobClaimLost):
+            order.tasks.process_receive_job(claimed)
+
+        # The batch received by the first worker was rolled back
+        job.refresh_from_db()
+        self.assertEqual(job.processed, 0)
+        self.assertEqual(job.status, PurchaseOrderReceiveJob.RUNNING)
+        self.assertEqual(self.received_batches(), set())
+
+        self.line.refresh_from_db()
+        self.assertEqual(self.line.received, 0)
@@ -0,0 +1,159 @@
+"""Unit tests for maintaining the total price of orders."""
+
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from djmoney.contrib.exchange.models import (
+    ExchangeBackend,
+    Rate,
+    get_default_backend_name,
+)
+from djmoney.money import Money
+
+from company.models import Company, SupplierPart
+from order.models import PurchaseOrder, PurchaseOrderExtraLine, PurchaseOrderLineItem
+from part.models import Part
+
+
+class OrderTotalPriceTest(TestCase):
+    """Check that the stored total price is updated as the order lines change."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a purchase order, and exchange rates for currency conversion."""
+        super().setUpTestData()
+
+        cls.user = User.objects.create_superuser('pricer', password='password')
+
+        supplier = Company.objects.create(
+            name='Priced Supplier', is_supplier=True, currency='USD'
+        )
+
+        cls.parts = [
+            SupplierPart.objects.create(
+                part=Part.objects.create(
+                    name=f'Priced Part {idx}',
+                    description='A priced part',
+                    purchaseable=True,
+                ),
+                supplier=supplier,
+                SKU=f'PRICED-{idx}',
+            )
+            for idx in range(3)
+        ]
+
+        cls.order = PurchaseOrder.objects.create(
+            reference='PO-7001', supplier=supplier, order_currency='USD'
+        )
+
+        backend = ExchangeBackend.objects.create(
+            name=get_default_backend_name(), base_currency='USD'
+        )
+
+        Rate.objects.create(currency='EUR', value=Decimal('0.5'), backend=backend)
+
+    def add_line(self, idx: int, quantity: int, price) -> PurchaseOrderLineItem:
+        """Add a line item to the order."""
+        return PurchaseOrderLineItem.objects.create(
+            order=self.order,
+            part=self.parts[idx],
+            quantity=quantity,
+            purchase_price=Money(price, 'USD'),
+        )
+
+    def assertTotal(self, amount, currency='USD'):
+        """Check the stored total price of the order."""
+        self.order.refresh_from_db()
+
+        self.assertEqual(self.order.total_price, Money(amount, currency))
+
+        # The stored total must agree with a full recalculation
+        self.assertEqual(
+            self.order.total_price,
+            self.order.calculate_total_price(target_currency=currency),
+        )
+
+    def test_save(self):
+        """Saving a single line item updates the order total."""
+        line = self.add_line(0, 2, 10)
+        self.assertTotal(20)
+
+        PurchaseOrderExtraLine.objects.create(
+            order=self.order, quantity=1, price=Money(5, 'USD')
+        )
+        self.assertTotal(25)
+
+        line = PurchaseOrderLineItem.objects.get(pk=line.pk)
+        line.quantity = 3
+        line.save()
+        self.assertTotal(35)
+
+    def test_delete(self):
+        """Deleting a single line item updates the order total."""
+        self.add_line(0, 2, 10)
+        line = self.add_line(1, 1, 7)
+        self.assertTotal(27)
+
+        PurchaseOrderLineItem.objects.get(pk=line.pk).delete()
+        self.assertTotal(20)
+
+    def test_queryset(self):
+        """Bulk queryset operations (without save or delete) update the order total."""
+        lines = [self.add_line(idx, 1, 10) for idx in range(3)]
+        self.assertTotal(30)
+
+        PurchaseOrderLineItem.objects.filter(order=self.order).update(quantity=2)
+        self.assertTotal(60)
+
+        for line in lines:
+            line.quantity = 1
+
+        PurchaseOrderLineItem.objects.bulk_update(lines[:2], ['quantity'])
+        self.assertTotal(40)
+
+        PurchaseOrderLineItem.objects.filter(pk=lines[0].pk).delete()
+        self.assertTotal(30)
+
+    def test_bulk_delete_api(self):
+        """Line items deleted via the bulk delete API are removed from the total."""
+        lines = [self.add_line(idx, 1, 10) for idx in range(3)]
+        self.assertTotal(30)
+
+        self.client.force_login(self.user)
+
+        response = self.client.delete(
+            reverse('api-po-line-list'),
+            {'items': [lines[0].pk, lines[1].pk]},
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 204)
+        self.assertTotal(10)
+
+    def test_currency_change(self):
+        """Changing the order currency falls back to a full recalculation."""
+        self.add_line(0, 2, 10)
+        self.assertTotal(20)
+
+        self.order.order_currency = 'EUR'
+        self.order.save()
+        self.assertTotal(10, 'EUR')
+
+        # Subsequent changes are converted into the new currency
+        self.add_line(1, 1, 10)
+        self.assertTotal(15, 'EUR')
+
+        # Without an exchange rate, the total cannot be calculated
+        self.order.order_currency = 'AUD'
+        self.order.save()
+
+        self.order.refresh_from_db()
+        self.assertIsNone(self.order.total_price)
+
+        # Once the currency is valid again, the total is recalculated
+        self.order.order_currency = 'USD'
+        self.order.save()
+        self.assertTotal(30)
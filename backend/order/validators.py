@@ -1,25 +1,34 @@
 """Validation methods for the order app."""
 
 
+class GeneratedReference(str):
+    """An automatically generated (default) order reference.
+
+    The default reference is only a preview of the next reference number.
+    When an order is created with a generated reference, the reference is replaced
+    with one which is allocated atomically (see Order.save).
+    """
+
+
 def generate_next_sales_order_reference():
     """Generate the next available SalesOrder reference."""
     from order.models import SalesOrder
 
-    return SalesOrder.generate_reference()
+    return GeneratedReference(SalesOrder.generate_reference())
 
 
 def generate_next_purchase_order_reference():
     """Generate the next available PurchasesOrder reference."""
     from order.models import PurchaseOrder
 
-    return PurchaseOrder.generate_reference()
+    return GeneratedReference(PurchaseOrder.generate_reference())
 
 
 def generate_next_return_order_reference():
     """Generate the next available ReturnOrder reference."""
     from order.models import ReturnOrder
 
-    return ReturnOrder.generate_reference()
+    return GeneratedReference(ReturnOrder.generate_reference())
 
 
 def validate_sales_order_reference_pattern(pattern):
@@ -1,11 +1,13 @@
 """Django views for interacting with Order app."""
 
 import logging
+import tempfile
+from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
 
 from django.db.utils import IntegrityError
 from django.forms import HiddenInput, IntegerField
-from django.http import HttpResponseRedirect
+from django.http import FileResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.http.response import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
@@ -24,6 +26,7 @@ from plugin.views import InvenTreePluginViewMixin
 
 from . import forms as order_forms
 from .admin import PurchaseOrderLineItemResource, SalesOrderLineItemResource
+from .export import stream_delimited
 from .models import (
     PurchaseOrder,
     PurchaseOrderLineItem,
@@ -277,57 +280,138 @@ class PurchaseOrderUpload(FileManagementFormView):
         )
 
 
-class SalesOrderExport(AjaxView):
-    """Export a sales order.
+class OrderLineExportMixin:
+    """Mixin class for exporting the line items of an order.
 
-    - File format can optionally be passed as a query parameter e.g. ?format=CSV
-    - Default file format is CSV
+    - CSV and TSV data are streamed directly to the client, one row at a time
+    - XLSX data are written using a write-only workbook
+    - Other formats are exported via a tablib Dataset
+
+    All related data required by the resource class is fetched up front,
+    rather than being looked up separately for each row.
     """
 
-    model = SalesOrder
+    resource_class = None
 
-    role_required = 'sales_order.view'
+    EXPORT_CHUNK_SIZE = 2000
+
+    STREAM_FORMATS = {
+        'csv': ('text/csv', ','),
+        'tsv': ('text/tab-separated-values', '\t'),
+    }
+
+    XLSX_CONTENT_TYPE = (
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+
+    def get_export_filename(self, order, export_format: str) -> str:
+        """Return the filename for the exported data.
+
+        By default, the filename is based on the order reference and the associated company.
+        """
+        if company := order.company:
+            return f'{order!s} - {company.name}.{export_format}'
+
+        return f'{order!s}.{export_format}'
 
     def get(self, request, *args, **kwargs):
-        """Perform GET request to export SalesOrder dataset."""
-        order = get_object_or_404(SalesOrder, pk=self.kwargs.get('pk', None))
+        """Perform GET request to export the order line items."""
+        order = get_object_or_404(self.model, pk=self.kwargs.get('pk', None))
+
+        export_format = str(request.GET.get('format', 'csv')).strip().lower()
+
+        filename = self.get_export_filename(order, export_format)
 
-        export_format = request.GET.get('format', 'csv')
+        resource = self.resource_class()
+        queryset = resource.prepare_export_queryset(order.lines.all())
 
-        filename = f'{order!s} - {order.customer.name}.{export_format}'
+        if export_format in self.STREAM_FORMATS:
+            return self.stream_export(resource, queryset, export_format, filename)
 
-        dataset = SalesOrderLineItemResource().export(queryset=order.lines.all())
+        if export_format == 'xlsx':
+            return self.export_xlsx(resource, queryset, filename)
+
+        dataset = resource.export(queryset=queryset)
 
         filedata = dataset.export(format=export_format)
 
         return DownloadFile(filedata, filename)
 
+    def export_rows(self, resource, queryset):
+        """Generate the exported row data, one row at a time."""
+        for line in queryset.iterator(chunk_size=self.EXPORT_CHUNK_SIZE):
+            yield resource.export_resource(line)
 
-class PurchaseOrderExport(AjaxView):
-    """File download for a purchase order.
+    def stream_export(self, resource, queryset, export_format: str, filename: str):
+        """Return a streaming response containing delimited (CSV / TSV) data."""
+        content_type, delimiter = self.STREAM_FORMATS[export_format]
 
-    - File format can be optionally passed as a query param e.g. ?format=CSV
+        def table():
+            yield resource.get_export_headers()
+            yield from self.export_rows(resource, queryset)
+
+        response = StreamingHttpResponse(
+            stream_delimited(table(), delimiter=delimiter), content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+        return response
+
+    def export_xlsx(self, resource, queryset, filename: str):
+        """Return a response containing XLSX data, written in write-only mode."""
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+
+        sheet.append([str(header) for header in resource.get_export_headers()])
+
+        for row in self.export_rows(resource, queryset):
+            sheet.append([
+                value
+                if value is None
+                or isinstance(value, (str, int, float, Decimal, date, datetime))
+                else str(value)
+                for value in row
+            ])
+
+        output = tempfile.TemporaryFile()
+        workbook.save(output)
+        output.seek(0)
+
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=filename,
+            content_type=self.XLSX_CONTENT_TYPE,
+        )
+
+
+class SalesOrderExport(OrderLineExportMixin, AjaxView):
+    """Export a sales order.
+
+    - File format can optionally be passed as a query parameter e.g. ?format=CSV
     - Default file format is CSV
     """
 
-    model = PurchaseOrder
-
-    # Specify role as we cannot introspect from "AjaxView"
-    role_required = 'purchase_order.view'
+    model = SalesOrder
+    resource_class = SalesOrderLineItemResource
 
-    def get(self, request, *args, **kwargs):
-        """Perform GET request to export PurchaseOrder dataset."""
-        order = get_object_or_404(PurchaseOrder, pk=self.kwargs.get('pk', None))
+    role_required = 'sales_order.view'
 
-        export_format = request.GET.get('format', 'csv')
 
-        filename = f'{order!s} - {order.supplier.name}.{export_format}'
+class PurchaseOrderExport(OrderLineExportMixin, AjaxView):
+    """File download for a purchase order.
 
-        dataset = PurchaseOrderLineItemResource().export(queryset=order.lines.all())
+    - File format can be optionally passed as a query param e.g. ?format=CSV
+    - Default file format is CSV
+    """
 
-        filedata = dataset.export(format=export_format)
+    model = PurchaseOrder
+    resource_class = PurchaseOrderLineItemResource
 
-        return DownloadFile(filedata, filename)
+    # Specify role as we cannot introspect from "AjaxView"
+    role_required = 'purchase_order.view'
 
 
 class LineItemPricing(PartPricing):
@@ -4,6 +4,7 @@ import logging
 
 from django.db.models import F
 from django.urls import include, path
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from django_filters import rest_framework as rest_filters
@@ -28,6 +29,7 @@ from plugin import registry
 from users.models import RuleSet
 
 from . import serializers as barcode_serializers
+from .tasks import scan_buffer
 
 logger = logging.getLogger('inventree')
 
@@ -38,19 +40,27 @@ class BarcodeView(CreateAPIView):
     # Default serializer class (can be overridden)
     serializer_class = barcode_serializers.BarcodeSerializer
 
-    def log_scan(self, request, response=None, result=False):
+    def log_scan(self, request, response=None, result=False, barcode=None):
         """Log a barcode scan to the database.
 
+        The scan result is buffered, and written to the database by a background task.
+
         Arguments:
             request: HTTP request object
             response: Optional response data
+            result: True if the scan was successful
+            barcode: Optional barcode data (defaults to the 'barcode' field of the request)
         """
         from common.models import BarcodeScanResult
 
         # Extract context data from the request
         context = {**request.GET.dict(), **request.POST.dict(), **request.data}
 
-        barcode = context.pop('barcode', '')
+        if barcode is None:
+            barcode = context.pop('barcode', '')
+        else:
+            context.pop('barcode', None)
+            context.pop('barcodes', None)
 
         # Exit if storing barcode scans is disabled
         if not get_global_setting('BARCODE_STORE_RESULTS', backup=False, create=False):
@@ -77,27 +87,18 @@ class BarcodeView(CreateAPIView):
             barcode = barcode[: BarcodeScanResult.BARCODE_SCAN_MAX_LEN]
 
         try:
-            BarcodeScanResult.objects.create(
-                data=barcode,
-                user=request.user,
-                endpoint=request.path,
-                response=response,
-                result=result,
-                context=context,
-            )
-
-            # Ensure that we do not store too many scans
-            max_scans = int(get_global_setting('BARCODE_RESULTS_MAX_NUM', create=False))
-            num_scans = BarcodeScanResult.objects.count()
-
-            if num_scans > max_scans:
-                n = num_scans - max_scans
-                old_scan_ids = list(
-                    BarcodeScanResult.objects.all()
-                    .order_by('timestamp')
-                    .values_list('pk', flat=True)[:n]
-                )
-                BarcodeScanResult.objects.filter(pk__in=old_scan_ids).delete()
+            # Scan results are written in bulk by the background worker
+            # The number of stored scans is limited by a periodic task (trim_scan_results)
+            scan_buffer.add({
+                'data': barcode,
+                'user_id': request.user.pk if request.user.is_authenticated else None,
+                'endpoint': request.path,
+                'response': response,
+                'result': result,
+                'context': context,
+                # Record the time of the scan (not the time it is written)
+                'timestamp': timezone.now(),
+            })
         except Exception:
             # Gracefully log error to database
             log_error(f'{self.__class__.__name__}.log_scan')
@@ -139,15 +140,101 @@ class BarcodeView(CreateAPIView):
             f'handle_barcode not implemented for {self.__class__}'
         )
 
+    def scan_barcodes(self, barcodes: list, request) -> list:
+        """Perform a generic 'scan' of multiple barcodes.
+
+        This is equivalent to calling scan_barcode() for each barcode (in order),
+        except that plugins which implement a scan_batch() method
+        are passed all of their candidate barcodes at once.
+
+        Arguments:
+            barcodes: List of raw barcode values
+            request: HTTP request object
+
+        Returns:
+            A list of response data, in the same order as the provided barcodes
+        """
+        plugins = list(registry.with_mixin('barcode'))
+
+        # Determine which plugins can handle each barcode
+        candidates = [
+            {
+                id(p)
+                for p in plugin.base.barcodes.helper.get_barcode_plugins_for(
+                    barcode, plugins
+                )
+            }
+            for barcode in barcodes
+        ]
+
+        matched_plugins = [None] * len(barcodes)
+        responses = [{} for _ in barcodes]
+        complete = [False] * len(barcodes)
+
+        for current_plugin in plugins:
+            pending = [
+                idx
+                for idx in range(len(barcodes))
+                if not complete[idx] and id(current_plugin) in candidates[idx]
+            ]
+
+            if not pending:
+                continue
+
+            if hasattr(current_plugin, 'scan_batch'):
+                try:
+                    results = current_plugin.scan_batch([
+                        barcodes[idx] for idx in pending
+                    ])
+                except Exception:
+                    log_error('BarcodeView.scan_barcodes')
+                    continue
+            else:
+                results = []
+
+                for idx in pending:
+                    try:
+                        results.append(current_plugin.scan(barcodes[idx]))
+                    except Exception:
+                        log_error('BarcodeView.scan_barcodes')
+                        results.append(None)
+
+            for idx, result in zip(pending, results):
+                if not result:
+                    continue
+
+                if 'error' in result:
+                    if not responses[idx]:
+                        matched_plugins[idx] = current_plugin
+                        responses[idx] = result
+                else:
+                    # Keep the first successful match
+                    matched_plugins[idx] = current_plugin
+                    responses[idx] = result
+                    complete[idx] = True
+
+        for idx, barcode in enumerate(barcodes):
+            matched_plugin = matched_plugins[idx]
+            response = responses[idx]
+
+            response['plugin'] = matched_plugin.name if matched_plugin else None
+            response['barcode_data'] = barcode
+            response['barcode_hash'] = hash_barcode(barcode)
+
+        return responses
+
     def scan_barcode(self, barcode: str, request, **kwargs):
         """Perform a generic 'scan' of the provided barcode data.
 
-        Check each loaded plugin, and return the first valid match
+        Check each loaded plugin which can handle the barcode, and return the first valid match.
+        Plugins which declare routing information (and do not claim the barcode) are skipped.
         """
-        plugins = registry.with_mixin('barcode')
+        plugins = plugin.base.barcodes.helper.get_barcode_plugins_for(
+            barcode, registry.with_mixin('barcode')
+        )
 
         # Look for a barcode plugin which knows how to deal with this barcode
-        plugin = None
+        matched_plugin = None
         response = {}
 
         for current_plugin in plugins:
@@ -170,15 +257,15 @@ class BarcodeView(CreateAPIView):
                     result['error'],
                 )
                 if not response:
-                    plugin = current_plugin
+                    matched_plugin = current_plugin
                     response = result
             else:
                 # Return the first successful match
-                plugin = current_plugin
+                matched_plugin = current_plugin
                 response = result
                 break
 
-        response['plugin'] = plugin.name if plugin else None
+        response['plugin'] = matched_plugin.name if matched_plugin else None
         response['barcode_data'] = barcode
         response['barcode_hash'] = hash_barcode(barcode)
 
@@ -220,6 +307,53 @@ class BarcodeScan(BarcodeView):
         return Response(response)
 
 
+class BarcodeBatchScan(BarcodeView):
+    """Endpoint for scanning multiple barcodes in a single request.
+
+    Each barcode is matched in the same way as the generic barcode scan endpoint,
+    but database lookups are grouped across the entire batch.
+
+    Results are returned in the same order as the provided barcodes,
+    and a single scan result is logged for the entire batch.
+    """
+
+    serializer_class = barcode_serializers.BarcodeBatchSerializer
+
+    def create(self, request, *args, **kwargs):
+        """Scan the provided list of barcodes."""
+        serializer = self.get_serializer(data=request.data)
+
+        try:
+            serializer.is_valid(raise_exception=True)
+        except Exception as exc:
+            self.log_scan(request, response={'error': str(exc)}, result=False)
+            raise exc
+
+        barcodes = [
+            str(barcode).strip() for barcode in serializer.validated_data['barcodes']
+        ]
+
+        results = self.scan_barcodes(barcodes, request)
+
+        matched = 0
+
+        for response in results:
+            if response['plugin'] is None:
+                response['error'] = _('No match found for barcode data')
+            else:
+                response['success'] = _('Match found for barcode data')
+                matched += 1
+
+        self.log_scan(
+            request,
+            {'barcodes': len(barcodes), 'matched': matched},
+            matched == len(barcodes),
+            barcode='\n'.join(barcodes),
+        )
+
+        return Response({'results': results})
+
+
 @extend_schema_view(
     post=extend_schema(responses={200: barcode_serializers.BarcodeSerializer})
 )
@@ -834,6 +968,8 @@ barcode_api_urls = [
     path('po-allocate/', BarcodePOAllocate.as_view(), name='api-barcode-po-allocate'),
     # Allocate stock to a sales order by scanning barcode
     path('so-allocate/', BarcodeSOAllocate.as_view(), name='api-barcode-so-allocate'),
+    # Scan multiple barcodes in a single request
+    path('batch/', BarcodeBatchScan.as_view(), name='api-barcode-batch'),
     # Catch-all performs barcode 'scan'
     path('', BarcodeScan.as_view(), name='api-barcode-scan'),
 ]
@@ -1,9 +1,11 @@
 """Helper functions for barcode generation."""
 
 import logging
+import re
 from typing import Type, cast
 
 import InvenTree.helpers_model
+from InvenTree.exceptions import log_error
 from InvenTree.models import InvenTreeBarcodeMixin
 
 logger = logging.getLogger('inventree')
@@ -63,3 +65,209 @@ def get_supported_barcode_model_codes_map():
         model.barcode_model_type_code(): model
         for model in get_supported_barcode_models()
     }
+
+
+def lookup_barcode_hash(barcode_hash: str):
+    """Find the database object which has been assigned the provided (third-party) barcode.
+
+    The barcode hash is resolved via the BarcodeHashIndex table,
+    which requires a single indexed lookup (rather than one query per barcode model).
+    The index is authoritative: barcodes which are missing from the index are
+    added by the backfill_barcode_index task (or the rebuild_barcode_index command),
+    rather than by checking each barcode model when a lookup misses.
+
+    Arguments:
+        barcode_hash: Hash of the barcode data
+
+    Returns:
+        A (model, instance) tuple, or None if no matching object is found
+    """
+    from plugin.models import BarcodeHashIndex
+
+    if not barcode_hash:
+        return None
+
+    models_map = get_supported_barcode_models_map()
+
+    for entry in BarcodeHashIndex.objects.filter(barcode_hash=barcode_hash).order_by(
+        'pk'
+    ):
+        model = models_map.get(entry.model_type, None)
+
+        if model is None:
+            continue
+
+        instance = model.objects.filter(
+            pk=entry.object_id, barcode_hash=barcode_hash
+        ).first()
+
+        if instance is not None:
+            return model, instance
+
+        # The index entry is out of date
+        logger.warning(
+            'Removing stale barcode index entry for %s <%s>',
+            entry.model_type,
+            entry.object_id,
+        )
+        entry.delete()
+
+    return None
+
+
+class BarcodeRoute:
+    """Routing information for a barcode plugin.
+
+    A barcode plugin can (optionally) declare which barcodes it is able to handle:
+
+    - BARCODE_PREFIXES: List of prefixes which the barcode data must start with
+    - BARCODE_PATTERNS: List of regular expressions which the barcode data must match
+    - can_handle(barcode): Method which returns True if the plugin can handle the barcode
+
+    A plugin which declares any routing information is only asked to scan
+    barcodes which it claims. Plugins without routing information scan every barcode.
+    If no routed plugin claims a barcode, every plugin is asked to scan it.
+    """
+
+    def __init__(self, barcode_plugin):
+        """Construct the routing information for the provided plugin."""
+        self.plugin = barcode_plugin
+
+        self.prefixes = tuple(getattr(barcode_plugin, 'BARCODE_PREFIXES', None) or [])
+
+        patterns = getattr(barcode_plugin, 'BARCODE_PATTERNS', None) or []
+
+        self.pattern = (
+            re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+            if patterns
+            else None
+        )
+
+        self.can_handle = getattr(barcode_plugin, 'can_handle', None)
+
+    @property
+    def routed(self) -> bool:
+        """Return True if the plugin declares which barcodes it can handle."""
+        return bool(self.prefixes or self.pattern or self.can_handle)
+
+    def claims(self, barcode) -> bool:
+        """Return True if the plugin should be asked to scan the provided barcode."""
+        if not self.routed:
+            return True
+
+        if isinstance(barcode, str):
+            if self.prefixes and barcode.startswith(self.prefixes):
+                return True
+
+            if self.pattern and self.pattern.match(barcode):
+                return True
+
+        if self.can_handle:
+            try:
+                return bool(self.can_handle(barcode))
+            except Exception:
+                log_error('BarcodeRoute.claims')
+
+        return False
+
+
+# Dispatch table of barcode routes, keyed by the plugin slug
+_barcode_routes = {}
+
+
+def clear_barcode_routes():
+    """Clear the cached barcode routes (e.g. when the plugin registry is reloaded)."""
+    _barcode_routes.clear()
+
+
+def get_barcode_route(barcode_plugin) -> BarcodeRoute:
+    """Return the (cached) routing information for the provided barcode plugin."""
+    key = barcode_plugin.slug
+    route = _barcode_routes.get(key)
+
+    # Routes are rebuilt if the plugin has been reloaded
+    if route is None or route.plugin is not barcode_plugin:
+        route = BarcodeRoute(barcode_plugin)
+        _barcode_routes[key] = route
+
+    return route
+
+
+def get_barcode_plugins_for(barcode, plugins) -> list:
+    """Return the barcode plugins which should be asked to scan the provided barcode.
+
+    The order of the provided plugins is preserved.
+    Plugins without routing information are always included.
+    Plugins with routing information are only included if they claim the barcode;
+    if no routed plugin claims the barcode, all of the provided plugins are returned.
+
+    Arguments:
+        barcode: The barcode data to scan
+        plugins: List of active barcode plugins
+    """
+    plugins = list(plugins)
+
+    candidates = []
+    claimed = False
+
+    for barcode_plugin in plugins:
+        route = get_barcode_route(barcode_plugin)
+
+        if not route.routed:
+            candidates.append(barcode_plugin)
+        elif route.claims(barcode):
+            candidates.append(barcode_plugin)
+            claimed = True
+
+    return candidates if claimed else plugins
+
+
+def lookup_barcode_hashes(barcode_hashes) -> dict:
+    """Find the database objects which have been assigned the provided (third-party) barcodes.
+
+    All hashes are resolved via a single BarcodeHashIndex query,
+    followed by a single query for each matching barcode model.
+
+    Arguments:
+        barcode_hashes: Iterable of barcode hashes
+
+    Returns:
+        A dict mapping each matched barcode hash to a (model, instance) tuple
+    """
+    from plugin.models import BarcodeHashIndex
+
+    barcode_hashes = {barcode_hash for barcode_hash in barcode_hashes if barcode_hash}
+
+    if not barcode_hashes:
+        return {}
+
+    models_map = get_supported_barcode_models_map()
+
+    entries = list(
+        BarcodeHashIndex.objects.filter(barcode_hash__in=barcode_hashes).order_by('pk')
+    )
+
+    # Group the matching object IDs by model type
+    object_ids = {}
+
+    for entry in entries:
+        object_ids.setdefault(entry.model_type, set()).add(entry.object_id)
+
+    instances = {}
+
+    for model_type, ids in object_ids.items():
+        if model := models_map.get(model_type, None):
+            instances[model_type] = model.objects.in_bulk(list(ids))
+
+    matches = {}
+
+    for entry in entries:
+        if entry.barcode_hash in matches:
+            continue
+
+        instance = instances.get(entry.model_type, {}).get(entry.object_id, None)
+
+        if instance is not None and instance.barcode_hash == entry.barcode_hash:
+            matches[entry.barcode_hash] = (models_map[entry.model_type], instance)
+
+    return matches
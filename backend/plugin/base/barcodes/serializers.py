@@ -55,6 +55,20 @@ class BarcodeSerializer(serializers.Serializer):
     )
 
 
+class BarcodeBatchSerializer(serializers.Serializer):
+    """Serializer for receiving multiple barcodes in a single request."""
+
+    MAX_BATCH_SIZE = 500
+
+    barcodes = serializers.ListField(
+        child=serializers.CharField(max_length=BarcodeSerializer.MAX_BARCODE_LENGTH),
+        required=True,
+        allow_empty=False,
+        max_length=MAX_BATCH_SIZE,
+        help_text=_('List of scanned barcode data'),
+    )
+
+
 class BarcodeGenerateSerializer(serializers.Serializer):
     """Serializer for generating a barcode."""
 
@@ -0,0 +1,211 @@
+"""Background tasks for barcode scanning.
+
+Barcode scan results (if enabled) are not written to the database during the scan request.
+Instead, they are collected in an in-process buffer, and written in bulk by a background task.
+The number of stored scan results is limited periodically, rather than after every scan.
+"""
+
+import atexit
+import logging
+import threading
+
+from django.db import close_old_connections, connection
+
+from common.settings import get_global_setting
+from InvenTree.tasks import ScheduledTask, offload_task, scheduled_task
+
+logger = logging.getLogger('inventree')
+
+
+class ScanResultBuffer:
+    """In-process buffer for barcode scan results.
+
+    The buffer is flushed (via a background task) when:
+    - The buffer reaches the maximum size
+    - The oldest buffered result reaches the maximum age
+    - The process exits
+    """
+
+    # Maximum number of buffered scan results
+    BUFFER_SIZE = 50
+
+    # Maximum time (seconds) that a scan result is buffered
+    FLUSH_INTERVAL = 5
+
+    def __init__(self):
+        """Initialize the scan result buffer."""
+        self.rows = []
+        self.lock = threading.Lock()
+        self.timer = None
+
+    def add(self, row: dict):
+        """Add a scan result to the buffer.
+
+        Arguments:
+            row: Field data for a new BarcodeScanResult instance
+        """
+        rows = None
+
+        with self.lock:
+            self.rows.append(row)
+
+            if len(self.rows) >= self.BUFFER_SIZE:
+                rows = self.take()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.FLUSH_INTERVAL, self.on_timer)
+                self.timer.daemon = True
+                self.timer.start()
+
+        if rows:
+            self.dispatch(rows)
+
+    def take(self) -> list:
+        """Remove (and return) all buffered rows.
+
+        Note: The lock must be held by the caller.
+        """
+        rows = self.rows
+        self.rows = []
+
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        return rows
+
+    def flush(self):
+        """Write all buffered scan results to the database."""
+        with self.lock:
+            rows = self.take()
+
+        if rows:
+            self.dispatch(rows)
+
+    def on_timer(self):
+        """Flush the buffer once the flush interval has elapsed."""
+        try:
+            self.flush()
+        finally:
+            # The timer runs in a separate thread, with its own database connection
+            close_old_connections()
+
+    def dispatch(self, rows: list):
+        """Offload the provided rows to be written by the background worker."""
+        try:
+            offload_task(store_scan_results, rows, group='barcode')
+        except Exception:
+            logger.exception('Failed to store %s barcode scan results', len(rows))
+
+
+scan_buffer = ScanResultBuffer()
+
+# Ensure that buffered results are not lost when the process exits
+atexit.register(scan_buffer.flush)
+
+
+def store_scan_results(rows: list):
+    """Write the provided barcode scan results to the database.
+
+    Each row includes the time at which the scan was made,
+    which is retained (rather than the time at which the row is written).
+    If the database backend cannot return primary keys from a bulk insert,
+    the rows cannot be updated, and the time at which they are written is kept.
+
+    Arguments:
+        rows: List of field data for new BarcodeScanResult instances
+    """
+    from common.models import BarcodeScanResult
+
+    results = BarcodeScanResult.objects.bulk_create([
+        BarcodeScanResult(**row) for row in rows
+    ])
+
+    if not getattr(
+        BarcodeScanResult._meta.get_field('timestamp'), 'auto_now_add', False
+    ):
+        return
+
+    if not connection.features.can_return_rows_from_bulk_insert:
+        return
+
+    # bulk_create() overwrites an 'auto_now_add' field, so restore the scan time
+    restored = []
+
+    for result, row in zip(results, rows):
+        if 'timestamp' in row:
+            result.timestamp = row['timestamp']
+            restored.append(result)
+
+    BarcodeScanResult.objects.bulk_update(restored, ['timestamp'])
+
+
+@scheduled_task(ScheduledTask.HOURLY)
+def trim_scan_results(batch_size: int = 1000) -> int:
+    """Remove the oldest barcode scan results, to enforce the BARCODE_RESULTS_MAX_NUM setting.
+
+    Rather than counting the entire table, the primary key of the oldest
+    result to retain is found (via the primary key index),
+    and older results are deleted in batches.
+
+    Arguments:
+        batch_size: Number of results to delete per query
+
+    Returns:
+        The number of deleted scan results
+    """
+    from common.models import BarcodeScanResult
+
+    max_scans = int(get_global_setting('BARCODE_RESULTS_MAX_NUM', create=False))
+
+    cutoff = list(
+        BarcodeScanResult.objects.order_by('-pk').values_list('pk', flat=True)[
+            max_scans : max_scans + 1
+        ]
+    )
+
+    if not cutoff:
+        return 0
+
+    deleted = 0
+
+    while True:
+        scan_ids = list(
+            BarcodeScanResult.objects.filter(pk__lte=cutoff[0])
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+
+        if not scan_ids:
+            break
+
+        BarcodeScanResult.objects.filter(
+            pk__gte=scan_ids[0], pk__lte=scan_ids[-1]
+        ).delete()
+
+        deleted += len(scan_ids)
+
+    if deleted:
+        logger.info('Removed %s old barcode scan results', deleted)
+
+    return deleted
+
+
+@scheduled_task(ScheduledTask.DAILY)
+def backfill_barcode_index() -> int:
+    """Add any assigned barcodes which are missing from the barcode index.
+
+    Barcode lookups only consult the index, so barcodes which were assigned
+    before the index existed (or outside of the model signals) are added here.
+    This task is also run once when the server starts.
+
+    Returns:
+        The number of indexed barcodes
+    """
+    from plugin.models import BarcodeHashIndex
+
+    count = BarcodeHashIndex.backfill()
+
+    if count:
+        logger.info('Added %s barcodes to the barcode index', count)
+
+    return count
@@ -0,0 +1,370 @@
+"""Unit tests for barcode scanning performance."""
+
+import json
+import logging
+import time
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+import plugin.base.barcodes.helper
+import plugin.base.barcodes.tasks
+from part.models import Part
+from plugin import registry
+from plugin.models import BarcodeHashIndex
+from stock.models import StockItem, StockLocation
+
+logger = logging.getLogger('inventree')
+
+
+class BarcodeScanBenchmarkTest(TestCase):
+    """Microbenchmark for scanning barcodes with the internal barcode plugin.
+
+    The scan rate (scans per second) is logged for each barcode format,
+    so that regressions in the scan path can be tracked over time.
+    The rate is not asserted, as wall-clock timing depends on the test runner.
+    """
+
+    # Number of scans to perform for each barcode format
+    ITERATIONS = 250
+
+    EXTERNAL_BARCODE = 'EXTERNAL-BARCODE-0001'
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a stock item with an assigned external barcode."""
+        super().setUpTestData()
+
+        part = Part.objects.create(name='Scanned Part', description='Scanned part')
+
+        cls.item = StockItem.objects.create(part=part, quantity=10)
+        cls.item.assign_barcode(barcode_data=cls.EXTERNAL_BARCODE)
+
+    def setUp(self):
+        """Load the internal barcode plugin."""
+        super().setUp()
+
+        self.plugin = registry.get_plugin('inventreebarcode')
+
+    def measure(self, barcode) -> float:
+        """Scan the provided barcode repeatedly, and return the scan rate.
+
+        Every scan result is checked (after timing) against the expected stock item.
+        """
+        # Perform a single scan first, so that any caches are populated
+        self.plugin.scan(barcode)
+
+        start = time.perf_counter()
+
+        results = [self.plugin.scan(barcode) for _ in range(self.ITERATIONS)]
+
+        rate = self.ITERATIONS / (time.perf_counter() - start)
+
+        for result in results:
+            self.assertIsNotNone(result)
+            self.assertEqual(result['stockitem']['pk'], self.item.pk)
+
+        return rate
+
+    def test_scan_rate(self):
+        """Check (and log the scan rate for) short, JSON and external barcodes."""
+        prefix = self.plugin.get_setting('SHORT_BARCODE_PREFIX')
+
+        barcodes = {
+            'short': f'{prefix}{self.item.barcode_model_type_code()}{self.item.pk}',
+            'json': json.dumps({'stockitem': self.item.pk}),
+            'external': self.EXTERNAL_BARCODE,
+        }
+
+        for name, barcode in barcodes.items():
+            with self.subTest(barcode=name):
+                rate = self.measure(barcode)
+                logger.info('Barcode scan rate (%s): %.0f scans/s', name, rate)
+
+    def test_prefix_change(self):
+        """Changing the short barcode prefix must invalidate the cached matcher."""
+        code = f'{self.item.barcode_model_type_code()}{self.item.pk}'
+
+        self.plugin.set_setting('SHORT_BARCODE_PREFIX', 'INV-')
+        self.assertIsNotNone(self.plugin.scan(f'INV-{code}'))
+
+        self.plugin.set_setting('SHORT_BARCODE_PREFIX', 'XYZ-')
+        self.assertIsNone(self.plugin.scan(f'INV-{code}'))
+        self.assertIsNotNone(self.plugin.scan(f'XYZ-{code}'))
+
+
+class BarcodeHashIndexTest(TestCase):
+    """Tests for resolving third-party barcodes via the BarcodeHashIndex table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a stock item with an assigned barcode."""
+        super().setUpTestData()
+
+        part = Part.objects.create(name='Indexed Part', description='Indexed part')
+
+        cls.item = StockItem.objects.create(part=part, quantity=10)
+        cls.item.assign_barcode(barcode_data='INDEXED-BARCODE')
+
+    def test_index(self):
+        """Assigning and unassigning a barcode updates the index."""
+        entry = BarcodeHashIndex.objects.get(
+            model_type='stockitem', object_id=self.item.pk
+        )
+
+        self.assertEqual(entry.barcode_hash, self.item.barcode_hash)
+
+        match = plugin.base.barcodes.helper.lookup_barcode_hash(self.item.barcode_hash)
+        self.assertEqual(match, (StockItem, self.item))
+
+        self.item.unassign_barcode()
+
+        self.assertFalse(
+            BarcodeHashIndex.objects.filter(
+                model_type='stockitem', object_id=self.item.pk
+            ).exists()
+        )
+
+    def test_miss(self):
+        """An unknown barcode is resolved with a single index query."""
+        with self.assertNumQueries(1):
+            self.assertIsNone(
+                plugin.base.barcodes.helper.lookup_barcode_hash('unknown')
+            )
+
+    def test_backfill(self):
+        """Barcodes which are missing from the index are added by the backfill task."""
+        barcode_hash = self.item.barcode_hash
+
+        # Simulate a barcode which was assigned before the index existed
+        BarcodeHashIndex.objects.all().delete()
+
+        # The index is authoritative, so the barcode is not found
+        self.assertIsNone(plugin.base.barcodes.helper.lookup_barcode_hash(barcode_hash))
+
+        self.assertEqual(plugin.base.barcodes.tasks.backfill_barcode_index(), 1)
+
+        match = plugin.base.barcodes.helper.lookup_barcode_hash(barcode_hash)
+        self.assertEqual(match, (StockItem, self.item))
+
+        matches = plugin.base.barcodes.helper.lookup_barcode_hashes([
+            barcode_hash,
+            'unknown',
+        ])
+        self.assertEqual(matches, {barcode_hash: (StockItem, self.item)})
+
+        # Running the backfill again has no effect
+        self.assertEqual(plugin.base.barcodes.tasks.backfill_barcode_index(), 0)
+        self.assertEqual(BarcodeHashIndex.objects.count(), 1)
+
+
+class ScanResultStoreTest(TestCase):
+    """Tests for writing buffered barcode scan results to the database."""
+
+    @skipUnless(
+        connection.features.can_return_rows_from_bulk_insert,
+        'Database cannot return rows from a bulk insert',
+    )
+    def test_timestamp(self):
+        """The time of each scan is retained, rather than the time it was written."""
+        from common.models import BarcodeScanResult
+
+        scanned = timezone.now() - timedelta(minutes=5)
+
+        plugin.base.barcodes.tasks.store_scan_results([
+            {'data': f'SCAN-{idx}', 'result': False, 'timestamp': scanned}
+            for idx in range(3)
+        ])
+
+        self.assertEqual(
+            list(BarcodeScanResult.objects.values_list('timestamp', flat=True)),
+            [scanned] * 3,
+        )
+
+
+class DummyBarcodePlugin:
+    """Minimal barcode plugin, with optional routing information."""
+
+    def __init__(self, slug, **kwargs):
+        """Construct the plugin with the provided routing attributes."""
+        self.slug = slug
+
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+class BarcodeRouteTest(SimpleTestCase):
+    """Tests for routing barcodes to the plugins which can handle them."""
+
+    def setUp(self):
+        """Clear any cached routes."""
+        super().setUp()
+
+        plugin.base.barcodes.helper.clear_barcode_routes()
+
+        self.builtin = DummyBarcodePlugin('builtin')
+        self.prefix = DummyBarcodePlugin('prefix', BARCODE_PREFIXES=['ACME-'])
+        self.pattern = DummyBarcodePlugin('pattern', BARCODE_PATTERNS=[r'\d{8}$'])
+        self.handler = DummyBarcodePlugin(
+            'handler', can_handle=lambda barcode: barcode == 'HANDLED'
+        )
+
+        self.plugins = [self.prefix, self.builtin, self.pattern, self.handler]
+
+    def plugins_for(self, barcode) -> list:
+        """Return the slugs of the plugins selected for the provided barcode."""
+        return [
+            p.slug
+            for p in plugin.base.barcodes.helper.get_barcode_plugins_for(
+                barcode, self.plugins
+            )
+        ]
+
+    def test_routing(self):
+        """Routed plugins are only selected for the barcodes they claim."""
+        self.assertEqual(self.plugins_for('ACME-1234'), ['prefix', 'builtin'])
+        self.assertEqual(self.plugins_for('12345678'), ['builtin', 'pattern'])
+        self.assertEqual(self.plugins_for('HANDLED'), ['builtin', 'handler'])
+
+    def test_precedence(self):
+        """The order of the provided plugins is preserved."""
+        self.plugins = [self.builtin, self.prefix]
+        self.assertEqual(self.plugins_for('ACME-1234'), ['builtin', 'prefix'])
+
+        self.plugins = [self.prefix, self.builtin]
+        self.assertEqual(self.plugins_for('ACME-1234'), ['prefix', 'builtin'])
+
+    def test_fallback(self):
+        """If no routed plugin claims the barcode, all plugins are selected."""
+        self.assertEqual(
+            self.plugins_for('UNCLAIMED'), ['prefix', 'builtin', 'pattern', 'handler']
+        )
+
+        self.assertEqual(self.plugins_for({'stockitem': 1}), self.plugins_for('X'))
+
+    def test_reload(self):
+        """Routes are keyed by plugin slug, and rebuilt when a plugin is reloaded."""
+        self.plugins_for('ACME-1234')
+        self.assertEqual(len(plugin.base.barcodes.helper._barcode_routes), 4)
+
+        # Simulate reloading the plugin, with different routing information
+        self.prefix = DummyBarcodePlugin('prefix', BARCODE_PREFIXES=['NEW-'])
+        self.plugins = [self.prefix, self.builtin, self.pattern, self.handler]
+
+        self.assertEqual(self.plugins_for('NEW-1234'), ['prefix', 'builtin'])
+        self.assertEqual(len(plugin.base.barcodes.helper._barcode_routes), 4)
+
+
+class BarcodeBatchScanTest(TestCase):
+    """Tests for the batch barcode scan endpoint (/api/barcode/batch/)."""
+
+    EXTERNAL_BARCODE = 'BATCH-EXTERNAL-0001'
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create stock items to scan."""
+        super().setUpTestData()
+
+        cls.user = User.objects.create_user('scanner', password='password')
+
+        part = Part.objects.create(name='Batch Part', description='Batch part')
+
+        cls.location = StockLocation.objects.create(name='Batch Location')
+
+        cls.items = [
+            StockItem.objects.create(part=part, quantity=idx + 1, location=cls.location)
+            for idx in range(10)
+        ]
+
+        cls.items[0].assign_barcode(barcode_data=cls.EXTERNAL_BARCODE)
+
+    def setUp(self):
+        """Log in as the scanning user."""
+        super().setUp()
+
+        self.client.force_login(self.user)
+        self.url = reverse('api-barcode-batch')
+
+    def scan(self, barcodes: list) -> list:
+        """Scan the provided barcodes, and return the results."""
+        response = self.client.post(
+            self.url, {'barcodes': barcodes}, content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        results = response.json()['results']
+
+        self.assertEqual(len(results), len(barcodes))
+
+        return results
+
+    def test_order(self):
+        """Results are returned in the same order as the provided barcodes."""
+        items = list(reversed(self.items))
+
+        results = self.scan([json.dumps({'stockitem': item.pk}) for item in items])
+
+        self.assertEqual(
+            [result['stockitem']['pk'] for result in results],
+            [item.pk for item in items],
+        )
+
+        for result in results:
+            self.assertIn('success', result)
+
+    def test_mixed(self):
+        """A batch can contain both matched and unmatched barcodes."""
+        barcodes = [
+            json.dumps({'stockitem': self.items[1].pk}),
+            'UNKNOWN-BARCODE',
+            json.dumps({'stockitem': 999999}),
+            self.EXTERNAL_BARCODE,
+            # The first label does not exist, so the next label must be checked
+            json.dumps({'part': 999999, 'stocklocation': self.location.pk}),
+        ]
+
+        results = self.scan(barcodes)
+
+        self.assertEqual(results[0]['stockitem']['pk'], self.items[1].pk)
+        self.assertEqual(results[3]['stockitem']['pk'], self.items[0].pk)
+        self.assertEqual(results[4]['stocklocation']['pk'], self.location.pk)
+
+        for idx in [1, 2]:
+            self.assertIsNone(results[idx]['plugin'])
+            self.assertIn('error', results[idx])
+
+        for idx, barcode in enumerate(barcodes):
+            self.assertEqual(results[idx]['barcode_data'], barcode)
+
+        # The batch results must agree with scanning each barcode individually
+        barcode_plugin = registry.get_plugin('inventreebarcode')
+
+        self.assertEqual(
+            barcode_plugin.scan_batch(barcodes),
+            [barcode_plugin.scan(barcode) for barcode in barcodes],
+        )
+
+    def test_query_count(self):
+        """The number of queries does not depend on the number of barcodes."""
+        # Populate any caches (e.g. settings) before counting queries
+        self.scan([self.EXTERNAL_BARCODE])
+
+        counts = []
+
+        for items in [self.items[:2], self.items]:
+            barcodes = [json.dumps({'stockitem': item.pk}) for item in items]
+            barcodes.append(self.EXTERNAL_BARCODE)
+
+            with CaptureQueriesContext(connection) as queries:
+                self.scan(barcodes)
+
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
@@ -7,19 +7,29 @@ Parsing an InvenTree barcode simply involves validating that the
 references model objects actually exist in the database.
 """
 
+import functools
 import json
 import re
+import time
 from typing import cast
 
+from django.db.models.signals import post_save
+from django.dispatch.dispatcher import receiver
 from django.utils.translation import gettext_lazy as _
 
 import plugin.base.barcodes.helper
 from InvenTree.helpers import hash_barcode
 from InvenTree.models import InvenTreeBarcodeMixin
-from plugin import InvenTreePlugin
+from plugin import InvenTreePlugin, registry
 from plugin.mixins import BarcodeMixin, SettingsMixin
 
 
+@functools.lru_cache(maxsize=16)
+def compile_short_barcode_matcher(prefix: str) -> re.Pattern:
+    """Compile the regular expression used to match short barcodes with the provided prefix."""
+    return re.compile(f'^{re.escape(prefix)}([0-9A-Z $%*+-.\\/:]{{2}})(\\d+)$')
+
+
 class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugin):
     """Builtin BarcodePlugin for matching and generating internal barcodes."""
 
@@ -48,6 +58,33 @@ class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugi
         },
     }
 
+    # Maximum time (seconds) to cache the short barcode matcher in this process
+    # The cache is also invalidated directly when the prefix setting is changed
+    SHORT_BARCODE_CACHE_TIMEOUT = 30
+
+    _short_barcode_matcher = None
+    _short_barcode_expiry = 0
+
+    def get_short_barcode_matcher(self) -> re.Pattern:
+        """Return the compiled regular expression used to match short barcodes.
+
+        The expression depends on the SHORT_BARCODE_PREFIX setting,
+        so it is cached (rather than reading the setting and compiling for every scan).
+        """
+        now = time.monotonic()
+
+        if self._short_barcode_matcher is None or now > self._short_barcode_expiry:
+            prefix = cast(str, self.get_setting('SHORT_BARCODE_PREFIX'))
+
+            self._short_barcode_matcher = compile_short_barcode_matcher(prefix)
+            self._short_barcode_expiry = now + self.SHORT_BARCODE_CACHE_TIMEOUT
+
+        return self._short_barcode_matcher
+
+    def clear_short_barcode_matcher(self):
+        """Clear the cached short barcode matcher (e.g. when the prefix setting is changed)."""
+        self._short_barcode_matcher = None
+
     def format_matched_response(self, label, model, instance):
         """Format a response for the scanned data."""
         return {label: instance.format_matched_response()}
@@ -59,11 +96,8 @@ class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugi
         """
         # Internal Barcodes - Short Format
         # Attempt to match the barcode data against the short barcode format
-        prefix = cast(str, self.get_setting('SHORT_BARCODE_PREFIX'))
         if type(barcode_data) is str and (
-            m := re.match(
-                f'^{re.escape(prefix)}([0-9A-Z $%*+-.\\/:]{"{2}"})(\\d+)$', barcode_data
-            )
+            m := self.get_short_barcode_matcher().match(barcode_data)
         ):
             model_type_code, pk = m.groups()
 
@@ -98,7 +132,7 @@ class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugi
 
         supported_models = plugin.base.barcodes.helper.get_supported_barcode_models()
 
-        succcess_message = _('Found matching item')
+        success_message = _('Found matching item')
 
         if barcode_dict is not None and type(barcode_dict) is dict:
             # Look for various matches. First good match will be returned
@@ -112,7 +146,7 @@ class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugi
 
                         return {
                             **self.format_matched_response(label, model, instance),
-                            'success': succcess_message,
+                            'success': success_message,
                         }
                     except (ValueError, model.DoesNotExist):
                         pass
@@ -122,17 +156,130 @@ class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugi
         barcode_hash = hash_barcode(barcode_data)
 
         # If no "direct" hits are found, look for assigned third-party barcodes
-        for model in supported_models:
+        if match := plugin.base.barcodes.helper.lookup_barcode_hash(barcode_hash):
+            model, instance = match
             label = model.barcode_model_type()
 
-            instance = model.lookup_barcode(barcode_hash)
+            return {
+                **self.format_matched_response(label, model, instance),
+                'success': success_message,
+            }
+
+    def scan_batch(self, barcodes: list) -> list:
+        """Scan multiple barcodes against this plugin.
+
+        This is equivalent to calling scan() for each barcode,
+        but database lookups are grouped to reduce the number of queries:
+
+        - Internal barcodes are grouped by model, and fetched with a single query per model
+        - Third-party barcodes are resolved with a single barcode index lookup
+
+        Arguments:
+            barcodes: List of barcode data
+
+        Returns:
+            A list of scan results (or None where no match is found), in the same order as the provided barcodes
+        """
+        results = [None] * len(barcodes)
+
+        matcher = self.get_short_barcode_matcher()
+
+        codes_map = plugin.base.barcodes.helper.get_supported_barcode_model_codes_map()
+        supported_models = plugin.base.barcodes.helper.get_supported_barcode_models()
+
+        success_message = _('Found matching item')
+
+        # Primary keys of internal barcodes, grouped by model: {model: {pk}}
+        lookups = {}
+
+        # Candidate internal matches for each barcode: {index: ([(model, pk)], success)}
+        candidates = {}
+
+        # Indices of barcodes to resolve as third-party barcodes
+        external = []
 
-            if instance is not None:
-                return {
+        for idx, barcode_data in enumerate(barcodes):
+            # Internal Barcodes - Short Format
+            if type(barcode_data) is str and (m := matcher.match(barcode_data)):
+                model_type_code, pk = m.groups()
+
+                model = codes_map.get(model_type_code, None)
+
+                if model is None:
+                    continue
+
+                lookups.setdefault(model, set()).add(int(pk))
+                candidates[idx] = ([(model, int(pk))], False)
+                continue
+
+            # Internal Barcodes - JSON Format
+            barcode_dict = None
+
+            if type(barcode_data) is dict:
+                barcode_dict = barcode_data
+            elif type(barcode_data) is str:
+                try:
+                    barcode_dict = json.loads(barcode_data)
+                except json.JSONDecodeError:
+                    pass
+
+            entries = []
+
+            if barcode_dict is not None and type(barcode_dict) is dict:
+                # Every supported label is a candidate (in order), as per scan()
+                for model in supported_models:
+                    label = model.barcode_model_type()
+
+                    if label in barcode_dict:
+                        try:
+                            pk = int(barcode_dict[label])
+                        except (TypeError, ValueError):
+                            continue
+
+                        lookups.setdefault(model, set()).add(pk)
+                        entries.append((model, pk))
+
+            if entries:
+                candidates[idx] = (entries, True)
+            else:
+                external.append(idx)
+
+        # Fetch all internal barcode matches, with a single query per model
+        instances = {
+            model: model.objects.in_bulk(list(pks)) for model, pks in lookups.items()
+        }
+
+        for idx, (entries, success) in candidates.items():
+            for model, pk in entries:
+                if instance := instances[model].get(pk, None):
+                    label = model.barcode_model_type()
+                    results[idx] = self.format_matched_response(label, model, instance)
+
+                    if success:
+                        results[idx]['success'] = success_message
+
+                    break
+            else:
+                # Fall back to third-party barcode lookup
+                external.append(idx)
+
+        # External Barcodes (Linked barcodes)
+        hashes = {idx: hash_barcode(barcodes[idx]) for idx in external}
+
+        matches = plugin.base.barcodes.helper.lookup_barcode_hashes(hashes.values())
+
+        for idx, barcode_hash in hashes.items():
+            if match := matches.get(barcode_hash, None):
+                model, instance = match
+                label = model.barcode_model_type()
+
+                results[idx] = {
                     **self.format_matched_response(label, model, instance),
-                    'success': succcess_message,
+                    'success': success_message,
                 }
 
+        return results
+
     def generate(self, model_instance: InvenTreeBarcodeMixin):
         """Generate a barcode for a given model instance."""
         barcode_format = self.get_setting('INTERNAL_BARCODE_FORMAT')
@@ -147,3 +294,18 @@ class InvenTreeInternalBarcodePlugin(SettingsMixin, BarcodeMixin, InvenTreePlugi
             return f'{prefix}{model_type_code}{model_instance.pk}'
 
         return None
+
+
+@receiver(
+    post_save, sender='plugin.PluginSetting', dispatch_uid='short_barcode_prefix_save'
+)
+def after_save_plugin_setting(sender, instance, **kwargs):
+    """Clear the cached short barcode matcher when the prefix setting is changed."""
+    if instance.key != 'SHORT_BARCODE_PREFIX':
+        return
+
+    if isinstance(
+        barcode_plugin := registry.get_plugin('inventreebarcode'),
+        InvenTreeInternalBarcodePlugin,
+    ):
+        barcode_plugin.clear_short_barcode_matcher()
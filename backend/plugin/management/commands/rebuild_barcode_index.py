@@ -0,0 +1,19 @@
+"""Custom management command to rebuild the barcode hash index.
+
+- Removes all existing index entries
+- Creates a new entry for each database object with an assigned (third-party) barcode
+"""
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """Rebuild the BarcodeHashIndex table."""
+
+    def handle(self, *args, **kwargs):
+        """Rebuild the barcode hash index for all supported barcode models."""
+        from plugin.models import BarcodeHashIndex
+
+        count = BarcodeHashIndex.rebuild()
+
+        self.stdout.write(f'Indexed {count} barcodes')
@@ -0,0 +1,213 @@
+"""Plugin model definitions."""
+
+from django.db import models
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils.translation import gettext_lazy as _
+
+from InvenTree.models import InvenTreeBarcodeMixin
+
+
+class BarcodeHashIndex(models.Model):
+    """Index of third-party barcodes assigned to database objects.
+
+    Resolving a third-party barcode would otherwise require a separate query
+    against each barcode-enabled model. This table maps each barcode hash to
+    the matching (model_type, pk), so that a barcode is resolved with a single indexed lookup.
+
+    Entries are kept in sync (via signals) whenever a barcode is assigned or unassigned.
+
+    Attributes:
+        barcode_hash: Hash of the assigned barcode data
+        model_type: Barcode model type of the linked object (e.g. 'stockitem')
+        object_id: Primary key of the linked object
+    """
+
+    class Meta:
+        """Metaclass options for this model."""
+
+        verbose_name = _('Barcode Hash Index')
+        unique_together = [('model_type', 'object_id')]
+
+    barcode_hash = models.CharField(
+        max_length=128, db_index=True, verbose_name=_('Barcode Hash')
+    )
+
+    model_type = models.CharField(max_length=100, verbose_name=_('Model Type'))
+
+    object_id = models.PositiveIntegerField(verbose_name=_('Object ID'))
+
+    def __str__(self):
+        """String representation of a BarcodeHashIndex entry."""
+        return f'{self.model_type}:{self.object_id}'
+
+    @classmethod
+    def update_instance(cls, instance: InvenTreeBarcodeMixin):
+        """Update the index entry for the provided model instance."""
+        model_type = instance.barcode_model_type()
+
+        if instance.barcode_hash:
+            cls.objects.update_or_create(
+                model_type=model_type,
+                object_id=instance.pk,
+                defaults={'barcode_hash': instance.barcode_hash},
+            )
+        else:
+            cls.remove_instance(instance)
+
+    @classmethod
+    def remove_instance(cls, instance: InvenTreeBarcodeMixin):
+        """Remove the index entry for the provided model instance."""
+        cls.objects.filter(
+            model_type=instance.barcode_model_type(), object_id=instance.pk
+        ).delete()
+
+    @classmethod
+    def add_instances(cls, instances):
+        """Add index entries for newly created model instances (e.g. after bulk_create)."""
+        cls.objects.bulk_create([
+            cls(
+                barcode_hash=instance.barcode_hash,
+                model_type=instance.barcode_model_type(),
+                object_id=instance.pk,
+            )
+            for instance in instances
+            if instance.barcode_hash and instance.pk
+        ])
+
+    @classmethod
+    def backfill(cls, model_classes=None) -> int:
+        """Add index entries for any assigned barcodes which are missing from the index.
+
+        Existing entries are retained, so this can be run at any time
+        (e.g. to index barcodes which were assigned before the index existed).
+
+        Arguments:
+            model_classes: List of barcode model classes (defaults to all supported models)
+
+        Returns:
+            The number of indexed barcodes
+        """
+        import plugin.base.barcodes.helper
+
+        if model_classes is None:
+            model_classes = plugin.base.barcodes.helper.get_supported_barcode_models()
+
+        count = 0
+
+        for model in model_classes:
+            model_type = model.barcode_model_type()
+
+            indexed = cls.objects.filter(model_type=model_type).values('object_id')
+
+            entries = (
+                cls(barcode_hash=barcode_hash, model_type=model_type, object_id=pk)
+                for pk, barcode_hash in model.objects.exclude(barcode_hash='')
+                .exclude(pk__in=indexed)
+                .values_list('pk', 'barcode_hash')
+                .iterator(chunk_size=2000)
+            )
+
+            count += len(cls.objects.bulk_create(entries, batch_size=2000))
+
+        return count
+
+    @classmethod
+    def rebuild(cls, model_classes=None) -> int:
+        """Rebuild the index entries for the provided barcode models.
+
+        Arguments:
+            model_classes: List of barcode model classes (defaults to all supported models)
+
+        Returns:
+            The number of indexed barcodes
+        """
+        import plugin.base.barcodes.helper
+
+        if model_classes is None:
+            model_classes = plugin.base.barcodes.helper.get_supported_barcode_models()
+
+        count = 0
+
+        for model in model_classes:
+            model_type = model.barcode_model_type()
+
+            cls.objects.filter(model_type=model_type).delete()
+
+            entries = (
+                cls(barcode_hash=barcode_hash, model_type=model_type, object_id=pk)
+                for pk, barcode_hash in model.objects.exclude(barcode_hash='')
+                .values_list('pk', 'barcode_hash')
+                .iterator(chunk_size=2000)
+            )
+
+            count += len(cls.objects.bulk_create(entries, batch_size=2000))
+
+        return count
+
+
+def barcode_index_post_init(sender, instance, **kwargs):
+    """Record the barcode hash of a barcode-enabled model instance, as loaded."""
+    # Avoid loading the field if it has been deferred
+    instance._indexed_barcode_hash = instance.__dict__.get('barcode_hash')
+
+
+def barcode_index_post_save(sender, instance, created, **kwargs):
+    """Update the barcode index when the barcode of a model instance is changed."""
+    barcode_hash = instance.__dict__.get('barcode_hash')
+
+    if kwargs.get('bulk', False):
+        # Bulk created instances are indexed by the bulk operation
+        instance._indexed_barcode_hash = barcode_hash
+        return
+
+    update_fields = kwargs.get('update_fields', None)
+
+    if update_fields is not None and 'barcode_hash' not in update_fields:
+        return
+
+    if created:
+        if barcode_hash:
+            BarcodeHashIndex.update_instance(instance)
+    elif barcode_hash != getattr(instance, '_indexed_barcode_hash', None):
+        BarcodeHashIndex.update_instance(instance)
+
+    instance._indexed_barcode_hash = barcode_hash
+
+
+def barcode_index_post_delete(sender, instance, **kwargs):
+    """Remove the barcode index entry when a model instance is deleted."""
+    if instance.__dict__.get('barcode_hash') or getattr(
+        instance, '_indexed_barcode_hash', None
+    ):
+        BarcodeHashIndex.remove_instance(instance)
+
+
+def connect_barcode_index_signals():
+    """Connect the barcode index signal handlers to each barcode-enabled model.
+
+    The handlers are connected per model (rather than for all senders),
+    so that loading or saving any other model does not invoke them.
+    This is called once all apps are loaded (see InvenTreeConfig.ready).
+    """
+    import plugin.base.barcodes.helper
+
+    for model in plugin.base.barcodes.helper.get_supported_barcode_models():
+        label = model._meta.label_lower
+
+        post_init.connect(
+            barcode_index_post_init,
+            sender=model,
+            dispatch_uid=f'barcode_index_post_init_{label}',
+        )
+
+        post_save.connect(
+            barcode_index_post_save,
+            sender=model,
+            dispatch_uid=f'barcode_index_post_save_{label}',
+        )
+
+        post_delete.connect(
+            barcode_index_post_delete,
+            sender=model,
+            dispatch_uid=f'barcode_index_post_delete_{label}',
+        )
@@ -0,0 +1,13 @@
+"""Background tasks for the 'plugin' app.
+
+Tasks are only collected from the tasks.py module of each app,
+so tasks which are defined within plugin submodules are imported here.
+"""
+
+from plugin.base.barcodes.tasks import (
+    backfill_barcode_index,
+    store_scan_results,
+    trim_scan_results,
+)
+
+__all__ = ['backfill_barcode_index', 'store_scan_results', 'trim_scan_results']